@@ -46,6 +46,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 THIRD_PARTY_APPS = [
@@ -94,6 +95,26 @@ WSGI_APPLICATION = "config.wsgi.application"
 DATABASES = {"default": env.db("DATABASE_URL")}
 
 
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# e.g. CACHE_URL=pymemcache://127.0.0.1:11211 to share cached responses between workers
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
+RESPONSE_CACHE_ALIAS = env.str("RESPONSE_CACHE_ALIAS", default="default")
+RESPONSE_CACHE_TIMEOUT = env.int("RESPONSE_CACHE_TIMEOUT", default=60)
+# Totals of ?count=cached pages, dropped on any write before that.
+COUNT_CACHE_TIMEOUT = env.int("COUNT_CACHE_TIMEOUT", default=300)
+
+# Autocomplete is served from an in-memory index in each process, which notices the
+# writes of other processes through the response cache. A single process, e.g.
+# runserver, works with the default locmem cache; several workers need a CACHE_URL
+# shared by them, or AUTOCOMPLETE_INDEX=False to query the database instead.
+AUTOCOMPLETE_INDEX = env.bool("AUTOCOMPLETE_INDEX", default=True)
+
+# Student search adds trigram matching, needs the pg_trgm extension.
+SEARCH_TRIGRAM = env.bool("SEARCH_TRIGRAM", default=False)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -10,7 +10,20 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/wsgi/
 import os
 
 from django.core.wsgi import get_wsgi_application
+from django.db import DatabaseError
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402
+
+from core.models import school_autocomplete  # noqa: E402
+
+# Load the autocomplete index before the first request, or on it if the database
+# isn't reachable yet.
+if settings.AUTOCOMPLETE_INDEX:
+    try:
+        school_autocomplete.build()
+    except DatabaseError:
+        pass
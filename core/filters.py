@@ -1,11 +1,28 @@
-from typing import Tuple, Type
+import operator
+from decimal import Decimal
+from functools import reduce
+from itertools import product
+from typing import List, Tuple, Type
 
 import django_filters
+from django.conf import settings
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import Case, Expression, FloatField, Q, QuerySet, Value, When
+from django.db.models.functions import Greatest, Lower
 
-from core.models import School, Student
+from core.models import SEATS_LEFT, ChangeLog, School, Student
+from utils.constants import SEARCH_MAX_TERMS, SEARCH_RANK
 
 
 class SchoolFilter(django_filters.FilterSet):
+    # Compared with the enrolled_count counter, so no student is counted.
+    has_capacity: django_filters.BooleanFilter = django_filters.BooleanFilter(
+        method="filter_has_capacity", label="has capacity"
+    )
+    min_seats: django_filters.NumberFilter = django_filters.NumberFilter(
+        method="filter_min_seats", label="min seats", min_value=0
+    )
+
     class Meta:
         model: Type[School] = School
         fields: Tuple = (
@@ -13,8 +30,95 @@ class SchoolFilter(django_filters.FilterSet):
             "location",
         )
 
+    def filter_has_capacity(
+        self, queryset: QuerySet, name: str, value: bool
+    ) -> QuerySet:
+        queryset = queryset.alias(seats_left=SEATS_LEFT)
+        if value:
+            return queryset.filter(seats_left__gt=0)
+        return queryset.filter(seats_left__lte=0)
+
+    def filter_min_seats(
+        self, queryset: QuerySet, name: str, value: Decimal
+    ) -> QuerySet:
+        return queryset.alias(seats_left=SEATS_LEFT).filter(seats_left__gte=value)
+
+
+class StudentSearchFilter(django_filters.FilterSet):
+    """
+    ?search= matches every word as a case-insensitive prefix of the first or last
+    name, also by trigram similarity with SEARCH_TRIGRAM, exact names first within
+    each page
+    """
+
+    search: django_filters.CharFilter = django_filters.CharFilter(
+        method="filter_search", label="search"
+    )
+
+    def filter_search(self, queryset: QuerySet, name: str, value: str) -> QuerySet:
+        terms: List[str] = value.lower().split()[:SEARCH_MAX_TERMS]
+        if not terms:
+            return queryset
+
+        # Lowered names match the prefix and trigram indexes of the student table.
+        queryset = queryset.alias(
+            first_lower=Lower("first_name"), last_lower=Lower("last_name")
+        )
+        # Every word matches the first or the last name. Spelled out as one branch
+        # per assignment of words to names, each branch is a range of one of the
+        # (first name, last name) indexes.
+        condition: Q = reduce(
+            operator.or_,
+            [
+                reduce(
+                    operator.and_,
+                    [
+                        Q(**{f"{column}__startswith": term})
+                        for column, term in zip(columns, terms)
+                    ],
+                )
+                for columns in product(("first_lower", "last_lower"), repeat=len(terms))
+            ],
+        )
+        ranks: List[Expression] = [
+            Case(
+                When(Q(first_lower=term) | Q(last_lower=term), then=Value(2.0)),
+                When(
+                    Q(first_lower__startswith=term) | Q(last_lower__startswith=term),
+                    then=Value(1.0),
+                ),
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+            for term in terms
+        ]
+        if settings.SEARCH_TRIGRAM:
+            condition |= reduce(
+                operator.and_,
+                [
+                    Q(first_lower__trigram_similar=term)
+                    | Q(last_lower__trigram_similar=term)
+                    for term in terms
+                ],
+            )
+            ranks.extend(
+                Greatest(
+                    TrigramSimilarity("first_lower", term),
+                    TrigramSimilarity("last_lower", term),
+                )
+                for term in terms
+            )
+
+        # Short terms match a large share of the students, ordering all of them by
+        # rank would cost as much as a scan. Matches keep the list order, read from
+        # its index until the page is full, and only the rows of the page are ranked
+        # and reordered by the view.
+        return queryset.filter(condition).annotate(
+            **{SEARCH_RANK: reduce(operator.add, ranks)}
+        )
+
 
-class StudentFilter(django_filters.FilterSet):
+class StudentFilter(StudentSearchFilter):
     school: django_filters.CharFilter = django_filters.CharFilter(
         field_name="school__name", label="school"
     )
@@ -28,7 +132,17 @@ class StudentFilter(django_filters.FilterSet):
         )
 
 
-class StudentNestedFilter(django_filters.FilterSet):
+class StudentNestedFilter(StudentSearchFilter):
     class Meta:
         model: Type[Student] = Student
         fields: Tuple = ("first_name", "last_name")
+
+
+class ChangeFilter(django_filters.FilterSet):
+    model: django_filters.ChoiceFilter = django_filters.ChoiceFilter(
+        choices=[(name, name) for name in ("school", "student")]
+    )
+
+    class Meta:
+        model: Type[ChangeLog] = ChangeLog
+        fields: Tuple = ("model", "action")
@@ -1,11 +1,17 @@
+import multiprocessing
 import random
-from typing import Dict, List, Tuple
+import time
+from typing import Any, Iterator, List, Tuple
 
 import faker.providers
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connections, transaction
+from django.db.models import Max
 from faker import Faker
 
-from core.models import School, Student
+from core.models import School, SchoolStatistics, Student, school_autocomplete
+from utils.cache import invalidate_response_cache
+from utils.constants import MAXIMUM_AGE, MINIMUM_AGE
 
 TITLES: List = ["MR", "MRS", "MISS", "MS"]
 
@@ -13,35 +19,135 @@ GENDERS: List = ["MALE", "FEMALE"]
 
 
 class Provider(faker.providers.BaseProvider):
-    def student_titles(self) -> List:
-        return self.random_element(TITLES)
+    def student_titles(self) -> str:
+        return str(self.random_element(TITLES))
 
-    def student_genders(self) -> List:
-        return self.random_element(GENDERS)
+    def student_genders(self) -> str:
+        return str(self.random_element(GENDERS))
+
+
+def create_schools(
+    first: int,
+    last: int,
+    students_per_school: int,
+    seed: int,
+    batch_size: int,
+    offset: int = 0,
+) -> int:
+    # Every school and its students come from a generator seeded with the school's
+    # index in the run, so the data doesn't depend on how the indexes are split
+    # across workers, nor on the schools already in the database.
+    fake: Faker = Faker()
+    fake.add_provider(Provider)
+    schools: List[School] = []
+    generators: List[Tuple[random.Random, str]] = []
+
+    for index in range(first, last):
+        school_seed: str = f"{seed}-{index}"
+        rng: random.Random = random.Random(school_seed)
+        fake.seed_instance(school_seed)
+        # Names are unique, the suffix numbering them after the existing schools
+        # keeps them so at any scale and on reruns.
+        suffix: str = f" {offset + index + 1}"
+        schools.append(
+            School(
+                name=f"{fake.company()[: 20 - len(suffix)].rstrip()}{suffix}",
+                code=f"A{rng.randint(1000, 9999)}",
+                location=fake.city(),
+                student_max_number=students_per_school
+                + rng.randint(0, students_per_school),
+                enrolled_count=students_per_school,
+            )
+        )
+        generators.append((rng, school_seed))
+
+    with transaction.atomic():
+        School.objects.bulk_create(schools, batch_size=batch_size)
+        students: List[Student] = []
+        for school, (rng, school_seed) in zip(schools, generators):
+            fake.seed_instance(f"{school_seed}-students")
+            for _ in range(students_per_school):
+                students.append(
+                    Student(
+                        title=fake.student_titles(),
+                        first_name=fake.first_name(),
+                        last_name=fake.last_name(),
+                        age=rng.randint(MINIMUM_AGE, MAXIMUM_AGE),
+                        gender=fake.student_genders(),
+                        school=school,
+                    )
+                )
+            if len(students) >= batch_size:
+                Student.objects.bulk_create(students, batch_size=batch_size)
+                students = []
+        Student.objects.bulk_create(students, batch_size=batch_size)
+        SchoolStatistics.objects.rebuild(school.pk for school in schools)
+
+    return len(schools) * (students_per_school + 1)
+
+
+def create_schools_chunk(arguments: Tuple) -> int:
+    return create_schools(*arguments)
 
 
 class Command(BaseCommand):
-    help = "Command Information"
+    help = "Create schools with students, reproducibly with --seed"
 
-    def handle(self, *args: Tuple, **kwargs: Dict) -> None:
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--schools", type=int, default=10)
+        parser.add_argument("--students-per-school", type=int, default=10)
+        parser.add_argument(
+            "--seed", type=int, help="Same seed, same data; random when left out"
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="Rows per INSERT"
+        )
+        parser.add_argument(
+            "--workers", type=int, default=1, help="Processes inserting in parallel"
+        )
 
-        faker: Faker = Faker()
-        faker.add_provider(Provider)
+    def handle(self, *args: Tuple, **kwargs: Any) -> None:
+        seed: int = (
+            kwargs["seed"] if kwargs["seed"] is not None else random.randrange(2 ** 32)
+        )
+        per_school: int = kwargs["students_per_school"]
+        batch_size: int = kwargs["batch_size"]
+        offset: int = School.objects.aggregate(last=Max("id"))["last"] or 0
+        last: int = kwargs["schools"]
+        step: int = max(1, batch_size // max(per_school, 1))
+        chunks: List[Tuple] = [
+            (first, min(first + step, last), per_school, seed, batch_size, offset)
+            for first in range(0, last, step)
+        ]
 
-        for _ in range(10):
-            school: School = School.objects.create(
-                name=faker.company()[:20].rstrip(),
-                code=f"A{random.randint(1000, 9999)}",
-                location=faker.city(),
-                student_max_number=random.randint(10, 20),
+        total: int = kwargs["schools"] * (per_school + 1)
+        self.stdout.write(f"Creating {total} rows with seed {seed}")
+        started: float = time.perf_counter()
+        created: int = 0
+        for rows in self.run_chunks(chunks, kwargs["workers"]):
+            created += rows
+            elapsed: float = time.perf_counter() - started
+            self.stdout.write(
+                f"{created}/{total} rows, {created / elapsed:.0f} rows/sec",
+                ending="\r" if created < total else "\n",
             )
 
-            for _ in range(10):
-                Student.objects.create(
-                    title=faker.student_titles(),
-                    first_name=faker.first_name(),
-                    last_name=faker.last_name(),
-                    age=random.randint(5, 15),
-                    gender=faker.student_genders(),
-                    school=school,
-                )
+        invalidate_response_cache()
+        # Schools are inserted without post_save, every process reloads the index.
+        school_autocomplete.invalidate()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {kwargs['schools']} schools and "
+                f"{kwargs['schools'] * per_school} students"
+            )
+        )
+
+    def run_chunks(self, chunks: List[Tuple], workers: int) -> Iterator[int]:
+        if workers <= 1:
+            yield from map(create_schools_chunk, chunks)
+            return
+
+        # Forked workers must not share the parent's connection, they open their own.
+        connections.close_all()
+        with multiprocessing.get_context("fork").Pool(workers) as pool:
+            yield from pool.imap_unordered(create_schools_chunk, chunks)
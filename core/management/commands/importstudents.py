@@ -0,0 +1,69 @@
+import io
+import sys
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from typing import IO, Any, Dict, Optional, Tuple
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DatabaseError
+
+from services.import_services import IMPORT_COLUMNS, import_students
+
+FORMATS: Tuple[str, ...] = ("csv", "ndjson")
+
+
+class Command(BaseCommand):
+    help = (
+        "Import students from a CSV or NDJSON file with the columns "
+        f"{', '.join(IMPORT_COLUMNS)}, reporting the rows that were rejected"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", help="File to import, - reads from stdin")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            dest="file_format",
+            help="Defaults to the file extension",
+        )
+        parser.add_argument(
+            "--rejects",
+            help="Write the rejected rows to this CSV file instead of stderr",
+        )
+
+    def handle(self, *args: Tuple, **kwargs: Any) -> None:
+        path: str = kwargs["path"]
+        file_format: Optional[str] = kwargs["file_format"] or Path(path).suffix[1:]
+        if file_format not in FORMATS:
+            raise CommandError("Pass --format csv or --format ndjson.")
+
+        started: float = time.perf_counter()
+        with ExitStack() as stack:
+            # Rejects go to stderr through a buffer unless --rejects names a file.
+            buffer: io.StringIO = io.StringIO()
+            rejects: IO[str] = (
+                stack.enter_context(open(kwargs["rejects"], "w", newline=""))
+                if kwargs["rejects"]
+                else buffer
+            )
+            try:
+                source: IO[str] = (
+                    sys.stdin
+                    if path == "-"
+                    else stack.enter_context(open(path, newline=""))
+                )
+                result: Dict[str, int] = import_students(source, file_format, rejects)
+            except (OSError, ValueError, DatabaseError) as error:
+                raise CommandError(f"Unable to import {path}: {error}")
+
+            if result["rejected"] and not kwargs["rejects"]:
+                self.stderr.write(buffer.getvalue(), ending="")
+
+        elapsed: float = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result['imported']} students, "
+                f"rejected {result['rejected']} rows in {elapsed:.1f}s"
+            )
+        )
@@ -0,0 +1,32 @@
+from typing import Dict, Tuple
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db.models import QuerySet
+
+from core.models import School, SchoolStatistics
+from services.core_services import recount_enrolled_students
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the enrolled student counter and statistics of schools from their "
+        "active students"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--school",
+            action="append",
+            type=int,
+            dest="schools",
+            help="Only recount this school ID, can be repeated",
+        )
+
+    def handle(self, *args: Tuple, **kwargs: Dict) -> None:
+        schools: QuerySet = School.objects.all()
+        if kwargs["schools"]:
+            schools = schools.filter(pk__in=kwargs["schools"])
+
+        updated: int = recount_enrolled_students(schools)
+        SchoolStatistics.objects.rebuild(kwargs["schools"] or None)
+        self.stdout.write(self.style.SUCCESS(f"Recounted {updated} schools"))
@@ -0,0 +1,35 @@
+# Generated by Django 3.2 on 2026-10-18 20:20
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_enrolled_count(apps, schema_editor):
+    School = apps.get_model("core", "School")
+    Student = apps.get_model("core", "Student")
+
+    active_students = (
+        Student.objects.filter(school=OuterRef("pk"), is_active=True)
+        .order_by()
+        .values("school")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    School.objects.update(enrolled_count=Coalesce(Subquery(active_students), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="school",
+            name="enrolled_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_enrolled_count, migrations.RunPython.noop),
+    ]
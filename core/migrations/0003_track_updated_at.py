@@ -0,0 +1,27 @@
+# Generated by Django 3.2 on 2026-10-18 20:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_school_enrolled_count"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="school",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, db_index=True, null=True, verbose_name="Updated date"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="student",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, db_index=True, null=True, verbose_name="Updated date"
+            ),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 3.2 on 2026-10-18 20:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_track_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="school",
+            index=models.Index(
+                condition=models.Q(is_active=True),
+                fields=["-created_at", "-id"],
+                name="school_active_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="school",
+            index=models.Index(
+                condition=models.Q(is_active=True),
+                fields=["location", "-created_at", "-id"],
+                name="school_active_location_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(
+                condition=models.Q(is_active=True),
+                fields=["-created_at", "-id"],
+                name="student_active_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(
+                condition=models.Q(is_active=True),
+                fields=["school", "-created_at", "-id"],
+                name="student_active_school_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(
+                condition=models.Q(is_active=True),
+                fields=["first_name", "-created_at", "-id"],
+                name="student_active_first_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(
+                condition=models.Q(is_active=True),
+                fields=["last_name", "-created_at", "-id"],
+                name="student_active_last_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,58 @@
+from django.db import DatabaseError, migrations, transaction
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+
+SEARCH_COLUMNS = ("first_name", "last_name")
+
+
+def create_trigram_indexes(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor
+) -> None:
+    # pg_trgm is optional, without it search only matches name prefixes.
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+        try:
+            with transaction.atomic(using=schema_editor.connection.alias):
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        except DatabaseError:
+            return
+        for column in SEARCH_COLUMNS:
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS student_{column}_trgm_idx ON student "
+                f"USING gin (lower({column}) gin_trgm_ops) WHERE is_active"
+            )
+
+
+def drop_trigram_indexes(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor
+) -> None:
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(f"DROP INDEX IF EXISTS student_{column}_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_list_indexes"),
+    ]
+
+    operations = [
+        # Prefix matches on the lowered names, LIKE 'term%' needs text_pattern_ops
+        # to use an index whatever the database collation. Either name leads one of
+        # the indexes, a second word is matched on the other name from the index.
+        migrations.RunSQL(
+            sql=[
+                f"CREATE INDEX student_{first}_{second}_prefix_idx ON student "
+                f"(lower({first}) text_pattern_ops, lower({second}) text_pattern_ops) "
+                f"WHERE is_active"
+                for first, second in (SEARCH_COLUMNS, SEARCH_COLUMNS[::-1])
+            ],
+            reverse_sql=[
+                f"DROP INDEX student_{first}_{second}_prefix_idx"
+                for first, second in (SEARCH_COLUMNS, SEARCH_COLUMNS[::-1])
+            ],
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 3.2 on 2026-10-18 21:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Counts the students enrolled before the table existed, later writes keep it current.
+POPULATE_STATISTICS = """
+INSERT INTO school_statistics (
+    school_id, students, age_total, gender_male, gender_female,
+    title_mr, title_mrs, title_miss, title_ms, updated_at
+)
+SELECT school_id, count(*), coalesce(sum(age), 0),
+    count(*) FILTER (WHERE gender = 'MALE'), count(*) FILTER (WHERE gender = 'FEMALE'),
+    count(*) FILTER (WHERE title = 'MR'), count(*) FILTER (WHERE title = 'MRS'),
+    count(*) FILTER (WHERE title = 'MISS'), count(*) FILTER (WHERE title = 'MS'), now()
+FROM student WHERE is_active AND school_id IS NOT NULL GROUP BY school_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_student_name_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SchoolStatistics",
+            fields=[
+                (
+                    "school",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="statistics",
+                        serialize=False,
+                        to="core.school",
+                    ),
+                ),
+                ("students", models.IntegerField(default=0)),
+                ("age_total", models.BigIntegerField(default=0)),
+                ("gender_male", models.IntegerField(default=0)),
+                ("gender_female", models.IntegerField(default=0)),
+                ("title_mr", models.IntegerField(default=0)),
+                ("title_mrs", models.IntegerField(default=0)),
+                ("title_miss", models.IntegerField(default=0)),
+                ("title_ms", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "school_statistics",
+            },
+        ),
+        migrations.RunSQL(POPULATE_STATISTICS, migrations.RunSQL.noop),
+    ]
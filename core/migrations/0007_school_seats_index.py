@@ -0,0 +1,26 @@
+# Generated by Django 3.2 on 2026-10-18 21:40
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_school_statistics"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="school",
+            index=models.Index(
+                django.db.models.expressions.CombinedExpression(
+                    django.db.models.expressions.F("student_max_number"),
+                    "-",
+                    django.db.models.expressions.F("enrolled_count"),
+                ),
+                condition=models.Q(is_active=True),
+                name="school_active_seats_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.2 on 2026-10-18 22:10
+
+from django.db import migrations, models
+
+# Keyset pages seek on created_at, rows saved without one get their last update time.
+BACKFILL_CREATED_AT = """
+UPDATE school SET created_at = coalesce(updated_at, now()) WHERE created_at IS NULL;
+UPDATE student SET created_at = coalesce(updated_at, now()) WHERE created_at IS NULL;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0008_change_log"),
+    ]
+
+    operations = [
+        migrations.RunSQL(BACKFILL_CREATED_AT, migrations.RunSQL.noop),
+        migrations.AlterField(
+            model_name="school",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True, db_index=True, verbose_name="Creation date"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="student",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True, db_index=True, verbose_name="Creation date"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 22:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0009_created_at_not_null"),
+    ]
+
+    operations = [
+        # The number of students is the school's enrolled_count.
+        migrations.RemoveField(
+            model_name="schoolstatistics",
+            name="students",
+        ),
+    ]
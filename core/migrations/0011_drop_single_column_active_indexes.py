@@ -0,0 +1,33 @@
+# Generated by Django 3.2 on 2026-10-18 23:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0010_remove_schoolstatistics_students"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="school",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, verbose_name="Creation date"),
+        ),
+        migrations.AlterField(
+            model_name="school",
+            name="is_active",
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AlterField(
+            model_name="student",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, verbose_name="Creation date"),
+        ),
+        migrations.AlterField(
+            model_name="student",
+            name="is_active",
+            field=models.BooleanField(default=True),
+        ),
+    ]
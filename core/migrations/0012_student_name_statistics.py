@@ -0,0 +1,41 @@
+from django.db import migrations
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+
+SEARCH_COLUMNS = ("first_name", "last_name")
+# Statistics on expressions came with PostgreSQL 14.
+EXPRESSION_STATISTICS_VERSION = 140000
+
+
+def create_name_statistics(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor
+) -> None:
+    # The prefix indexes are partial, so ANALYZE keeps no statistics of the lowered
+    # names and every LIKE 'term%' is guessed at the same share of the students.
+    # Rare names were then read by walking the list index to its end.
+    if schema_editor.connection.pg_version < EXPRESSION_STATISTICS_VERSION:
+        return
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(
+            f"CREATE STATISTICS IF NOT EXISTS student_{column}_lower_stats "
+            f"ON (lower({column})) FROM student"
+        )
+    schema_editor.execute("ANALYZE student")
+
+
+def drop_name_statistics(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor
+) -> None:
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(f"DROP STATISTICS IF EXISTS student_{column}_lower_stats")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0011_drop_single_column_active_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_name_statistics, drop_name_statistics),
+    ]
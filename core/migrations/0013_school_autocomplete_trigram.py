@@ -0,0 +1,40 @@
+from django.db import migrations
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+
+AUTOCOMPLETE_COLUMNS = ("name", "location")
+
+
+def create_trigram_indexes(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor
+) -> None:
+    # Autocomplete without the in-memory index matches a word anywhere in the lowered
+    # name or location, LIKE '% term%' can only use a trigram index. pg_trgm is
+    # installed by 0005 when the server provides it.
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+        for column in AUTOCOMPLETE_COLUMNS:
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS school_{column}_trgm_idx ON school "
+                f"USING gin (lower({column}) gin_trgm_ops) WHERE is_active"
+            )
+
+
+def drop_trigram_indexes(
+    apps: StateApps, schema_editor: BaseDatabaseSchemaEditor
+) -> None:
+    for column in AUTOCOMPLETE_COLUMNS:
+        schema_editor.execute(f"DROP INDEX IF EXISTS school_{column}_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0012_student_name_statistics"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
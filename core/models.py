@@ -1,12 +1,16 @@
 import uuid
-from typing import Dict
+from collections import Counter, defaultdict
+from typing import Any, DefaultDict, Dict, Iterable, List, Optional, Tuple, Type, Union
 
-from django.db import models
+from django.db import connection, models, transaction
 from django.db.models.base import ModelBase
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from utils.autocomplete import AutocompleteIndex
+from utils.cache import invalidate_response_cache
 from utils.constants import ALLOW_NOT_NULL, CHAR_NOT_NULL_BLANK, NULL_BLANK
 from utils.models import BaseModel
 
@@ -23,24 +27,102 @@ class TitleChoice(models.TextChoices):
     MS = "MS", _("Ms")
 
 
+# Seats a school has left, negative when over capacity after lowering its maximum.
+SEATS_LEFT: models.Expression = models.F("student_max_number") - models.F(
+    "enrolled_count"
+)
+
+
 class School(BaseModel):
     name = models.CharField(max_length=20, db_index=True, unique=True, **ALLOW_NOT_NULL)
     code = models.CharField(max_length=20, **ALLOW_NOT_NULL)
     location = models.CharField(db_index=True, **CHAR_NOT_NULL_BLANK)
     student_max_number = models.PositiveIntegerField(default=100)
+    # Active students currently assigned, maintained on every enrolment change.
+    enrolled_count = models.PositiveIntegerField(default=0)
 
     class Meta:
         db_table: str = "school"
+        # Lists read active rows newest first, optionally filtered by location.
+        indexes: List[models.Index] = [
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(is_active=True),
+                name="school_active_created_idx",
+            ),
+            models.Index(
+                fields=["location", "-created_at", "-id"],
+                condition=models.Q(is_active=True),
+                name="school_active_location_idx",
+            ),
+            # For ?min_seats=, which compares this expression.
+            models.Index(
+                SEATS_LEFT,
+                condition=models.Q(is_active=True),
+                name="school_active_seats_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return str(self.name)
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        # enrolled_count and is_active are only moved by their own UPDATEs, writing
+        # back the values loaded with the instance would undo the enrolments and
+        # deactivations committed since.
+        if (
+            kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+            and not self._state.adding
+        ):
+            kwargs["update_fields"] = [
+                field.attname
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in ("enrolled_count", "is_active")
+            ]
+        super().save(*args, **kwargs)
+
 
 @receiver(post_save, sender=School)
 def set_null_inactive(sender: ModelBase, instance: School, **kwargs: Dict) -> None:
     # If school is set to null, then set all related items to None so the students can be reassigned to another school.
     if not instance.is_active:
-        instance.student.all().update(school_id=None)
+        ChangeLog.objects.record_queryset(instance.student.all(), ChangeAction.UPDATED)
+        instance.student.all().update(school_id=None, updated_at=timezone.now())
+        School.objects.filter(pk=instance.pk).update(enrolled_count=0)
+        SchoolStatistics.objects.filter(school=instance).delete()
+        instance.enrolled_count = 0
+
+
+# Active school names and locations for the autocomplete endpoint.
+school_autocomplete: AutocompleteIndex = AutocompleteIndex(
+    "schools", ("name", "location"), lambda: School.objects.filter(is_active=True)
+)
+
+
+@receiver(post_save, sender=School)
+def update_school_autocomplete(
+    sender: ModelBase, instance: School, **kwargs: Dict
+) -> None:
+    # Applied once committed, so rolled back writes never reach the index.
+    pk: int = instance.pk
+    row: Optional[Dict] = (
+        {"id": pk, "name": instance.name, "location": instance.location}
+        if instance.is_active
+        else None
+    )
+    transaction.on_commit(lambda: school_autocomplete.update(pk, row))
+
+
+# Student columns the school statistics are counted from.
+STATISTICS_FIELDS: Tuple[str, ...] = (
+    "school_id",
+    "is_active",
+    "age",
+    "gender",
+    "title",
+)
 
 
 class Student(BaseModel):
@@ -61,6 +143,285 @@ class Student(BaseModel):
 
     class Meta:
         db_table: str = "student"
+        # Lists read active rows newest first, optionally filtered by school or name.
+        indexes: List[models.Index] = [
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(is_active=True),
+                name="student_active_created_idx",
+            ),
+            models.Index(
+                fields=["school", "-created_at", "-id"],
+                condition=models.Q(is_active=True),
+                name="student_active_school_idx",
+            ),
+            models.Index(
+                fields=["first_name", "-created_at", "-id"],
+                condition=models.Q(is_active=True),
+                name="student_active_first_idx",
+            ),
+            models.Index(
+                fields=["last_name", "-created_at", "-id"],
+                condition=models.Q(is_active=True),
+                name="student_active_last_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.first_name} - {self.last_name}"
+
+    @classmethod
+    def from_db(
+        cls, db: Optional[str], field_names: List[str], values: List
+    ) -> "Student":
+        instance: Student = super().from_db(db, field_names, values)
+        # Saves move the school statistics by the difference to the loaded row.
+        instance.loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def get_statistics_values(self) -> Dict:
+        return {field: getattr(self, field) for field in STATISTICS_FIELDS}
+
+
+class SchoolStatisticsManager(models.Manager):
+    def upsert(self, source: str, params: List) -> None:
+        # Adds the (school_id, *COUNTERS) rows selected by source to the schools'
+        # rows, creating the missing ones.
+        table: str = self.model._meta.db_table
+        counters: Tuple[str, ...] = self.model.COUNTERS
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (school_id, {', '.join(counters)}, updated_at) "
+                f"SELECT *, %s FROM ({source}) deltas ORDER BY 1 "
+                "ON CONFLICT (school_id) DO UPDATE SET "
+                + ", ".join(
+                    f"{name} = {table}.{name} + EXCLUDED.{name}" for name in counters
+                )
+                + ", updated_at = EXCLUDED.updated_at",
+                [timezone.now(), *params],
+            )
+
+    def get_aggregates(self, age: str = "age") -> Tuple[List[str], List]:
+        # Expressions computing COUNTERS over a group of student rows.
+        expressions: List[str] = [f"coalesce(sum({age}), 0)"]
+        params: List = []
+        for column, choices in (
+            ("gender", GendorChoice.values),
+            ("title", TitleChoice.values),
+        ):
+            for choice in choices:
+                expressions.append(f"count(*) FILTER (WHERE {column} = %s)")
+                params.append(choice)
+        return expressions, params
+
+    def record_changes(
+        self, changes: Iterable[Tuple[Optional[Dict], Optional[Dict]]]
+    ) -> None:
+        # Changes are the (before, after) statistics values of students, None for rows
+        # that didn't or no longer exist.
+        deltas: DefaultDict[int, Counter] = defaultdict(Counter)
+        for before, after in changes:
+            for sign, values in ((-1, before), (1, after)):
+                if (
+                    values is None
+                    or values["school_id"] is None
+                    or not values["is_active"]
+                ):
+                    continue
+                delta: Counter = deltas[values["school_id"]]
+                delta["age_total"] += sign * values["age"]
+                delta[f"gender_{values['gender'].lower()}"] += sign
+                delta[f"title_{values['title'].lower()}"] += sign
+
+        rows: List[List[int]] = [
+            [school_id, *(delta[name] for name in self.model.COUNTERS)]
+            for school_id, delta in deltas.items()
+            if any(delta.values())
+        ]
+        if rows:
+            placeholders: str = ", ".join(["%s"] * (len(self.model.COUNTERS) + 1))
+            self.upsert(
+                "VALUES " + ", ".join([f"({placeholders})"] * len(rows)),
+                [value for row in rows for value in row],
+            )
+
+    def rebuild(self, school_ids: Optional[Iterable[int]] = None) -> None:
+        # Recounts from the active students, for writes made without the deltas.
+        expressions, params = self.get_aggregates()
+        statistics: models.QuerySet = self.all()
+        condition: str = "is_active AND school_id IS NOT NULL"
+        if school_ids is not None:
+            school_ids = list(school_ids)
+            statistics = statistics.filter(school_id__in=school_ids)
+            condition += " AND school_id = ANY(%s)"
+            params.append(school_ids)
+
+        with transaction.atomic():
+            statistics.delete()
+            self.upsert(
+                f"SELECT school_id, {', '.join(expressions)} "
+                f"FROM {Student._meta.db_table} WHERE {condition} GROUP BY school_id",
+                params,
+            )
+
+
+class SchoolStatistics(models.Model):
+    """
+    Active student figures of a school, moved along with every enrolment change so
+    reading them doesn't aggregate the students. Their number is the school's
+    enrolled_count, not a second counter that could drift from it
+    """
+
+    COUNTERS: Tuple[str, ...] = (
+        "age_total",
+        *(f"gender_{choice.lower()}" for choice in GendorChoice.values),
+        *(f"title_{choice.lower()}" for choice in TitleChoice.values),
+    )
+
+    school = models.OneToOneField(
+        School, on_delete=models.CASCADE, primary_key=True, related_name="statistics"
+    )
+    age_total = models.BigIntegerField(default=0)
+    gender_male = models.IntegerField(default=0)
+    gender_female = models.IntegerField(default=0)
+    title_mr = models.IntegerField(default=0)
+    title_mrs = models.IntegerField(default=0)
+    title_miss = models.IntegerField(default=0)
+    title_ms = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects: SchoolStatisticsManager = SchoolStatisticsManager()
+
+    class Meta:
+        db_table: str = "school_statistics"
+
+    def __str__(self) -> str:
+        return f"{self.school_id} - {self.age_total}"
+
+
+@receiver(pre_save, sender=Student)
+def load_statistics_values(
+    sender: ModelBase, instance: Student, **kwargs: Dict
+) -> None:
+    # Students saved without having been loaded whole are read first.
+    loaded: Dict = getattr(instance, "loaded_values", {})
+    if not instance._state.adding and not set(STATISTICS_FIELDS) <= set(loaded):
+        instance.loaded_values = (
+            Student.objects.filter(pk=instance.pk).values(*STATISTICS_FIELDS).first()
+        )
+
+
+@receiver(post_save, sender=Student)
+def update_school_statistics(
+    sender: ModelBase, instance: Student, created: bool, **kwargs: Dict
+) -> None:
+    values: Dict = instance.get_statistics_values()
+    SchoolStatistics.objects.record_changes(
+        [(None if created else instance.loaded_values, values)]
+    )
+    instance.loaded_values = {
+        **(getattr(instance, "loaded_values", None) or {}),
+        **values,
+    }
+
+
+@receiver(post_save, sender=School)
+@receiver(post_save, sender=Student)
+def invalidate_cached_responses(
+    sender: ModelBase, instance: Union[School, Student], **kwargs: Dict
+) -> None:
+    # Students embed their school, so any write invalidates every cached response.
+    invalidate_response_cache()
+
+
+class ChangeAction(models.TextChoices):
+    # Labels are derived from the names, so type checkers see the members as str.
+    CREATED = "created"
+    UPDATED = "updated"
+    DEACTIVATED = "deactivated"
+
+
+class ChangeLogManager(models.Manager):
+    def get_log_sql(self, source: str) -> Tuple[str, str]:
+        # The CTE running source and the INSERT logging the rows whose id it returns.
+        return (
+            f"WITH changed AS ({source})",
+            f"INSERT INTO {self.model._meta.db_table} "
+            "(txid, model, object_id, action, changed_at) "
+            "SELECT txid_current(), %s, id, %s, %s FROM changed ORDER BY id",
+        )
+
+    def record_sql(
+        self, model: Type[models.Model], action: str, source: str, params: List
+    ) -> int:
+        # Logs the rows whose id source returns, source may be an INSERT/UPDATE ...
+        # RETURNING id so the write and its log are a single statement.
+        changed, log = self.get_log_sql(source)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"{changed} {log}",
+                [*params, model._meta.model_name, action, timezone.now()],
+            )
+            return int(cursor.rowcount)
+
+    def record_sql_returning(
+        self, model: Type[models.Model], action: str, source: str, params: List
+    ) -> List[Tuple]:
+        # Same as record_sql, returning the rows of source, e.g. the columns set by an
+        # UPDATE ... RETURNING id, ...
+        changed, log = self.get_log_sql(source)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"{changed}, logged AS ({log}) SELECT * FROM changed",
+                [*params, model._meta.model_name, action, timezone.now()],
+            )
+            return list(cursor.fetchall())
+
+    def record(
+        self, model: Type[models.Model], action: str, pks: Iterable[int]
+    ) -> None:
+        pks = list(pks)
+        if pks:
+            self.record_sql(model, action, "SELECT unnest(%s::bigint[]) AS id", [pks])
+
+    def record_queryset(self, queryset: models.QuerySet, action: str) -> None:
+        sql, params = queryset.order_by().values("pk").query.sql_with_params()
+        self.record_sql(queryset.model, action, sql, list(params))
+
+
+class ChangeLog(models.Model):
+    """
+    Append-only log of the school and student writes, written in their transaction
+    and read in (txid, id) order by the changes feed
+    """
+
+    txid = models.BigIntegerField()
+    model = models.CharField(max_length=20)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=11, choices=ChangeAction.choices)
+    changed_at = models.DateTimeField()
+
+    objects: ChangeLogManager = ChangeLogManager()
+
+    class Meta:
+        db_table: str = "change_log"
+        indexes: List[models.Index] = [
+            models.Index(fields=["txid", "id"], name="change_log_position_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.model} {self.object_id} {self.action}"
+
+
+@receiver(post_save, sender=School)
+@receiver(post_save, sender=Student)
+def log_change(
+    sender: ModelBase, instance: Union[School, Student], created: bool, **kwargs: Dict
+) -> None:
+    if created:
+        action: str = ChangeAction.CREATED
+    elif not instance.is_active:
+        action = ChangeAction.DEACTIVATED
+    else:
+        action = ChangeAction.UPDATED
+    ChangeLog.objects.record(sender, action, [instance.pk])
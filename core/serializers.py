@@ -1,31 +1,122 @@
 import logging
 from logging import Logger
-from typing import Dict, Tuple, Type, Union
+from typing import Dict, Optional, Tuple, Type, Union
 
+from rest_framework.exceptions import NotFound
 from rest_framework.serializers import (
+    DateTimeField,
+    IntegerField,
     ModelSerializer,
     PrimaryKeyRelatedField,
+    SerializerMethodField,
     ValidationError,
 )
 
-from core.models import School, Student
-from services.core_services import age_validation_check, is_max_student_count
+from core.models import (
+    ChangeLog,
+    GendorChoice,
+    School,
+    SchoolStatistics,
+    Student,
+    TitleChoice,
+)
+from services.core_services import (
+    adjust_enrolled_count,
+    admit_to_school,
+    age_validation_check,
+    count_free_seats,
+    lock_student,
+    reserve_seat,
+)
+from utils.fields import DerivedField
+from utils.serializers import AtomicSaveMixin, SparseFieldsetMixin
 
 logger: Logger = logging.getLogger(__name__)
 
 
-class SchoolSerializer(ModelSerializer):
+class SchoolSerializer(AtomicSaveMixin, SparseFieldsetMixin, ModelSerializer):
+    seats_available: DerivedField = DerivedField(
+        ("student_max_number", "enrolled_count"), count_free_seats
+    )
+
     class Meta:
         model: Type[School] = School
         fields: str = "__all__"
-        read_only_fields: Tuple = ("is_active", "created_at", "updated_at")
+        read_only_fields: Tuple = (
+            "is_active",
+            "created_at",
+            "updated_at",
+            "enrolled_count",
+        )
 
 
-class StudentSerializer(ModelSerializer):
+class SchoolStatisticsSerializer(ModelSerializer):
+    # Figures of the active students, read from the school's statistics row and its
+    # enrolled_count. The row's updated_at also makes it joined in and part of the
+    # ETag.
+    updated_at: DateTimeField = DateTimeField(
+        source="statistics.updated_at", read_only=True, allow_null=True
+    )
+    students: SerializerMethodField = SerializerMethodField()
+    seats_remaining: SerializerMethodField = SerializerMethodField()
+    average_age: SerializerMethodField = SerializerMethodField()
+    genders: SerializerMethodField = SerializerMethodField()
+    titles: SerializerMethodField = SerializerMethodField()
+
+    class Meta:
+        model: Type[School] = School
+        fields: Tuple = (
+            "id",
+            "name",
+            "student_max_number",
+            "students",
+            "seats_remaining",
+            "average_age",
+            "genders",
+            "titles",
+            "updated_at",
+        )
+
+    def get_statistics(self, school: School) -> SchoolStatistics:
+        # Schools without enrolled students have no row yet.
+        try:
+            statistics: SchoolStatistics = school.statistics
+        except SchoolStatistics.DoesNotExist:
+            return SchoolStatistics(school=school)
+        return statistics
+
+    def get_students(self, school: School) -> int:
+        return int(school.enrolled_count)
+
+    def get_seats_remaining(self, school: School) -> int:
+        return count_free_seats(school.student_max_number, self.get_students(school))
+
+    def get_average_age(self, school: School) -> Optional[float]:
+        students: int = self.get_students(school)
+        if not students:
+            return None
+        return round(float(self.get_statistics(school).age_total / students), 2)
+
+    def get_genders(self, school: School) -> Dict[str, int]:
+        statistics: SchoolStatistics = self.get_statistics(school)
+        return {
+            choice: getattr(statistics, f"gender_{choice.lower()}")
+            for choice in GendorChoice.values
+        }
+
+    def get_titles(self, school: School) -> Dict[str, int]:
+        statistics: SchoolStatistics = self.get_statistics(school)
+        return {
+            choice: getattr(statistics, f"title_{choice.lower()}")
+            for choice in TitleChoice.values
+        }
+
+
+class StudentSerializer(AtomicSaveMixin, SparseFieldsetMixin, ModelSerializer):
     school_details: SchoolSerializer = SchoolSerializer(source="school", read_only=True)
     # Added in so we able to pass School_ID instead of School Name
     school: PrimaryKeyRelatedField = PrimaryKeyRelatedField(
-        queryset=School.objects.all(), write_only=True
+        queryset=School.objects.filter(is_active=True), write_only=True
     )
 
     class Meta:
@@ -45,7 +136,7 @@ class StudentSerializer(ModelSerializer):
                 "Students need to be age between 10 to 20 to register!"
             )
 
-        if is_max_student_count(validated_data["school"]):
+        if not reserve_seat(validated_data["school"]):
             logger.error("Unable to add student due to the school being full!")
             raise ValidationError("Unable to add student to school as it is full!")
 
@@ -54,15 +145,21 @@ class StudentSerializer(ModelSerializer):
     def update(
         self, instance: Student, validated_data: Dict
     ) -> Union[School, ValidationError]:
-        school: School = validated_data.get("school", None)
+        # Concurrent moves of the student wait here, then start from its school.
+        if not lock_student(instance):
+            raise NotFound()
+        school: Optional[School] = validated_data.get("school", None)
+        previous_school_id: Optional[int] = instance.school_id
 
-        if school and is_max_student_count(school):
-            raise ValidationError("Unable to add student to school as it is full!")
+        if school and school.pk != previous_school_id:
+            if not reserve_seat(school):
+                raise ValidationError("Unable to add student to school as it is full!")
+            adjust_enrolled_count(previous_school_id, -1)
 
         return super().update(instance, validated_data)
 
 
-class StudentNestedSerializer(ModelSerializer):
+class StudentNestedSerializer(AtomicSaveMixin, SparseFieldsetMixin, ModelSerializer):
     school_details: SchoolSerializer = SchoolSerializer(source="school", read_only=True)
 
     class Meta:
@@ -71,11 +168,6 @@ class StudentNestedSerializer(ModelSerializer):
         read_only_fields: Tuple = ("is_active", "identification", "school")
 
     def create(self, validated_data: Dict) -> Union[School, ValidationError]:
-        school_object: School = School.objects.get(
-            pk=self.context["view"].kwargs["school_pk"]
-        )
-        validated_data["school"] = school_object
-
         if age_validation_check(validated_data["age"]):
             logger.error(
                 "Unable to create student due to them not being in the age range of 10 to 20!"
@@ -84,4 +176,49 @@ class StudentNestedSerializer(ModelSerializer):
                 "Students need to be age between 10 to 20 to register!"
             )
 
-        return super().create(validated_data)
+        school_pk: str = self.context["view"].kwargs["school_pk"]
+        school: Optional[School] = admit_to_school(school_pk)
+        if school is not None:
+            validated_data["school"] = school
+            return super().create(validated_data)
+
+        # Only a refused admission looks again, to tell a missing school from a full one.
+        if not School.objects.filter(pk=school_pk, is_active=True).exists():
+            raise NotFound()
+        logger.error("Unable to add student due to the school being full!")
+        raise ValidationError("Unable to add student to school as it is full!")
+
+    def update(self, instance: Student, validated_data: Dict) -> Student:
+        # Waits for concurrent removals and saves the row as they left it, rather than
+        # reactivating a student deactivated since the view loaded it.
+        if not lock_student(instance):
+            raise NotFound()
+        student: Student = super().update(instance, validated_data)
+        return student
+
+
+class StudentBulkCreateSerializer(ModelSerializer):
+    # Schools are resolved for the whole batch at once rather than per row.
+    school: IntegerField = IntegerField(min_value=1)
+
+    class Meta:
+        model: Type[Student] = Student
+        fields: Tuple = ("school", "title", "first_name", "last_name", "age", "gender")
+
+
+class StudentBulkUpdateSerializer(StudentBulkCreateSerializer):
+    id: IntegerField = IntegerField(min_value=1)
+    school: IntegerField = IntegerField(min_value=1, required=False)
+
+    class Meta(StudentBulkCreateSerializer.Meta):
+        fields: Tuple = ("id", *StudentBulkCreateSerializer.Meta.fields)
+        extra_kwargs: Dict = {
+            field: {"required": False}
+            for field in StudentBulkCreateSerializer.Meta.fields
+        }
+
+
+class ChangeSerializer(ModelSerializer):
+    class Meta:
+        model: Type[ChangeLog] = ChangeLog
+        fields: Tuple = ("id", "model", "object_id", "action", "changed_at")
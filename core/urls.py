@@ -3,13 +3,19 @@ from typing import List
 from django.urls import include, path
 from rest_framework_nested.routers import NestedDefaultRouter, SimpleRouter
 
-from core.views import SchoolViewSet, StudentNestedViewSet, StudentViewSet
+from core.views import (
+    ChangeViewSet,
+    SchoolViewSet,
+    StudentNestedViewSet,
+    StudentViewSet,
+)
 
 app_name: str = "api"
 
 router: SimpleRouter = SimpleRouter()
 router.register(r"schools", SchoolViewSet, basename="schools")
 router.register(r"students", StudentViewSet, basename="students")
+router.register(r"changes", ChangeViewSet, basename="changes")
 
 # Nested Routes
 student_router: NestedDefaultRouter = NestedDefaultRouter(
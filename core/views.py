@@ -1,17 +1,35 @@
-from typing import Type
+from typing import Dict, List, Optional, Tuple, Type
 
-from core.filters import SchoolFilter, StudentFilter, StudentNestedFilter
-from core.models import School, Student
+from django.db.models import QuerySet
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.mixins import ListModelMixin
+from rest_framework.permissions import AllowAny
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet
+
+from core.filters import ChangeFilter, SchoolFilter, StudentFilter, StudentNestedFilter
+from core.models import ChangeLog, School, Student, school_autocomplete
 from core.serializers import (
+    ChangeSerializer,
     SchoolSerializer,
+    SchoolStatisticsSerializer,
     StudentNestedSerializer,
     StudentSerializer,
 )
-from utils.pagination import LargeSizePagination, StandardSizePagination
-from utils.views import BaseModel
+from utils.constants import AUTOCOMPLETE_LIMIT, AUTOCOMPLETE_MAX_LIMIT
+from utils.pagination import (
+    ChangeFeedPagination,
+    LargeKeysetPagination,
+    LargeSizePagination,
+    StandardKeysetPagination,
+    StandardSizePagination,
+)
+from utils.views import BaseModel, ExportMixin, StudentBulkMixin
 
 
-class SchoolViewSet(BaseModel):
+class SchoolViewSet(ExportMixin, BaseModel):
     """
     list:
     Return a list of active existing schools.
@@ -30,18 +48,82 @@ class SchoolViewSet(BaseModel):
 
     delete:
     Delete an instance of a school.
+
+    deactivate:
+    Delete the schools matching a list of IDs and/or the list filters.
+
+    export:
+    Stream every school matching the list filters as NDJSON, or CSV with ?format=csv.
+
+    autocomplete:
+    Return up to ?limit= active schools whose name, then location, has a word starting
+    with ?q=, from memory.
+
+    stats:
+    Return the enrolment, seats remaining, average age and gender/title breakdown of
+    the schools matching the list filters.
+
+    detail_stats:
+    Return the statistics of a school instance by ID.
     """
 
-    queryset: School = School.objects.filter(is_active=True).order_by("-created_at")
+    queryset: School = School.objects.filter(is_active=True).order_by(
+        "-created_at", "-id"
+    )
+    # Also the school_pk of the nested student routes.
+    lookup_value_regex: str = "[0-9]+"
     serializer_class: Type[SchoolSerializer] = SchoolSerializer
     filterset_class: Type[SchoolFilter] = SchoolFilter
     pagination_class: Type[StandardSizePagination] = StandardSizePagination
+    pagination_classes: Dict = {
+        "offset": StandardSizePagination,
+        "keyset": StandardKeysetPagination,
+    }
+    fast_read_actions: Tuple[str, ...] = ("list", "retrieve")
+    query_budgets: Dict[str, int] = {
+        "list": 3,
+        "retrieve": 1,
+        "create": 3,
+        "update": 4,
+        "partial_update": 4,
+        "destroy": 8,
+        "deactivate": 6,
+        "export": 1,
+        "autocomplete": 1,
+        "stats": 3,
+        "detail_stats": 1,
+    }
 
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def autocomplete(self, request: Request, *args: Tuple, **kwargs: Dict) -> Response:
+        # The database is only read to load the index, at most once per request.
+        limit: str = request.query_params.get("limit", str(AUTOCOMPLETE_LIMIT))
+        if not limit.isdigit() or int(limit) < 1:
+            raise ValidationError({"limit": ["Expected a positive integer."]})
 
-class StudentViewSet(BaseModel):
+        results: List[Dict] = school_autocomplete.search(
+            request.query_params.get("q", ""), min(int(limit), AUTOCOMPLETE_MAX_LIMIT)
+        )
+        return Response({"results": results})
+
+    @action(detail=False, methods=["get"], serializer_class=SchoolStatisticsSerializer)
+    def stats(self, request: Request, *args: Tuple, **kwargs: Dict) -> Response:
+        return self.list(request, *args, **kwargs)
+
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="stats",
+        serializer_class=SchoolStatisticsSerializer,
+    )
+    def detail_stats(self, request: Request, *args: Tuple, **kwargs: Dict) -> Response:
+        return self.retrieve(request, *args, **kwargs)
+
+
+class StudentViewSet(ExportMixin, StudentBulkMixin, BaseModel):
     """
     list:
-    Return a list of active existing students.
+    Return a list of active existing students, ?search= matches them by name.
 
     create:
     Create a new instance of a student.
@@ -57,24 +139,57 @@ class StudentViewSet(BaseModel):
 
     delete:
     Delete an instance of a student
+
+    deactivate:
+    Delete the students matching a list of IDs and/or the list filters.
+
+    export:
+    Stream every student matching the list filters as NDJSON, or CSV with ?format=csv.
+
+    bulk:
+    Create a list of students, reporting the rows that could not be created.
+
+    bulk_update:
+    Update selected fields of a list of students by ID, reporting the rows that could
+    not be updated.
     """
 
-    queryset: Student = Student.objects.filter(is_active=True).order_by("-created_at")
+    queryset: Student = Student.objects.filter(is_active=True).order_by(
+        "-created_at", "-id"
+    )
     serializer_class: Type[StudentSerializer] = StudentSerializer
     filterset_class: Type[StudentFilter] = StudentFilter
     pagination_class: Type[LargeSizePagination] = LargeSizePagination
+    pagination_classes: Dict = {
+        "offset": LargeSizePagination,
+        "keyset": LargeKeysetPagination,
+    }
+    fast_read_actions: Tuple[str, ...] = ("list", "retrieve")
+    query_budgets: Dict[str, int] = {
+        "list": 3,
+        "retrieve": 1,
+        "create": 5,
+        "update": 8,
+        "partial_update": 8,
+        "destroy": 6,
+        "deactivate": 5,
+        "export": 1,
+        "bulk": 5,
+        "bulk_update": 6,
+    }
 
 
-class StudentNestedViewSet(BaseModel):
+class StudentNestedViewSet(StudentBulkMixin, BaseModel):
     """
     list:
-    Return a list of active existing schools with active students.
+    Return a list of the school's active students, ?search= matches them by name.
 
     create:
     Create a new instance of a student in a selected school.
 
     retrieve:
-    Retrieve an instance by school and student ID.
+    Retrieve an instance by school and student ID, students of other schools are not
+    found.
 
     update:
     Update a student instance record.
@@ -84,9 +199,61 @@ class StudentNestedViewSet(BaseModel):
 
     delete:
     Delete an instance of a student
+
+    deactivate:
+    Delete the students matching a list of IDs and/or the list filters.
+
+    bulk:
+    Create a list of students in a selected school, reporting the rows that could not be
+    created.
+
+    bulk_update:
+    Update selected fields of a list of students by ID, reporting the rows that could
+    not be updated.
     """
 
-    queryset: Student = Student.objects.filter(is_active=True).order_by("-created_at")
+    queryset: Student = Student.objects.filter(is_active=True).order_by(
+        "-created_at", "-id"
+    )
     serializer_class: Type[StudentNestedSerializer] = StudentNestedSerializer
     filterset_class: Type[StudentNestedFilter] = StudentNestedFilter
     pagination_class: Type[LargeSizePagination] = LargeSizePagination
+    pagination_classes: Dict = {
+        "offset": LargeSizePagination,
+        "keyset": LargeKeysetPagination,
+    }
+    fast_read_actions: Tuple[str, ...] = ("list", "retrieve")
+    query_budgets: Dict[str, int] = {
+        "list": 3,
+        "retrieve": 1,
+        "create": 4,
+        "update": 5,
+        "partial_update": 5,
+        "destroy": 6,
+        "bulk": 5,
+        "bulk_update": 4,
+    }
+
+    def get_queryset(self) -> QuerySet:
+        # Only the school's own students, a range of the (school, created_at, id)
+        # index rather than a scan of every active student.
+        queryset: QuerySet = super().get_queryset()
+        school_pk: Optional[str] = self.kwargs.get("school_pk")
+        if school_pk is not None:
+            queryset = queryset.filter(school_id=school_pk)
+        return queryset
+
+
+class ChangeViewSet(ListModelMixin, GenericViewSet):
+    """
+    list:
+    Return the school and student changes after the ?since= cursor, oldest first, and
+    the cursor to ask for the next ones with; ?model= and ?action= narrow them.
+    """
+
+    queryset: ChangeLog = ChangeLog.objects.all()
+    permission_classes: Tuple = (AllowAny,)
+    serializer_class: Type[ChangeSerializer] = ChangeSerializer
+    filterset_class: Type[ChangeFilter] = ChangeFilter
+    pagination_class: Type[ChangeFeedPagination] = ChangeFeedPagination
+    query_budgets: Dict[str, int] = {"list": 1}
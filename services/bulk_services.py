@@ -0,0 +1,231 @@
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from core.models import (
+    STATISTICS_FIELDS,
+    ChangeAction,
+    ChangeLog,
+    School,
+    SchoolStatistics,
+    Student,
+    school_autocomplete,
+)
+from services.core_services import age_validation_check, apply_enrolled_deltas
+from utils.cache import invalidate_response_cache
+from utils.constants import BULK_BATCH_SIZE
+
+AGE_ERROR_MESSAGE: str = "Students need to be age between 10 to 20 to register!"
+SCHOOL_FULL_ERROR_MESSAGE: str = "Unable to add student to school as it is full!"
+
+
+def row_error(index: int, errors: Dict[str, List[str]]) -> Dict:
+    # Same shape as the serializer errors of the rows that failed validation.
+    return {"index": index, "errors": errors}
+
+
+def invalid_school_error(index: int, school_id: int) -> Dict:
+    return row_error(
+        index, {"school": [f'Invalid pk "{school_id}" - object does not exist.']}
+    )
+
+
+def lock_schools(school_ids: Iterable[int]) -> Dict[int, School]:
+    # Locking the schools makes the seats read here authoritative until commit. Rows
+    # are locked in id order, so batches sharing schools can't deadlock, and inactive
+    # schools are left out like missing ones.
+    schools: QuerySet = (
+        School.objects.select_for_update()
+        .filter(pk__in=list(school_ids), is_active=True)
+        .order_by("pk")
+    )
+    return {school.pk: school for school in schools}
+
+
+def has_free_seat(school: School, admitted: int) -> bool:
+    return bool(school.enrolled_count + admitted < school.student_max_number)
+
+
+def bulk_create_students(
+    rows: List[Tuple[int, Dict]]
+) -> Tuple[List[Student], List[Dict]]:
+    # Rows are (index, validated data) pairs; each school admits its rows in order while
+    # it has seats left and rejected rows are reported back by index.
+    errors: List[Dict] = []
+    eligible: List[Tuple[int, Dict]] = []
+    for index, data in rows:
+        if age_validation_check(data["age"]):
+            errors.append(row_error(index, {"age": [AGE_ERROR_MESSAGE]}))
+        else:
+            eligible.append((index, data))
+
+    students: List[Student] = []
+    admitted: Counter = Counter()
+
+    with transaction.atomic():
+        schools: Dict[int, School] = lock_schools(
+            data["school"] for _, data in eligible
+        )
+
+        for index, data in eligible:
+            school: Optional[School] = schools.get(data["school"])
+            if school is None:
+                errors.append(invalid_school_error(index, data["school"]))
+            elif not has_free_seat(school, admitted[school.pk]):
+                errors.append(row_error(index, {"school": [SCHOOL_FULL_ERROR_MESSAGE]}))
+            else:
+                admitted[school.pk] += 1
+                students.append(Student(**{**data, "school": school}))
+
+        Student.objects.bulk_create(students, batch_size=BULK_BATCH_SIZE)
+        apply_enrolled_deltas(admitted)
+        SchoolStatistics.objects.record_changes(
+            (None, student.get_statistics_values()) for student in students
+        )
+        ChangeLog.objects.record(
+            Student, ChangeAction.CREATED, (student.pk for student in students)
+        )
+        # Bulk writes skip post_save, so invalidate the cached responses here.
+        invalidate_response_cache()
+
+    for school_id, count in admitted.items():
+        schools[school_id].enrolled_count += count
+
+    errors.sort(key=lambda error: int(error["index"]))
+    return students, errors
+
+
+def bulk_update_students(
+    rows: List[Tuple[int, Dict]], queryset: QuerySet
+) -> Tuple[List[Student], List[Dict]]:
+    # Rows are (index, validated data) pairs carrying the student id and the fields to
+    # change; students are looked up in the given queryset so callers control scoping.
+    errors: List[Dict] = []
+    updated: List[Student] = []
+    fields: Set[str] = set()
+    deltas: Counter = Counter()
+    seen: Set[int] = set()
+
+    with transaction.atomic():
+        students: Dict[int, Student] = {
+            student.pk: student
+            for student in queryset.select_for_update(of=("self",)).filter(
+                pk__in=[data["id"] for _, data in rows]
+            )
+        }
+        eligible: List[Tuple[int, Dict]] = []
+
+        for index, data in rows:
+            if data["id"] not in students:
+                errors.append(row_error(index, {"id": ["Not found."]}))
+            elif data["id"] in seen:
+                errors.append(row_error(index, {"id": ["Duplicate id."]}))
+            elif "age" in data and age_validation_check(data["age"]):
+                errors.append(row_error(index, {"age": [AGE_ERROR_MESSAGE]}))
+            else:
+                seen.add(data["id"])
+                eligible.append((index, data))
+
+        schools: Dict[int, School] = lock_schools(
+            data["school"]
+            for _, data in eligible
+            if data.get("school", students[data["id"]].school_id)
+            != students[data["id"]].school_id
+        )
+
+        for index, data in eligible:
+            student: Student = students[data["id"]]
+            school_id: Optional[int] = data.get("school", student.school_id)
+            if school_id is not None and school_id != student.school_id:
+                school: Optional[School] = schools.get(school_id)
+                if school is None:
+                    errors.append(invalid_school_error(index, school_id))
+                    continue
+                if not has_free_seat(school, deltas[school.pk]):
+                    errors.append(
+                        row_error(index, {"school": [SCHOOL_FULL_ERROR_MESSAGE]})
+                    )
+                    continue
+
+                deltas[school.pk] += 1
+                if student.school_id is not None:
+                    deltas[student.school_id] -= 1
+                student.school = school
+                fields.add("school")
+
+            for field, value in data.items():
+                if field not in ("id", "school"):
+                    setattr(student, field, value)
+                    fields.add(field)
+            updated.append(student)
+
+        if updated and fields:
+            # bulk_update skips pre_save, so auto_now has to be applied by hand.
+            modified_at: datetime = timezone.now()
+            for student in updated:
+                student.updated_at = modified_at
+            Student.objects.bulk_update(
+                updated, sorted(fields | {"updated_at"}), batch_size=BULK_BATCH_SIZE
+            )
+            ChangeLog.objects.record(
+                Student, ChangeAction.UPDATED, (student.pk for student in updated)
+            )
+        apply_enrolled_deltas(deltas)
+        SchoolStatistics.objects.record_changes(
+            (student.loaded_values, student.get_statistics_values())
+            for student in updated
+        )
+        invalidate_response_cache()
+
+    for school_id, school in schools.items():
+        school.enrolled_count += deltas[school_id]
+
+    errors.sort(key=lambda error: int(error["index"]))
+    return updated, errors
+
+
+def bulk_deactivate(queryset: QuerySet) -> Dict[str, int]:
+    # Set-based counterpart of BaseModel.destroy and the set_null_inactive signal.
+    queryset = queryset.filter(is_active=True).order_by()
+    modified_at: datetime = timezone.now()
+
+    with transaction.atomic():
+        invalidate_response_cache()
+        if queryset.model is School:
+            school_ids: List[int] = list(
+                queryset.select_for_update().values_list("pk", flat=True)
+            )
+            School.objects.filter(pk__in=school_ids).update(
+                is_active=False, enrolled_count=0, updated_at=modified_at
+            )
+            ChangeLog.objects.record(School, ChangeAction.DEACTIVATED, school_ids)
+            ChangeLog.objects.record_queryset(
+                Student.objects.filter(school_id__in=school_ids), ChangeAction.UPDATED
+            )
+            detached: int = Student.objects.filter(school_id__in=school_ids).update(
+                school_id=None, updated_at=modified_at
+            )
+            SchoolStatistics.objects.filter(school_id__in=school_ids).delete()
+            transaction.on_commit(school_autocomplete.invalidate)
+            return {"deactivated": len(school_ids), "detached_students": detached}
+
+        students: List[Dict] = list(
+            queryset.select_for_update().values("pk", *STATISTICS_FIELDS)
+        )
+        Student.objects.filter(pk__in=[student["pk"] for student in students]).update(
+            is_active=False, updated_at=modified_at
+        )
+        released: Counter = Counter()
+        for student in students:
+            if student["school_id"] is not None:
+                released[student["school_id"]] -= 1
+        apply_enrolled_deltas(released)
+        SchoolStatistics.objects.record_changes((student, None) for student in students)
+        ChangeLog.objects.record(
+            Student, ChangeAction.DEACTIVATED, (student["pk"] for student in students)
+        )
+        return {"deactivated": len(students)}
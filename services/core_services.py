@@ -1,4 +1,12 @@
-from core.models import School
+from typing import Dict, List, Optional, Tuple
+
+from django.db import connection, transaction
+from django.db.models import Count, Field, OuterRef, QuerySet, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.models import STATISTICS_FIELDS, ChangeAction, ChangeLog, School, Student
+from utils.cache import invalidate_response_cache
 from utils.constants import MAXIMUM_AGE, MINIMUM_AGE
 
 
@@ -6,5 +14,118 @@ def age_validation_check(age: int) -> bool:
     return (age < MINIMUM_AGE) or (age > MAXIMUM_AGE)
 
 
-def is_max_student_count(school: School) -> bool:
-    return bool(school.student.count() == school.student_max_number)
+def count_free_seats(student_max_number: int, enrolled_count: int) -> int:
+    return max(student_max_number - enrolled_count, 0)
+
+
+def reserve_seat(school: School) -> bool:
+    # Admission is a single conditional UPDATE, so concurrent enrolments serialise on
+    # the school row and can never push enrolled_count past student_max_number, nor
+    # enrol into a school deactivated meanwhile. The school change is logged by the
+    # same statement.
+    rows: List[Tuple] = ChangeLog.objects.record_sql_returning(
+        School,
+        ChangeAction.UPDATED,
+        f"UPDATE {School._meta.db_table} "
+        "SET enrolled_count = enrolled_count + 1, updated_at = %s "
+        "WHERE id = %s AND is_active AND enrolled_count < student_max_number "
+        "RETURNING id, enrolled_count, updated_at",
+        [timezone.now(), school.pk],
+    )
+    if not rows:
+        return False
+
+    _, school.enrolled_count, school.updated_at = rows[0]
+    return True
+
+
+def admit_to_school(school_pk: object) -> Optional[School]:
+    # Resolves the school and takes one of its seats in the same UPDATE, returning the
+    # school as updated, or None when it is missing, inactive or full.
+    fields: List[Field] = School._meta.concrete_fields
+    rows: List[Tuple] = ChangeLog.objects.record_sql_returning(
+        School,
+        ChangeAction.UPDATED,
+        f"UPDATE {School._meta.db_table} "
+        "SET enrolled_count = enrolled_count + 1, updated_at = %s "
+        "WHERE id = %s AND is_active AND enrolled_count < student_max_number "
+        f"RETURNING {', '.join(field.column for field in fields)}",
+        [timezone.now(), school_pk],
+    )
+    if not rows:
+        return None
+    school: School = School.from_db(
+        connection.alias, [field.attname for field in fields], rows[0]
+    )
+    return school
+
+
+def lock_student(student: Student) -> bool:
+    # Locks the student row until commit and reloads the columns its enrolment and
+    # statistics are moved from, so concurrent writes don't both start from the row
+    # the view loaded. False when the student is no longer active.
+    values: Optional[Dict] = (
+        Student.objects.select_for_update()
+        .filter(pk=student.pk, is_active=True)
+        .values(*STATISTICS_FIELDS)
+        .first()
+    )
+    if values is None:
+        return False
+    for field, value in values.items():
+        setattr(student, field, value)
+    student.loaded_values = values
+    return True
+
+
+def lock_school(school: School) -> bool:
+    # Locks the school row until commit, False when it is no longer active.
+    return bool(
+        School.objects.select_for_update().filter(pk=school.pk, is_active=True).exists()
+    )
+
+
+def adjust_enrolled_count(school_id: Optional[int], delta: int) -> None:
+    if school_id is not None:
+        apply_enrolled_deltas({school_id: delta})
+
+
+def apply_enrolled_deltas(deltas: Dict[int, int]) -> None:
+    # One UPDATE for any number of schools, e.g. after a bulk enrolment, which logs
+    # the school changes too.
+    deltas = {school_id: delta for school_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    table: str = School._meta.db_table
+    ChangeLog.objects.record_sql(
+        School,
+        ChangeAction.UPDATED,
+        f"UPDATE {table} "
+        "SET enrolled_count = greatest(enrolled_count + d.delta, 0), updated_at = %s "
+        "FROM (SELECT unnest(%s::bigint[]) AS id, unnest(%s::integer[]) AS delta) d "
+        f"WHERE {table}.id = d.id RETURNING {table}.id",
+        [timezone.now(), list(deltas), list(deltas.values())],
+    )
+
+
+def recount_enrolled_students(schools: Optional[QuerySet] = None) -> int:
+    active_students: QuerySet = (
+        Student.objects.filter(school=OuterRef("pk"), is_active=True)
+        .order_by()
+        .values("school")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    if schools is None:
+        schools = School.objects.all()
+
+    invalidate_response_cache()
+    with transaction.atomic():
+        ChangeLog.objects.record_queryset(schools, ChangeAction.UPDATED)
+        return int(
+            schools.update(
+                enrolled_count=Coalesce(Subquery(active_students), 0),
+                updated_at=timezone.now(),
+            )
+        )
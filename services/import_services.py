@@ -0,0 +1,269 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+
+from django.db import connection, transaction
+from django.db.backends.utils import CursorWrapper
+from django.utils import timezone
+
+from core.models import (
+    ChangeAction,
+    ChangeLog,
+    GendorChoice,
+    School,
+    SchoolStatistics,
+    Student,
+    TitleChoice,
+    school_autocomplete,
+)
+from services.bulk_services import AGE_ERROR_MESSAGE, SCHOOL_FULL_ERROR_MESSAGE
+from utils.cache import invalidate_response_cache
+from utils.constants import MAXIMUM_AGE, MINIMUM_AGE
+
+IMPORT_COLUMNS: Tuple[str, ...] = (
+    "school",
+    "title",
+    "first_name",
+    "last_name",
+    "age",
+    "gender",
+)
+STAGING_TABLE: str = "student_import"
+# A staged row: its line number in the file, an error or None, the IMPORT_COLUMNS.
+StagingRow = Tuple[int, Optional[str], List[Optional[str]]]
+
+
+class IteratorReader:
+    """
+    Read-only file over an iterator of strings, for feeding generated rows to COPY
+    """
+
+    def __init__(self, chunks: Iterator[str]) -> None:
+        self.chunks: Iterator[str] = chunks
+        self.buffer: str = ""
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self.buffer) < size:
+            chunk: Optional[str] = next(self.chunks, None)
+            if chunk is None:
+                break
+            self.buffer += chunk
+
+        size = len(self.buffer) if size < 0 else size
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+
+def staging_rows(rows: Iterator[StagingRow]) -> Iterator[str]:
+    # Staging rows as COPY csv input, each (line number, error, *IMPORT_COLUMNS).
+    buffer: io.StringIO = io.StringIO()
+    writer = csv.writer(buffer)
+    for number, error, values in rows:
+        writer.writerow([number, error, *values])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def read_ndjson(lines: IO[str]) -> Iterator[StagingRow]:
+    # Each NDJSON line becomes a staging row carrying its line number, lines that
+    # are not a JSON object are staged already rejected.
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            document: object = json.loads(line)
+        except ValueError:
+            document = None
+
+        if isinstance(document, dict):
+            values: List[Optional[str]] = [
+                stringify(document.get(name)) for name in IMPORT_COLUMNS
+            ]
+            yield number, None, values
+        else:
+            yield number, "Invalid JSON object.", [None] * len(IMPORT_COLUMNS)
+
+
+def read_csv(source: IO[str]) -> Iterator[StagingRow]:
+    # The header is checked before COPY starts, errors raised while COPY reads the
+    # rows come back wrapped in a database error.
+    reader = csv.reader(source)
+    header: List[str] = [name.strip() for name in next(reader, [])]
+    unknown: List[str] = sorted(set(header) - set(IMPORT_COLUMNS))
+    missing: List[str] = sorted(set(IMPORT_COLUMNS) - set(header))
+    if unknown or missing:
+        raise ValueError(
+            f"Expected the CSV columns {', '.join(IMPORT_COLUMNS)}; "
+            f"unknown: {', '.join(unknown) or '-'}, "
+            f"missing: {', '.join(missing) or '-'}."
+        )
+
+    def records() -> Iterator[StagingRow]:
+        # Each record becomes a staging row carrying the file line it starts on,
+        # which counts the header and the lines of quoted line breaks.
+        positions: List[int] = [header.index(name) for name in IMPORT_COLUMNS]
+        number: int = reader.line_num + 1
+        for record in reader:
+            if record:
+                if len(record) != len(header):
+                    raise ValueError(
+                        f"Line {number} has {len(record)} columns, "
+                        f"expected {len(header)}."
+                    )
+                # Empty cells are staged as NULL, the way COPY reads them.
+                yield number, None, [record[index] or None for index in positions]
+            number = reader.line_num + 1
+
+    return records()
+
+
+def stringify(value: object) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def copy_rows(cursor: CursorWrapper, rows: Iterator[StagingRow]) -> None:
+    cursor.copy_expert(
+        f"COPY {STAGING_TABLE} (line, error, {', '.join(IMPORT_COLUMNS)}) "
+        "FROM STDIN WITH (FORMAT csv)",
+        IteratorReader(staging_rows(rows)),
+    )
+
+
+def reject(cursor: CursorWrapper, message: str, condition: str, params: List) -> None:
+    # Rows keep the first error found, later checks only look at clean rows.
+    cursor.execute(
+        f"UPDATE {STAGING_TABLE} SET error = %s WHERE error IS NULL AND ({condition})",
+        [message, *params],
+    )
+
+
+def import_students(
+    source: IO[str], file_format: str, rejects: Optional[IO[str]] = None
+) -> Dict[str, int]:
+    # Stages the file with COPY, validates it set-wise with a few statements and
+    # merges the clean rows into the student table, whatever the row count. Rejected
+    # rows are written to rejects as CSV with their line number and error.
+    school_table: str = School._meta.db_table
+    student_table: str = Student._meta.db_table
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {STAGING_TABLE} ("
+            "line bigint, error text, school text, title text, "
+            "first_name text, last_name text, age text, gender text, "
+            "school_id bigint, age_years integer"
+            ") ON COMMIT DROP"
+        )
+        # copy_expert is not wrapped like execute, e.g. a short CSV line would raise
+        # a psycopg2 error instead of an OperationalError.
+        with connection.wrap_database_errors:
+            copy_rows(
+                cursor,
+                read_csv(source) if file_format == "csv" else read_ndjson(source),
+            )
+
+        # Casts are guarded, SQL doesn't promise to check error IS NULL first.
+        cursor.execute(
+            f"UPDATE {STAGING_TABLE} SET "
+            "school_id = CASE WHEN school ~ '^[0-9]{1,18}$' THEN school::bigint END, "
+            "age_years = CASE WHEN age ~ '^[0-9]{1,9}$' THEN age::integer END"
+        )
+        # Empty CSV cells are NULL, hence the NULL handling in every check.
+        reject(cursor, "School must be an id.", "school_id IS NULL", [])
+        reject(
+            cursor,
+            "Title is not a valid choice.",
+            "NOT coalesce(title = ANY(%s), false)",
+            [TitleChoice.values],
+        )
+        reject(
+            cursor,
+            "Gender is not a valid choice.",
+            "NOT coalesce(gender = ANY(%s), false)",
+            [GendorChoice.values],
+        )
+        for name in ("first_name", "last_name"):
+            reject(
+                cursor,
+                f"{name} must have 1 to 20 characters.",
+                f"coalesce(length(trim({name})), 0) NOT BETWEEN 1 AND 20",
+                [],
+            )
+        reject(cursor, "Age must be a number.", "age_years IS NULL", [])
+        reject(
+            cursor,
+            AGE_ERROR_MESSAGE,
+            "age_years NOT BETWEEN %s AND %s",
+            [MINIMUM_AGE, MAXIMUM_AGE],
+        )
+
+        # Lock the schools being filled so concurrent enrolments wait for the merge.
+        cursor.execute(
+            f"SELECT id FROM {school_table} WHERE is_active AND id IN ("
+            f"SELECT school_id FROM {STAGING_TABLE} WHERE error IS NULL"
+            ") ORDER BY id FOR UPDATE"
+        )
+        reject(
+            cursor,
+            "School does not exist.",
+            f"NOT EXISTS (SELECT 1 FROM {school_table} s "
+            f"WHERE s.id = {STAGING_TABLE}.school_id AND s.is_active)",
+            [],
+        )
+        # Rows fill each school's free seats in file order, the rest are turned away.
+        cursor.execute(
+            f"UPDATE {STAGING_TABLE} i SET error = %s FROM ("
+            "SELECT i.line, s.student_max_number - s.enrolled_count AS free, "
+            "row_number() OVER (PARTITION BY i.school_id ORDER BY i.line) AS seat "
+            f"FROM {STAGING_TABLE} i JOIN {school_table} s ON s.id = i.school_id "
+            "WHERE i.error IS NULL"
+            ") ranked WHERE ranked.line = i.line AND ranked.seat > ranked.free",
+            [SCHOOL_FULL_ERROR_MESSAGE],
+        )
+
+        now: datetime = timezone.now()
+        # Logged by the same statement, one change per imported student.
+        imported: int = ChangeLog.objects.record_sql(
+            Student,
+            ChangeAction.CREATED,
+            f"INSERT INTO {student_table} (is_active, created_at, updated_at, title, "
+            "first_name, last_name, age, gender, identification, school_id) "
+            "SELECT true, %s, %s, title, trim(first_name), trim(last_name), "
+            "age_years, gender, gen_random_uuid(), school_id "
+            f"FROM {STAGING_TABLE} WHERE error IS NULL ORDER BY line RETURNING id",
+            [now, now],
+        )
+        ChangeLog.objects.record_sql(
+            School,
+            ChangeAction.UPDATED,
+            f"UPDATE {school_table} s SET enrolled_count = s.enrolled_count + a.total, "
+            "updated_at = %s FROM ("
+            f"SELECT school_id AS id, count(*) AS total FROM {STAGING_TABLE} "
+            "WHERE error IS NULL GROUP BY 1"
+            ") a WHERE s.id = a.id RETURNING s.id",
+            [now],
+        )
+        expressions, params = SchoolStatistics.objects.get_aggregates("age_years")
+        SchoolStatistics.objects.upsert(
+            f"SELECT school_id, {', '.join(expressions)} FROM {STAGING_TABLE} "
+            "WHERE error IS NULL GROUP BY school_id",
+            params,
+        )
+
+        cursor.execute(f"SELECT count(*) FROM {STAGING_TABLE} WHERE error IS NOT NULL")
+        rejected: int = cursor.fetchone()[0]
+        if rejected and rejects is not None:
+            cursor.copy_expert(
+                f"COPY (SELECT line, error, {', '.join(IMPORT_COLUMNS)} "
+                f"FROM {STAGING_TABLE} WHERE error IS NOT NULL ORDER BY line) "
+                "TO STDOUT WITH (FORMAT csv, HEADER)",
+                rejects,
+            )
+        # Schools were updated without post_save, every process reloads the index.
+        invalidate_response_cache()
+        transaction.on_commit(school_autocomplete.invalidate)
+
+    return {"imported": imported, "rejected": rejected}
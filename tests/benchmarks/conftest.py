@@ -0,0 +1,159 @@
+import json
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from _pytest.config import Config
+from _pytest.fixtures import FixtureRequest
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from pytest import fixture
+from pytest_django.plugin import _DatabaseBlocker
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from core.models import School, Student
+from tests.conftest import seeded_dataset
+from utils.cache import get_response_cache
+
+WARMUP_REQUESTS: int = 3
+
+
+class BenchmarkReport:
+    """
+    Endpoint results of a run, written as JSON and checked against a baseline run
+    """
+
+    def __init__(self, config: Config) -> None:
+        self.config: Config = config
+        self.results: Dict[str, Dict] = {}
+        self.baseline: Dict[str, Dict] = {}
+        self.tolerance: float = config.getoption("--benchmark-tolerance")
+        baseline_path: Optional[str] = config.getoption("--benchmark-baseline")
+        if baseline_path:
+            with open(baseline_path) as baseline_file:
+                self.baseline = json.load(baseline_file)["results"]
+
+    def record(self, name: str, result: Dict) -> List[str]:
+        # Returns the regressions against the baseline, queries must not grow at all.
+        self.results[name] = result
+        baseline: Optional[Dict] = self.baseline.get(name)
+        if baseline is None:
+            return []
+
+        regressions: List[str] = []
+        if result["queries"] > baseline["queries"]:
+            regressions.append(f"queries {baseline['queries']} -> {result['queries']}")
+        for key in ("p50_ms", "p95_ms"):
+            if result[key] > baseline[key] * (1 + self.tolerance):
+                regressions.append(f"{key} {baseline[key]} -> {result[key]}")
+        return regressions
+
+    def write(self) -> None:
+        path: Optional[str] = self.config.getoption("--benchmark-json")
+        if not path or not self.results:
+            return
+        with open(path, "w") as results_file:
+            json.dump(
+                {
+                    "students": self.config.getoption("--benchmark-students"),
+                    "requests": self.config.getoption("--benchmark-requests"),
+                    "results": self.results,
+                },
+                results_file,
+                indent=2,
+                sort_keys=True,
+            )
+
+
+def measure_endpoint(
+    api_client: APIClient,
+    method: str,
+    get_request: Callable[[], Tuple[str, Optional[Dict]]],
+    requests: int,
+) -> Dict:
+    # Every request is timed on its own with an empty response cache, the queries
+    # and peak memory come from one extra request so they don't skew the timings.
+    def send(url: str, payload: Optional[Dict]) -> Response:
+        get_response_cache().clear()
+        started: float = time.perf_counter()
+        resp: Response = getattr(api_client, method)(url, payload, format="json")
+        timings.append((time.perf_counter() - started) * 1000)
+        assert resp.status_code < 400, resp.content
+        return resp
+
+    timings: List[float] = []
+    for _ in range(WARMUP_REQUESTS):
+        send(*get_request())
+    timings.clear()
+    for _ in range(max(requests, 2)):
+        send(*get_request())
+    cut_points: List[float] = statistics.quantiles(timings, n=100, method="inclusive")
+    mean: float = statistics.mean(timings)
+
+    url, payload = get_request()
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            resp: Response = send(url, payload)
+        peak_memory: int = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "status": resp.status_code,
+        "p50_ms": round(cut_points[49], 3),
+        "p95_ms": round(cut_points[94], 3),
+        "p99_ms": round(cut_points[98], 3),
+        "mean_ms": round(mean, 3),
+        "queries": len(queries),
+        "peak_memory_kb": round(peak_memory / 1024, 1),
+    }
+
+
+def create_student(school_id: int) -> Student:
+    student: Student = Student.objects.create(
+        school_id=school_id,
+        title="MR",
+        first_name="John",
+        last_name="Smith",
+        age=12,
+        gender="MALE",
+    )
+    School.objects.filter(pk=school_id).update(enrolled_count=F("enrolled_count") + 1)
+    return student
+
+
+@fixture(scope="session")
+def benchmark_report(request: FixtureRequest) -> Iterator[BenchmarkReport]:
+    report: BenchmarkReport = BenchmarkReport(request.config)
+    yield report
+    report.write()
+
+
+@fixture(scope="module")
+def benchmark_dataset(
+    request: FixtureRequest, django_db_setup: None, django_db_blocker: _DatabaseBlocker
+) -> Iterator[Dict]:
+    with seeded_dataset(
+        django_db_blocker, request.config.getoption("--benchmark-students")
+    ):
+        school: School = School.objects.filter(is_active=True).latest("id")
+        student: Student = Student.objects.filter(school=school).latest("id")
+        # Creates go to a school that never fills up.
+        open_school: School = School.objects.create(
+            name="Benchmark School",
+            code="B0001",
+            location="Bangkok",
+            student_max_number=10 ** 9,
+        )
+        yield {
+            "school_id": school.id,
+            "school_name": school.name,
+            "student_id": student.id,
+            "first_name": student.first_name,
+            "last_name": student.last_name,
+            "open_school_id": open_school.id,
+        }
@@ -0,0 +1,212 @@
+import itertools
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import pytest
+from _pytest.fixtures import FixtureRequest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.models import School
+from tests.benchmarks.conftest import BenchmarkReport, create_student, measure_endpoint
+from tests.conftest import (
+    CHANGES_URL,
+    SCHOOL_AUTOCOMPLETE_URL,
+    SCHOOL_DETAIL_STATS_URL,
+    SCHOOL_DETAIL_URL,
+    SCHOOL_LIST_URL,
+    SCHOOL_STATS_URL,
+    SCHOOL_STUDENT_DETAIL_URL,
+    SCHOOL_STUDENT_LIST_URL,
+    STUDENT_DETAIL_URL,
+    STUDENT_LIST_URL,
+)
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+STUDENT: Dict = {
+    "title": "MR",
+    "first_name": "John",
+    "last_name": "Smith",
+    "age": 12,
+    "gender": "MALE",
+}
+counter: Iterator[int] = itertools.count()
+
+
+def new_school(data: Dict) -> School:
+    school: School = School.objects.create(
+        name=f"Closing {next(counter)}", code="C0001", location="Bangkok"
+    )
+    return school
+
+
+@pytest.mark.parametrize(
+    "method,get_request",
+    [
+        ("get", lambda data: (SCHOOL_LIST_URL, None)),
+        ("get", lambda data: (f"{SCHOOL_LIST_URL}?name={data['school_name']}", None)),
+        (
+            "get",
+            lambda data: (reverse(SCHOOL_DETAIL_URL, args=[data["school_id"]]), None),
+        ),
+        (
+            "post",
+            lambda data: (
+                SCHOOL_LIST_URL,
+                {
+                    "name": f"New School {next(counter)}",
+                    "code": "N0001",
+                    "location": "Bangkok",
+                    "student_max_number": 20,
+                },
+            ),
+        ),
+        (
+            "patch",
+            lambda data: (
+                reverse(SCHOOL_DETAIL_URL, args=[data["school_id"]]),
+                {"location": f"Bangkok {next(counter)}"},
+            ),
+        ),
+        (
+            "delete",
+            lambda data: (reverse(SCHOOL_DETAIL_URL, args=[new_school(data).id]), None),
+        ),
+        (
+            "get",
+            lambda data: (
+                f"{SCHOOL_AUTOCOMPLETE_URL}?q={data['school_name'][:3]}",
+                None,
+            ),
+        ),
+        ("get", lambda data: (f"{SCHOOL_LIST_URL}?min_seats=5", None)),
+        ("get", lambda data: (SCHOOL_STATS_URL, None)),
+        (
+            "get",
+            lambda data: (
+                reverse(SCHOOL_DETAIL_STATS_URL, args=[data["school_id"]]),
+                None,
+            ),
+        ),
+        ("get", lambda data: (CHANGES_URL, None)),
+        ("get", lambda data: (STUDENT_LIST_URL, None)),
+        ("get", lambda data: (f"{STUDENT_LIST_URL}?count=estimate", None)),
+        ("get", lambda data: (f"{STUDENT_LIST_URL}?count=none", None)),
+        (
+            "get",
+            lambda data: (f"{STUDENT_LIST_URL}?first_name={data['first_name']}", None),
+        ),
+        (
+            "get",
+            lambda data: (reverse(STUDENT_DETAIL_URL, args=[data["student_id"]]), None),
+        ),
+        (
+            "post",
+            lambda data: (
+                STUDENT_LIST_URL,
+                {**STUDENT, "school": data["open_school_id"]},
+            ),
+        ),
+        (
+            "patch",
+            lambda data: (
+                reverse(STUDENT_DETAIL_URL, args=[data["student_id"]]),
+                {"age": 10 + next(counter) % 10},
+            ),
+        ),
+        (
+            "delete",
+            lambda data: (
+                reverse(
+                    STUDENT_DETAIL_URL, args=[create_student(data["open_school_id"]).id]
+                ),
+                None,
+            ),
+        ),
+        (
+            "get",
+            lambda data: (
+                reverse(SCHOOL_STUDENT_LIST_URL, args=[data["school_id"]]),
+                None,
+            ),
+        ),
+        (
+            "get",
+            lambda data: (
+                reverse(
+                    SCHOOL_STUDENT_DETAIL_URL,
+                    args=[data["school_id"], data["student_id"]],
+                ),
+                None,
+            ),
+        ),
+        (
+            "post",
+            lambda data: (
+                reverse(SCHOOL_STUDENT_LIST_URL, args=[data["open_school_id"]]),
+                STUDENT,
+            ),
+        ),
+        (
+            "delete",
+            lambda data: (
+                reverse(
+                    SCHOOL_STUDENT_DETAIL_URL,
+                    args=[
+                        data["open_school_id"],
+                        create_student(data["open_school_id"]).id,
+                    ],
+                ),
+                None,
+            ),
+        ),
+    ],
+    ids=[
+        "school-list",
+        "school-list-filtered",
+        "school-retrieve",
+        "school-create",
+        "school-update",
+        "school-destroy",
+        "school-autocomplete",
+        "school-list-min-seats",
+        "school-stats",
+        "school-detail-stats",
+        "changes",
+        "student-list",
+        "student-list-count-estimate",
+        "student-list-count-none",
+        "student-list-filtered",
+        "student-retrieve",
+        "student-create",
+        "student-update",
+        "student-destroy",
+        "school-students-list",
+        "school-students-retrieve",
+        "school-students-create",
+        "school-students-destroy",
+    ],
+)
+def test_endpoint_latency(
+    method: str,
+    get_request: Callable[[Dict], Tuple[str, Optional[Dict]]],
+    api_client: APIClient,
+    benchmark_dataset: Dict,
+    benchmark_report: BenchmarkReport,
+    request: FixtureRequest,
+    record_property: Callable,
+) -> None:
+
+    result: Dict = measure_endpoint(
+        api_client,
+        method,
+        lambda: get_request(benchmark_dataset),
+        request.config.getoption("--benchmark-requests"),
+    )
+    name: str = request.node.callspec.id
+    regressions: List[str] = benchmark_report.record(name, result)
+    for key, value in result.items():
+        record_property(key, value)
+    print(name, result)
+
+    assert not regressions, f"{name} regressed: {', '.join(regressions)}"
@@ -0,0 +1,35 @@
+import io
+import time
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+from django.core.management import call_command
+
+from core.models import School
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+ROWS: int = 200_000
+
+
+def test_import_rows_per_minute(tmp_path: Path, record_property: Callable) -> None:
+
+    school_ids: List[int] = list(School.objects.values_list("pk", flat=True))
+    School.objects.update(student_max_number=ROWS)
+    path: Path = tmp_path / "students.csv"
+    with path.open("w") as csv_file:
+        csv_file.write("school,title,first_name,last_name,age,gender\n")
+        for index in range(ROWS):
+            school_id: int = school_ids[index % len(school_ids)]
+            csv_file.write(f"{school_id},MR,John{index % 1000},Smith,12,MALE\n")
+
+    started: float = time.perf_counter()
+    call_command("importstudents", str(path), stdout=io.StringIO())
+    elapsed: float = time.perf_counter() - started
+
+    rows_per_minute: int = int(ROWS / elapsed * 60)
+    record_property("import_rows_per_minute", rows_per_minute)
+    print(
+        {"rows": ROWS, "seconds": round(elapsed, 2), "rows_per_minute": rows_per_minute}
+    )
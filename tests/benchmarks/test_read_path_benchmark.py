@@ -0,0 +1,71 @@
+import time
+from typing import Callable, Dict, List, Optional
+
+import pytest
+from django.db.models import QuerySet
+
+from core.models import School, Student
+from core.serializers import StudentSerializer
+from utils.querysets import plan_related_loading
+from utils.serializers import RowRepresentation
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+ROWS: int = 5000
+ROUNDS: int = 5
+
+
+def best_per_row(render: Callable[[], List]) -> float:
+    # Best of a few rounds in microseconds per row, fetching included.
+    timings: List[float] = []
+    for _ in range(ROUNDS):
+        start: float = time.perf_counter()
+        rendered: List = render()
+        timings.append(time.perf_counter() - start)
+        assert len(rendered) >= ROWS
+    return min(timings) / len(rendered) * 1_000_000
+
+
+def test_student_read_path_per_row_cost(record_property: Callable) -> None:
+
+    school: School = School.objects.get(pk=1)
+    Student.objects.bulk_create(
+        Student(
+            school=school,
+            title="MR",
+            first_name=f"John{index}",
+            last_name="Smith",
+            age=12,
+            gender="MALE",
+        )
+        for index in range(ROWS)
+    )
+    queryset: QuerySet = plan_related_loading(
+        Student.objects.all(), StudentSerializer()
+    )
+
+    def render_rows() -> List[Optional[Dict]]:
+        # Compiled per round like per request, so no rendered school is reused.
+        representation: Optional[RowRepresentation] = RowRepresentation.compile(
+            StudentSerializer()
+        )
+        assert representation is not None
+        return [
+            representation.render(row)
+            for row in queryset.values(*representation.columns)
+        ]
+
+    serializer_cost: float = best_per_row(
+        lambda: list(StudentSerializer(list(queryset), many=True).data)
+    )
+    fast_cost: float = best_per_row(render_rows)
+    results: Dict[str, float] = {
+        "serializer_us_per_row": round(serializer_cost, 2),
+        "fast_read_us_per_row": round(fast_cost, 2),
+        "speedup": round(serializer_cost / fast_cost, 2),
+    }
+    for name, value in results.items():
+        record_property(name, value)
+    print(results)
+
+    assert fast_cost < serializer_cost
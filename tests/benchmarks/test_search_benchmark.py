@@ -0,0 +1,68 @@
+import statistics
+import time
+from typing import Callable, Dict, List
+
+import pytest
+from _pytest.fixtures import FixtureRequest
+from django.db.models import QuerySet
+from rest_framework.test import APIClient
+
+from core.filters import StudentFilter
+from core.views import StudentViewSet
+from tests.benchmarks.conftest import BenchmarkReport, measure_endpoint
+from tests.conftest import STUDENT_LIST_URL
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+LOOKUP_MS: float = 10.0
+PAGE_SIZE: int = 20
+
+
+def time_lookup(term: str, rounds: int) -> List[float]:
+    # The search itself, the first ranked page. The count is in the endpoint timings.
+    timings: List[float] = []
+    for _ in range(rounds):
+        started: float = time.perf_counter()
+        queryset: QuerySet = StudentFilter(
+            {"search": term}, queryset=StudentViewSet.queryset.all()
+        ).qs
+        list(queryset.values("id", "first_name", "last_name")[:PAGE_SIZE])
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+@pytest.mark.parametrize(
+    "get_term",
+    [
+        lambda data: data["first_name"][:3],
+        lambda data: data["first_name"],
+        lambda data: f"{data['first_name']} {data['last_name'][:2]}",
+    ],
+    ids=["student-search-prefix", "student-search-name", "student-search-words"],
+)
+def test_student_search_latency(
+    get_term: Callable[[Dict], str],
+    api_client: APIClient,
+    benchmark_dataset: Dict,
+    benchmark_report: BenchmarkReport,
+    request: FixtureRequest,
+    record_property: Callable,
+) -> None:
+
+    term: str = get_term(benchmark_dataset)
+    requests: int = request.config.getoption("--benchmark-requests")
+    result: Dict = measure_endpoint(
+        api_client, "get", lambda: (f"{STUDENT_LIST_URL}?search={term}", None), requests
+    )
+    lookups: List[float] = time_lookup(term, max(requests, 2))
+    cut_points: List[float] = statistics.quantiles(lookups, n=100, method="inclusive")
+    result["lookup_p50_ms"] = round(cut_points[49], 3)
+    result["lookup_p95_ms"] = round(cut_points[94], 3)
+    name: str = request.node.callspec.id
+    regressions: List[str] = benchmark_report.record(name, result)
+    for key, value in result.items():
+        record_property(key, value)
+    print(name, term, result)
+
+    assert not regressions, f"{name} regressed: {', '.join(regressions)}"
+    assert result["lookup_p50_ms"] < LOOKUP_MS
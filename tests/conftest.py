@@ -1,11 +1,24 @@
+import traceback
+from contextlib import contextmanager
+from io import StringIO
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
 import pytest
+from _pytest.config import Config
+from _pytest.config.argparsing import Parser
+from _pytest.mark import MarkDecorator
+from _pytest.nodes import Item
+from django.conf import settings
 from django.core.management import call_command
-from django.urls import reverse
+from django.db import connection, transaction
+from django.http.response import HttpResponseBase
+from django.urls import Resolver404, ResolverMatch, resolve, reverse
 from pytest import fixture
 from pytest_django.plugin import _DatabaseBlocker
 from rest_framework.test import APIClient
 
 from core.models import School, Student
+from utils.cache import get_response_cache
 
 SCHOOL_LIST_URL: str = reverse("api:schools-list")
 SCHOOL_DETAIL_URL: str = "api:schools-detail"
@@ -13,18 +26,171 @@ SCHOOL_STUDENT_LIST_URL: str = "api:school-students-list"
 SCHOOL_STUDENT_DETAIL_URL: str = "api:school-students-detail"
 STUDENT_LIST_URL: str = reverse("api:students-list")
 STUDENT_DETAIL_URL: str = "api:students-detail"
+STUDENT_BULK_URL: str = reverse("api:students-bulk")
+SCHOOL_STUDENT_BULK_URL: str = "api:school-students-bulk"
+SCHOOL_DEACTIVATE_URL: str = reverse("api:schools-deactivate")
+STUDENT_DEACTIVATE_URL: str = reverse("api:students-deactivate")
+SCHOOL_EXPORT_URL: str = reverse("api:schools-export")
+STUDENT_EXPORT_URL: str = reverse("api:students-export")
+SCHOOL_AUTOCOMPLETE_URL: str = reverse("api:schools-autocomplete")
+SCHOOL_STATS_URL: str = reverse("api:schools-stats")
+SCHOOL_DETAIL_STATS_URL: str = "api:schools-detail-stats"
+CHANGES_URL: str = reverse("api:changes-list")
 SCHOOL_FULL_ERROR_MESSAGE: str = "Unable to add student to school as it is full!"
+STUDENTS_PER_SCHOOL: int = 100
+# Issued by the test transaction wrapping each atomic block, not by the view.
+TEST_TRANSACTION_SQL: Tuple[str, ...] = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK")
+
+
+def pytest_addoption(parser: Parser) -> None:
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="Run the benchmarks in tests/benchmarks.",
+    )
+    parser.addoption(
+        "--benchmark-students",
+        type=int,
+        default=10_000,
+        help="Students seeded for the endpoint benchmarks.",
+    )
+    parser.addoption(
+        "--benchmark-requests",
+        type=int,
+        default=50,
+        help="Timed requests per endpoint benchmark.",
+    )
+    parser.addoption(
+        "--benchmark-json", help="Write the endpoint benchmark results to this file."
+    )
+    parser.addoption(
+        "--benchmark-baseline",
+        help="Fail endpoints slower or issuing more queries than in this results file.",
+    )
+    parser.addoption(
+        "--benchmark-tolerance",
+        type=float,
+        default=0.5,
+        help="Latency increase over the baseline allowed, 0.5 is 50%%.",
+    )
+
+
+def pytest_collection_modifyitems(config: Config, items: List[Item]) -> None:
+    # Benchmarks are slow and machine dependent, so they only run when asked for.
+    if config.getoption("--benchmark"):
+        return
+    skip_benchmark: MarkDecorator = pytest.mark.skip(reason="needs --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
+def get_call_sites() -> List[str]:
+    # Project frames of the current stack, innermost last.
+    root: str = f"{settings.BASE_DIR}/"
+    return [
+        f"{frame.filename[len(root):]}:{frame.lineno} in {frame.name}"
+        for frame in traceback.extract_stack()
+        if frame.filename.startswith(root)
+        and "site-packages" not in frame.filename
+        and not frame.filename.endswith("conftest.py")
+    ]
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper recording each statement with the code that issued it
+    """
+
+    def __init__(self) -> None:
+        self.queries: List[Tuple[str, List[str]]] = []
+
+    def __call__(
+        self, execute: Callable, sql: str, params: object, many: bool, context: Dict
+    ) -> object:
+        if not sql.startswith(TEST_TRANSACTION_SQL):
+            self.queries.append((sql, get_call_sites()))
+        return execute(sql, params, many, context)
+
+
+class BudgetedAPIClient(APIClient):
+    """
+    API client failing the test when a request runs more queries than the
+    query_budgets of the viewset action it was routed to
+    """
+
+    def request(self, **kwargs: Any) -> HttpResponseBase:
+        try:
+            match: ResolverMatch = resolve(kwargs["PATH_INFO"])
+        except Resolver404:
+            return super().request(**kwargs)
+        view: Any = match.func
+        action: Optional[str] = getattr(view, "actions", {}).get(
+            kwargs["REQUEST_METHOD"].lower()
+        )
+        budget: Optional[int] = getattr(view.cls, "query_budgets", {}).get(action)
+        if budget is None:
+            return super().request(**kwargs)
+
+        recorder: QueryRecorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response: HttpResponseBase = super().request(**kwargs)
+            # Streamed responses query while the body is read.
+            if response.streaming:
+                response.streaming_content = list(response.streaming_content)
+        if len(recorder.queries) > budget:
+            pytest.fail(
+                f"{view.cls.__name__}.{action} ran {len(recorder.queries)} queries, "
+                f"its budget is {budget}:\n"
+                + "\n".join(
+                    f"{number}. {sql}\n    " + "\n    ".join(call_sites)
+                    for number, (sql, call_sites) in enumerate(recorder.queries, 1)
+                ),
+                pytrace=False,
+            )
+        return response
 
 
 @fixture()
 def api_client() -> APIClient:
-    return APIClient()
+    # Every request is held to the query budget of the action it hits.
+    return BudgetedAPIClient()
+
+
+@fixture(autouse=True)
+def clear_response_cache() -> None:
+    # Cached responses outlive the rolled back test transactions.
+    get_response_cache().clear()
 
 
 @pytest.fixture(scope="session")
 def django_db_setup(django_db_setup: None, django_db_blocker: _DatabaseBlocker) -> None:
+    # Seeded so capacity-dependent tests are deterministic.
     with django_db_blocker.unblock():
-        call_command("createdata")
+        call_command("createdata", seed=0, stdout=StringIO())
+
+
+@contextmanager
+def seeded_dataset(
+    django_db_blocker: _DatabaseBlocker,
+    students: int,
+    students_per_school: int = STUDENTS_PER_SCHOOL,
+) -> Iterator[None]:
+    # A larger dataset for module-scoped fixtures, rolled back on exit. The tests'
+    # own transactions are savepoints inside this one.
+    with django_db_blocker.unblock(), transaction.atomic():
+        call_command(
+            "createdata",
+            schools=max(1, students // students_per_school),
+            students_per_school=min(students, students_per_school),
+            seed=0,
+            stdout=StringIO(),
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        yield
+        transaction.set_rollback(True)
 
 
 @pytest.mark.django_db
@@ -51,7 +217,11 @@ def get_student_last_name_data() -> str:
 @fixture()
 def get_id_for_full_school(api_client: APIClient) -> int:
     school: School = School.objects.create(
-        name="School America", student_max_number=1, location="Bangkok", code="A10322"
+        name="School America",
+        student_max_number=1,
+        enrolled_count=1,
+        location="Bangkok",
+        code="A10322",
     )
     Student.objects.create(
         title="MR",
@@ -62,3 +232,11 @@ def get_id_for_full_school(api_client: APIClient) -> int:
         school=school,
     )
     return int(school.id)
+
+
+@fixture()
+def get_id_for_empty_school() -> int:
+    school: School = School.objects.create(
+        name="School Britain", student_max_number=10, location="London", code="A10323"
+    )
+    return int(school.id)
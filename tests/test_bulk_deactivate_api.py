@@ -0,0 +1,163 @@
+from typing import Callable, Dict, List
+
+import pytest
+from django.db.models import F
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from core.models import School, Student
+from tests.conftest import SCHOOL_DEACTIVATE_URL, STUDENT_DEACTIVATE_URL
+
+
+@pytest.mark.django_db
+def test_deactivate_schools_by_ids(api_client: APIClient) -> None:
+
+    student_count: int = Student.objects.filter(school_id__in=[1, 2]).count()
+    resp: Response = api_client.post(
+        SCHOOL_DEACTIVATE_URL, data={"ids": [1, 2]}, format="json"
+    )
+
+    assert 200 == resp.status_code
+    assert {"deactivated": 2, "detached_students": student_count} == resp.json()
+    assert not School.objects.filter(pk__in=[1, 2], is_active=True).exists()
+    assert [0, 0] == list(
+        School.objects.filter(pk__in=[1, 2]).values_list("enrolled_count", flat=True)
+    )
+    assert not Student.objects.filter(school_id__in=[1, 2]).exists()
+
+
+@pytest.mark.django_db
+def test_deactivate_schools_by_filter(
+    api_client: APIClient, get_school_location_data: str
+) -> None:
+
+    url: str = f"{SCHOOL_DEACTIVATE_URL}?location={get_school_location_data}"
+    resp: Response = api_client.post(url, format="json")
+
+    assert 200 == resp.status_code
+    assert 1 == resp.json()["deactivated"]
+    assert not School.objects.filter(
+        location=get_school_location_data, is_active=True
+    ).exists()
+
+
+@pytest.mark.django_db
+def test_deactivate_students_by_ids(api_client: APIClient) -> None:
+
+    counts: Dict[int, int] = dict(
+        School.objects.filter(pk=1).values_list("pk", "enrolled_count")
+    )
+    resp: Response = api_client.post(
+        STUDENT_DEACTIVATE_URL, data={"ids": [1, 2, 100000]}, format="json"
+    )
+
+    assert 200 == resp.status_code
+    assert {"deactivated": 2} == resp.json()
+    assert counts[1] - 2 == School.objects.get(pk=1).enrolled_count
+    assert 2 == Student.objects.filter(pk__in=[1, 2], is_active=False).count()
+
+
+@pytest.mark.django_db
+def test_deactivate_students_twice_counts_once(api_client: APIClient) -> None:
+
+    enrolled_count: int = School.objects.get(pk=1).enrolled_count
+    for _ in range(2):
+        resp: Response = api_client.post(
+            STUDENT_DEACTIVATE_URL, data={"ids": [1]}, format="json"
+        )
+
+    assert {"deactivated": 0} == resp.json()
+    assert enrolled_count - 1 == School.objects.get(pk=1).enrolled_count
+
+
+@pytest.mark.django_db
+def test_deactivate_students_by_school_filter(
+    api_client: APIClient, get_school_name_data: str
+) -> None:
+
+    url: str = f"{STUDENT_DEACTIVATE_URL}?school={get_school_name_data}"
+    resp: Response = api_client.post(url, format="json")
+
+    assert 200 == resp.status_code
+    assert not Student.objects.filter(
+        school__name=get_school_name_data, is_active=True
+    ).exists()
+    assert 0 == School.objects.get(name=get_school_name_data).enrolled_count
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url,payload",
+    [
+        (SCHOOL_DEACTIVATE_URL, {}),
+        (SCHOOL_DEACTIVATE_URL, {"ids": []}),
+        (STUDENT_DEACTIVATE_URL, {"ids": "1,2"}),
+        (STUDENT_DEACTIVATE_URL, {"ids": ["a"]}),
+        (f"{SCHOOL_DEACTIVATE_URL}?location=", {}),
+        (f"{SCHOOL_DEACTIVATE_URL}?name=&has_capacity=", {}),
+        (f"{STUDENT_DEACTIVATE_URL}?first_name=", {}),
+        (f"{STUDENT_DEACTIVATE_URL}?search=&school=", {"ids": []}),
+        (f"{SCHOOL_DEACTIVATE_URL}?min_seats=-1", {}),
+    ],
+    ids=[
+        "deactivate-no-selection",
+        "deactivate-empty-ids",
+        "deactivate-ids-string",
+        "deactivate-ids-type",
+        "deactivate-empty-school-filter",
+        "deactivate-empty-school-filters",
+        "deactivate-empty-student-filter",
+        "deactivate-empty-student-filters-and-ids",
+        "deactivate-invalid-filter",
+    ],
+)
+def test_deactivate_unsuccessful(
+    api_client: APIClient, url: str, payload: Dict
+) -> None:
+
+    resp: Response = api_client.post(url, data=payload, format="json")
+
+    assert 400 == resp.status_code
+    assert 10 == School.objects.filter(is_active=True).count()
+    assert not Student.objects.filter(is_active=False).exists()
+
+
+@pytest.mark.django_db
+def test_deactivate_by_false_filter(api_client: APIClient) -> None:
+
+    # False is a value, only the full schools are deactivated.
+    School.objects.filter(pk=1).update(student_max_number=F("enrolled_count"))
+    full: int = School.objects.filter(
+        student_max_number__lte=F("enrolled_count")
+    ).count()
+    url: str = f"{SCHOOL_DEACTIVATE_URL}?has_capacity=false"
+    resp: Response = api_client.post(url, format="json")
+
+    assert 200 == resp.status_code
+    assert full == resp.json()["deactivated"]
+    assert 10 - full == School.objects.filter(is_active=True).count()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url,ids,queries",
+    [
+        (SCHOOL_DEACTIVATE_URL, [1], 8),
+        (SCHOOL_DEACTIVATE_URL, list(range(1, 11)), 8),
+        (STUDENT_DEACTIVATE_URL, [1], 7),
+        (STUDENT_DEACTIVATE_URL, list(range(1, 101)), 7),
+    ],
+    ids=["schools-1", "schools-10", "students-1", "students-100"],
+)
+def test_deactivate_query_count_is_constant(
+    api_client: APIClient,
+    django_assert_num_queries: Callable,
+    url: str,
+    ids: List[int],
+    queries: int,
+) -> None:
+
+    with django_assert_num_queries(queries):
+        resp: Response = api_client.post(url, data={"ids": ids}, format="json")
+
+    assert len(ids) == resp.json()["deactivated"]
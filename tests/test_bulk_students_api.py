@@ -0,0 +1,247 @@
+from typing import Callable, Dict, List
+
+import pytest
+from django.urls import reverse
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from core.models import School, Student
+from services.bulk_services import AGE_ERROR_MESSAGE
+from tests.conftest import (
+    SCHOOL_FULL_ERROR_MESSAGE,
+    SCHOOL_STUDENT_BULK_URL,
+    STUDENT_BULK_URL,
+)
+
+
+def student_rows(count: int, **fields: object) -> List[Dict]:
+    return [
+        {
+            "title": "MR",
+            "first_name": f"John{index}",
+            "last_name": "Smith",
+            "age": 12,
+            "gender": "MALE",
+            **fields,
+        }
+        for index in range(count)
+    ]
+
+
+@pytest.mark.django_db
+def test_bulk_create_students_successful(
+    api_client: APIClient, get_id_for_empty_school: int
+) -> None:
+
+    rows: List[Dict] = student_rows(5, school=get_id_for_empty_school)
+    resp: Response = api_client.post(STUDENT_BULK_URL, data=rows, format="json")
+
+    assert 201 == resp.status_code
+    assert 5 == len(resp.json()["results"])
+    assert [] == resp.json()["errors"]
+    assert get_id_for_empty_school == resp.json()["results"][0]["school_details"]["id"]
+    assert 5 == School.objects.get(pk=get_id_for_empty_school).enrolled_count
+    assert 5 == Student.objects.filter(school_id=get_id_for_empty_school).count()
+
+
+@pytest.mark.django_db
+def test_bulk_create_school_students_successful(
+    api_client: APIClient, get_id_for_empty_school: int
+) -> None:
+
+    url: str = reverse(SCHOOL_STUDENT_BULK_URL, args=[get_id_for_empty_school])
+    resp: Response = api_client.post(url, data=student_rows(3), format="json")
+
+    assert 201 == resp.status_code
+    assert 3 == Student.objects.filter(school_id=get_id_for_empty_school).count()
+
+
+@pytest.mark.django_db
+def test_bulk_create_reports_row_errors(
+    api_client: APIClient, get_id_for_empty_school: int, get_id_for_full_school: int
+) -> None:
+
+    rows: List[Dict] = [
+        *student_rows(1, school=get_id_for_empty_school),
+        *student_rows(1, school=get_id_for_empty_school, age=30),
+        *student_rows(1, school=get_id_for_full_school),
+        *student_rows(1, school=get_id_for_empty_school, title="DR"),
+        *student_rows(1, school=10000),
+    ]
+    resp: Response = api_client.post(STUDENT_BULK_URL, data=rows, format="json")
+    errors: List[Dict] = resp.json()["errors"]
+
+    assert 207 == resp.status_code
+    assert 1 == len(resp.json()["results"])
+    assert [1, 2, 3, 4] == [error["index"] for error in errors]
+    assert {"age": [AGE_ERROR_MESSAGE]} == errors[0]["errors"]
+    assert {"school": [SCHOOL_FULL_ERROR_MESSAGE]} == errors[1]["errors"]
+    assert "title" in errors[2]["errors"]
+    assert "school" in errors[3]["errors"]
+
+
+@pytest.mark.django_db
+def test_bulk_create_skips_inactive_school(
+    api_client: APIClient, get_id_for_empty_school: int
+) -> None:
+
+    School.objects.filter(pk=get_id_for_empty_school).update(is_active=False)
+    url: str = reverse(SCHOOL_STUDENT_BULK_URL, args=[get_id_for_empty_school])
+    resp: Response = api_client.post(url, data=student_rows(2), format="json")
+
+    assert 400 == resp.status_code
+    assert [0, 1] == [error["index"] for error in resp.json()["errors"]]
+    assert all("school" in error["errors"] for error in resp.json()["errors"])
+    assert 0 == School.objects.get(pk=get_id_for_empty_school).enrolled_count
+    assert not Student.objects.filter(school_id=get_id_for_empty_school).exists()
+
+
+@pytest.mark.django_db
+def test_bulk_create_admits_up_to_capacity(
+    api_client: APIClient, get_id_for_empty_school: int
+) -> None:
+
+    School.objects.filter(pk=get_id_for_empty_school).update(student_max_number=3)
+    rows: List[Dict] = student_rows(5, school=get_id_for_empty_school)
+    resp: Response = api_client.post(STUDENT_BULK_URL, data=rows, format="json")
+
+    assert 207 == resp.status_code
+    assert ["John0", "John1", "John2"] == [
+        row["first_name"] for row in resp.json()["results"]
+    ]
+    assert [3, 4] == [error["index"] for error in resp.json()["errors"]]
+    assert 3 == School.objects.get(pk=get_id_for_empty_school).enrolled_count
+
+
+@pytest.mark.django_db
+def test_bulk_create_all_rows_rejected(api_client: APIClient) -> None:
+
+    resp: Response = api_client.post(
+        STUDENT_BULK_URL, data=student_rows(2, school=1, age=5), format="json"
+    )
+
+    assert 400 == resp.status_code
+    assert [] == resp.json()["results"]
+
+
+@pytest.mark.django_db
+def test_bulk_create_requires_list(api_client: APIClient) -> None:
+
+    resp: Response = api_client.post(
+        STUDENT_BULK_URL, data=student_rows(1, school=1)[0], format="json"
+    )
+
+    assert 400 == resp.status_code
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("size", [10, 200], ids=["bulk-10", "bulk-200"])
+def test_bulk_create_query_count_is_constant(
+    api_client: APIClient,
+    django_assert_max_num_queries: Callable,
+    get_id_for_empty_school: int,
+    size: int,
+) -> None:
+
+    School.objects.filter(pk=get_id_for_empty_school).update(student_max_number=size)
+    rows: List[Dict] = student_rows(size, school=get_id_for_empty_school)
+
+    with django_assert_max_num_queries(7):
+        resp: Response = api_client.post(STUDENT_BULK_URL, data=rows, format="json")
+
+    assert 201 == resp.status_code
+
+
+@pytest.mark.django_db
+def test_bulk_update_students_successful(api_client: APIClient) -> None:
+
+    rows: List[Dict] = [
+        {"id": 1, "last_name": "Williams"},
+        {"id": 2, "first_name": "Emma", "age": 13},
+    ]
+    resp: Response = api_client.patch(STUDENT_BULK_URL, data=rows, format="json")
+
+    assert 200 == resp.status_code
+    assert [] == resp.json()["errors"]
+    assert "Williams" == Student.objects.get(pk=1).last_name
+    assert ("Emma", 13) == Student.objects.values_list("first_name", "age").get(pk=2)
+
+
+@pytest.mark.django_db
+def test_bulk_update_moves_students_between_schools(
+    api_client: APIClient, get_id_for_empty_school: int
+) -> None:
+
+    School.objects.filter(pk=get_id_for_empty_school).update(student_max_number=2)
+    source_count: int = School.objects.get(pk=1).enrolled_count
+    rows: List[Dict] = [
+        {"id": student_id, "school": get_id_for_empty_school}
+        for student_id in (1, 2, 3)
+    ]
+    resp: Response = api_client.patch(STUDENT_BULK_URL, data=rows, format="json")
+
+    assert 207 == resp.status_code
+    assert [2] == [error["index"] for error in resp.json()["errors"]]
+    assert {"school": [SCHOOL_FULL_ERROR_MESSAGE]} == resp.json()["errors"][0]["errors"]
+    assert 2 == School.objects.get(pk=get_id_for_empty_school).enrolled_count
+    assert source_count - 2 == School.objects.get(pk=1).enrolled_count
+    assert [1, 2] == sorted(
+        Student.objects.filter(school_id=get_id_for_empty_school).values_list(
+            "id", flat=True
+        )
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_update_reports_row_errors(api_client: APIClient) -> None:
+
+    rows: List[Dict] = [
+        {"id": 1, "first_name": "Sara"},
+        {"id": 100000, "first_name": "Sara"},
+        {"id": 1, "first_name": "Anna"},
+        {"id": 2, "age": 40},
+        {"id": 3, "gender": "OTHER"},
+        {"first_name": "Sara"},
+        {"id": 4, "school": 100000},
+    ]
+    resp: Response = api_client.patch(STUDENT_BULK_URL, data=rows, format="json")
+    errors: List[Dict] = resp.json()["errors"]
+
+    assert 207 == resp.status_code
+    assert [1, 2, 3, 4, 5, 6] == [error["index"] for error in errors]
+    assert "Sara" == Student.objects.get(pk=1).first_name
+    assert "school" in errors[5]["errors"]
+
+
+@pytest.mark.django_db
+def test_bulk_update_school_students_cannot_change_school(
+    api_client: APIClient, get_id_for_empty_school: int
+) -> None:
+
+    url: str = reverse(SCHOOL_STUDENT_BULK_URL, args=[1])
+    rows: List[Dict] = [{"id": 1, "school": get_id_for_empty_school, "age": 14}]
+    resp: Response = api_client.patch(url, data=rows, format="json")
+
+    assert 200 == resp.status_code
+    assert (1, 14) == Student.objects.values_list("school_id", "age").get(pk=1)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("size", [5, 50], ids=["bulk-update-5", "bulk-update-50"])
+def test_bulk_update_query_count_is_constant(
+    api_client: APIClient,
+    django_assert_max_num_queries: Callable,
+    get_id_for_empty_school: int,
+    size: int,
+) -> None:
+
+    School.objects.filter(pk=get_id_for_empty_school).update(student_max_number=size)
+    rows: List[Dict] = [
+        {"id": student_id, "school": get_id_for_empty_school, "last_name": "Moved"}
+        for student_id in range(1, size + 1)
+    ]
+
+    with django_assert_max_num_queries(8):
+        resp: Response = api_client.patch(STUDENT_BULK_URL, data=rows, format="json")
+
+    assert 200 == resp.status_code
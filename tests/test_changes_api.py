@@ -0,0 +1,321 @@
+import io
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.urls import reverse
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from core.models import ChangeAction, ChangeLog, School, Student
+from tests.conftest import (
+    CHANGES_URL,
+    SCHOOL_DEACTIVATE_URL,
+    SCHOOL_DETAIL_URL,
+    SCHOOL_LIST_URL,
+    SCHOOL_STUDENT_LIST_URL,
+    STUDENT_BULK_URL,
+    STUDENT_DEACTIVATE_URL,
+    STUDENT_DETAIL_URL,
+    STUDENT_LIST_URL,
+)
+
+SCHOOL_PAYLOAD: Dict = {"name": "Feed School", "code": "A3000", "location": "Porto"}
+STUDENT_PAYLOAD: Dict = {
+    "title": "MR",
+    "first_name": "John",
+    "last_name": "Smith",
+    "age": 12,
+    "gender": "MALE",
+}
+
+
+def logged_changes() -> Set[Tuple[str, int, str]]:
+    return set(ChangeLog.objects.values_list("model", "object_id", "action"))
+
+
+def student_schools(*pks: int) -> Set[Tuple[str, int, str]]:
+    # The enrolled counters of the students' schools moved along with them.
+    return {
+        ("school", school_id, "updated")
+        for school_id in Student.objects.filter(pk__in=pks).values_list(
+            "school_id", flat=True
+        )
+    }
+
+
+def school_students(school_id: Optional[int]) -> List[int]:
+    return list(
+        Student.objects.filter(school_id=school_id).values_list("pk", flat=True)
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "write,get_expected",
+    [
+        (
+            lambda client, school: client.post(SCHOOL_LIST_URL, data=SCHOOL_PAYLOAD),
+            lambda resp: {("school", resp.json()["id"], "created")},
+        ),
+        (
+            lambda client, school: client.patch(
+                reverse(SCHOOL_DETAIL_URL, args=[1]), data={"location": "Faro"}
+            ),
+            lambda resp: {("school", 1, "updated")},
+        ),
+        (
+            lambda client, school: client.delete(reverse(SCHOOL_DETAIL_URL, args=[1])),
+            lambda resp: {("school", 1, "deactivated")}
+            | {("student", pk, "updated") for pk in school_students(None)},
+        ),
+        (
+            lambda client, school: client.post(
+                STUDENT_LIST_URL, data={**STUDENT_PAYLOAD, "school": school}
+            ),
+            lambda resp: {("student", resp.json()["id"], "created")}
+            | student_schools(resp.json()["id"]),
+        ),
+        (
+            lambda client, school: client.post(
+                reverse(SCHOOL_STUDENT_LIST_URL, args=[school]), data=STUDENT_PAYLOAD
+            ),
+            lambda resp: {("student", resp.json()["id"], "created")}
+            | student_schools(resp.json()["id"]),
+        ),
+        (
+            lambda client, school: client.patch(
+                reverse(STUDENT_DETAIL_URL, args=[1]), data={"age": 13}
+            ),
+            lambda resp: {("student", 1, "updated")},
+        ),
+        (
+            lambda client, school: client.delete(reverse(STUDENT_DETAIL_URL, args=[1])),
+            lambda resp: {("student", 1, "deactivated")} | student_schools(1),
+        ),
+        (
+            lambda client, school: client.post(
+                STUDENT_BULK_URL,
+                data=[{**STUDENT_PAYLOAD, "school": school}] * 2,
+                format="json",
+            ),
+            lambda resp: {
+                ("student", row["id"], "created") for row in resp.json()["results"]
+            }
+            | student_schools(*(row["id"] for row in resp.json()["results"])),
+        ),
+        (
+            lambda client, school: client.patch(
+                STUDENT_BULK_URL,
+                data=[{"id": 1, "age": 11}, {"id": 2, "title": "MS"}],
+                format="json",
+            ),
+            lambda resp: {("student", 1, "updated"), ("student", 2, "updated")},
+        ),
+        (
+            lambda client, school: client.post(
+                STUDENT_DEACTIVATE_URL, data={"ids": [1, 2]}, format="json"
+            ),
+            lambda resp: {("student", 1, "deactivated"), ("student", 2, "deactivated")}
+            | student_schools(1, 2),
+        ),
+        (
+            lambda client, school: client.post(
+                SCHOOL_DEACTIVATE_URL, data={"ids": [1]}, format="json"
+            ),
+            lambda resp: {("school", 1, "deactivated")}
+            | {("student", pk, "updated") for pk in school_students(None)},
+        ),
+    ],
+    ids=[
+        "school-create",
+        "school-update",
+        "school-destroy",
+        "student-create",
+        "school-student-create",
+        "student-update",
+        "student-destroy",
+        "student-bulk-create",
+        "student-bulk-update",
+        "student-deactivate",
+        "school-deactivate",
+    ],
+)
+def test_writes_are_logged(
+    api_client: APIClient,
+    get_id_for_empty_school: int,
+    write: Callable,
+    get_expected: Callable,
+) -> None:
+
+    before: Set[Tuple[str, int, str]] = logged_changes()
+    resp: Response = write(api_client, get_id_for_empty_school)
+
+    assert resp.status_code in (200, 201, 204)
+    assert get_expected(resp) == logged_changes() - before
+
+
+@pytest.mark.django_db
+def test_import_is_logged(tmp_path: Path, get_id_for_empty_school: int) -> None:
+
+    before: Set[Tuple[str, int, str]] = logged_changes()
+    path: Path = tmp_path / "students.csv"
+    path.write_text(
+        "school,title,first_name,last_name,age,gender\n"
+        f"{get_id_for_empty_school},MR,John,Smith,12,MALE\n"
+        "1,MR,Too,Young,5,MALE\n"
+    )
+    call_command("importstudents", str(path), stdout=io.StringIO())
+
+    assert {
+        ("student", pk, "created") for pk in school_students(get_id_for_empty_school)
+    } | {("school", get_id_for_empty_school, "updated")} == logged_changes() - before
+
+
+@pytest.mark.django_db
+def test_move_logs_both_schools(
+    api_client: APIClient, get_id_for_empty_school: int
+) -> None:
+
+    previous: int = Student.objects.get(pk=1).school_id
+    before: Set[Tuple[str, int, str]] = logged_changes()
+    api_client.patch(
+        reverse(STUDENT_DETAIL_URL, args=[1]), data={"school": get_id_for_empty_school}
+    )
+
+    assert {
+        ("student", 1, "updated"),
+        ("school", previous, "updated"),
+        ("school", get_id_for_empty_school, "updated"),
+    } == logged_changes() - before
+
+
+@pytest.mark.django_db
+def test_recount_is_logged() -> None:
+
+    before: Set[Tuple[str, int, str]] = logged_changes()
+    call_command("recountstudents", "--school", "1", stdout=io.StringIO())
+
+    assert {("school", 1, "updated")} == logged_changes() - before
+
+
+@pytest.mark.django_db
+def test_refused_write_is_not_logged(
+    api_client: APIClient, get_id_for_full_school: int
+) -> None:
+
+    before: Set[Tuple[str, int, str]] = logged_changes()
+    resp: Response = api_client.post(
+        STUDENT_LIST_URL, data={**STUDENT_PAYLOAD, "school": get_id_for_full_school}
+    )
+
+    assert 400 == resp.status_code
+    assert before == logged_changes()
+
+
+@pytest.mark.django_db
+def test_changes_of_running_transactions_are_held_back(
+    api_client: APIClient, get_id_for_empty_school: int
+) -> None:
+
+    # The test's own transaction is still running, so its changes are not listed.
+    api_client.post(
+        STUDENT_LIST_URL, data={**STUDENT_PAYLOAD, "school": get_id_for_empty_school}
+    )
+    resp: Response = api_client.get(CHANGES_URL)
+
+    assert 200 == resp.status_code
+    assert [] == resp.json()["results"]
+    assert ChangeLog.objects.exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("since", ["abc", "12", "12-", "-3"])
+def test_changes_reject_invalid_cursor(api_client: APIClient, since: str) -> None:
+
+    resp: Response = api_client.get(CHANGES_URL, {"since": since})
+
+    assert 400 == resp.status_code
+    assert {"since": ["Invalid cursor."]} == resp.json()
+
+
+def read_feed(
+    api_client: APIClient, **params: object
+) -> Tuple[List[Dict], Optional[str]]:
+    # No cursor yet reads from the start.
+    resp: Response = api_client.get(
+        CHANGES_URL, {key: value for key, value in params.items() if value is not None}
+    )
+    assert 200 == resp.status_code
+    return resp.json()["results"], resp.json()["since"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_changes_are_paged_by_cursor(api_client: APIClient) -> None:
+
+    school_id: int = api_client.post(SCHOOL_LIST_URL, data=SCHOOL_PAYLOAD).json()["id"]
+    student_ids: List[int] = [
+        api_client.post(
+            STUDENT_LIST_URL, data={**STUDENT_PAYLOAD, "school": school_id}
+        ).json()["id"]
+        for _ in range(3)
+    ]
+    api_client.delete(reverse(STUDENT_DETAIL_URL, args=[student_ids[0]]))
+
+    resp: Response = api_client.get(CHANGES_URL, {"limit": 5})
+    first: List[Dict] = resp.json()["results"]
+    second, since = read_feed(api_client, limit=5, since=resp.json()["since"])
+    polled, polled_since = read_feed(api_client, since=since)
+
+    assert resp.json()["next"] is not None
+    # Each enrolment takes a seat, then creates the student, a removal the reverse.
+    assert [
+        ("school", school_id, "created"),
+        *(
+            change
+            for pk in student_ids
+            for change in (("school", school_id, "updated"), ("student", pk, "created"))
+        ),
+        ("student", student_ids[0], "deactivated"),
+        ("school", school_id, "updated"),
+    ] == [(row["model"], row["object_id"], row["action"]) for row in first + second]
+    assert ([], since) == (polled, polled_since)
+    assert {school_id} == {
+        row["object_id"] for row in read_feed(api_client, model="school")[0]
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+def test_changes_committed_out_of_order_are_not_skipped(
+    api_client: APIClient,
+) -> None:
+
+    started: threading.Event = threading.Event()
+    finish: threading.Event = threading.Event()
+
+    def write_slowly() -> None:
+        # Takes its txid first and commits last.
+        try:
+            with transaction.atomic():
+                ChangeLog.objects.record(School, ChangeAction.UPDATED, [1])
+                started.set()
+                finish.wait(timeout=10)
+        finally:
+            connection.close()
+
+    writer: threading.Thread = threading.Thread(target=write_slowly)
+    writer.start()
+    started.wait(timeout=10)
+    school_id: int = api_client.post(SCHOOL_LIST_URL, data=SCHOOL_PAYLOAD).json()["id"]
+    held_back, since = read_feed(api_client)
+    finish.set()
+    writer.join()
+    changes, _ = read_feed(api_client, since=since)
+
+    assert [] == held_back
+    assert [(1, "updated"), (school_id, "created")] == [
+        (row["object_id"], row["action"]) for row in changes
+    ]
@@ -0,0 +1,67 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.models import School, Student
+from tests.conftest import SCHOOL_STUDENT_LIST_URL, STUDENT_LIST_URL
+
+WORKERS: int = 8
+REQUESTS_PER_WORKER: int = 15
+SEATS: int = 40
+
+
+def enrol(url: str, payload: Dict, requests: int) -> List[int]:
+    api_client: APIClient = APIClient()
+    try:
+        return [api_client.post(url, data=payload).status_code for _ in range(requests)]
+    finally:
+        connection.close()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize(
+    "get_url,payload",
+    [
+        (
+            lambda school_id: STUDENT_LIST_URL,
+            {"title": "MR", "first_name": "John", "last_name": "Smith", "age": 12},
+        ),
+        (
+            lambda school_id: reverse(SCHOOL_STUDENT_LIST_URL, args=[school_id]),
+            {"title": "MS", "first_name": "Emma", "last_name": "Evans", "age": 14},
+        ),
+    ],
+    ids=["concurrent-students-create", "concurrent-school-students-create"],
+)
+def test_concurrent_enrolment_never_overfills_school(
+    get_url: Callable, payload: Dict, record_property: Callable
+) -> None:
+
+    school: School = School.objects.create(
+        name="Busy School", code="A20000", location="Bangkok", student_max_number=SEATS
+    )
+    payload = {**payload, "gender": "MALE", "school": school.id}
+    url: str = get_url(school.id)
+
+    started: float = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        results: List[List[int]] = list(
+            executor.map(
+                lambda _: enrol(url, payload, REQUESTS_PER_WORKER), range(WORKERS)
+            )
+        )
+    elapsed: float = time.perf_counter() - started
+
+    statuses: List[int] = [status for worker in results for status in worker]
+    record_property("requests_per_second", round(len(statuses) / elapsed, 1))
+
+    school.refresh_from_db()
+    assert SEATS == statuses.count(201)
+    assert len(statuses) - SEATS == statuses.count(400)
+    assert SEATS == school.enrolled_count
+    assert SEATS == Student.objects.filter(school=school, is_active=True).count()
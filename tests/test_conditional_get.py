@@ -0,0 +1,185 @@
+from datetime import datetime
+from typing import Any, Callable, Dict
+
+import pytest
+from django.urls import reverse
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from core.models import School, Student
+from tests.conftest import (
+    SCHOOL_DETAIL_URL,
+    SCHOOL_STUDENT_LIST_URL,
+    STUDENT_BULK_URL,
+    STUDENT_DEACTIVATE_URL,
+    STUDENT_DETAIL_URL,
+    STUDENT_LIST_URL,
+)
+from utils.cache import get_response_cache
+
+STUDENT_PAYLOAD: Dict = {
+    "title": "MR",
+    "first_name": "John",
+    "last_name": "John",
+    "age": 12,
+    "gender": "MALE",
+}
+
+
+def updated_at(model: Any, pk: int) -> datetime:
+    value: datetime = model.objects.values_list("updated_at", flat=True).get(pk=pk)
+    return value
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url",
+    [
+        reverse(SCHOOL_DETAIL_URL, args=[1]),
+        reverse(STUDENT_DETAIL_URL, args=[1]),
+        reverse(SCHOOL_STUDENT_LIST_URL, args=[1]),
+        f"{STUDENT_LIST_URL}?pagination=keyset",
+    ],
+    ids=["school-detail", "student-detail", "school-student-list", "keyset-list"],
+)
+def test_matching_etag_is_not_modified(api_client: APIClient, url: str) -> None:
+
+    etag: str = api_client.get(url)["ETag"]
+    resp: Response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert 304 == resp.status_code
+    assert b"" == resp.content
+    assert etag == resp["ETag"]
+
+
+@pytest.mark.django_db
+def test_not_modified_skips_serializing(
+    api_client: APIClient, django_assert_num_queries: Callable
+) -> None:
+
+    url: str = reverse(STUDENT_DETAIL_URL, args=[1])
+    etag: str = api_client.get(url)["ETag"]
+    get_response_cache().clear()
+
+    with django_assert_num_queries(1):
+        resp: Response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert 304 == resp.status_code
+    assert "MISS" == resp["X-Cache"]
+
+
+@pytest.mark.django_db
+def test_matching_last_modified_is_not_modified(api_client: APIClient) -> None:
+
+    url: str = reverse(SCHOOL_DETAIL_URL, args=[1])
+    last_modified: str = api_client.get(url)["Last-Modified"]
+    resp: Response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+    assert 304 == resp.status_code
+
+
+@pytest.mark.django_db
+def test_list_has_no_last_modified(api_client: APIClient) -> None:
+
+    school_id: int = School.objects.filter(enrolled_count__gt=1).first().pk
+    url: str = reverse(SCHOOL_STUDENT_LIST_URL, args=[school_id])
+    first: Response = api_client.get(url)
+    detail_last_modified: str = api_client.get(
+        reverse(SCHOOL_DETAIL_URL, args=[school_id])
+    )["Last-Modified"]
+    # A row leaving the page leaves the newest updated_at of the rest as it was.
+    Student.objects.filter(pk=first.json()["results"][0]["id"]).update(is_active=False)
+    get_response_cache().clear()
+
+    resp: Response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=detail_last_modified)
+
+    assert "Last-Modified" not in first
+    assert 200 == resp.status_code
+    assert "Last-Modified" not in resp
+
+
+@pytest.mark.django_db
+def test_update_changes_etag(api_client: APIClient) -> None:
+
+    url: str = reverse(SCHOOL_DETAIL_URL, args=[1])
+    etag: str = api_client.get(url)["ETag"]
+    api_client.patch(url, data={"name": "School Renamed"})
+
+    resp: Response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert 200 == resp.status_code
+    assert etag != resp["ETag"]
+
+
+@pytest.mark.django_db
+def test_school_change_changes_student_etag(api_client: APIClient) -> None:
+
+    student: Student = Student.objects.get(pk=1)
+    url: str = reverse(STUDENT_DETAIL_URL, args=[student.pk])
+    etag: str = api_client.get(url)["ETag"]
+    api_client.patch(
+        reverse(SCHOOL_DETAIL_URL, args=[student.school_id]),
+        data={"location": "Elsewhere"},
+    )
+
+    assert 200 == api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "write",
+    [
+        lambda client, school_id, student_id: client.post(
+            reverse(SCHOOL_STUDENT_LIST_URL, args=[school_id]), data=STUDENT_PAYLOAD
+        ),
+        lambda client, school_id, student_id: client.delete(
+            reverse(STUDENT_DETAIL_URL, args=[student_id])
+        ),
+        lambda client, school_id, student_id: client.patch(
+            STUDENT_BULK_URL,
+            data=[{"id": student_id, "last_name": "Moved"}],
+            format="json",
+        ),
+    ],
+    ids=["create", "destroy", "bulk-update"],
+)
+def test_writes_change_list_etag(api_client: APIClient, write: Callable) -> None:
+
+    school_id: int = School.objects.filter(enrolled_count__gt=1).first().pk
+    url: str = reverse(SCHOOL_STUDENT_LIST_URL, args=[school_id])
+    first: Response = api_client.get(url)
+    write(api_client, school_id, first.json()["results"][0]["id"])
+
+    assert 200 == api_client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code
+
+
+@pytest.mark.django_db
+def test_create_student_touches_school(
+    api_client: APIClient, get_id_for_empty_school: int
+) -> None:
+
+    before: datetime = updated_at(School, get_id_for_empty_school)
+    api_client.post(
+        STUDENT_LIST_URL, data={**STUDENT_PAYLOAD, "school": get_id_for_empty_school}
+    )
+
+    assert before < updated_at(School, get_id_for_empty_school)
+
+
+@pytest.mark.django_db
+def test_destroy_school_touches_detached_students(api_client: APIClient) -> None:
+
+    student: Student = Student.objects.filter(school_id=1).first()
+    api_client.delete(reverse(SCHOOL_DETAIL_URL, args=[1]))
+
+    assert student.updated_at < updated_at(Student, student.pk)
+
+
+@pytest.mark.django_db
+def test_bulk_deactivate_touches_rows(api_client: APIClient) -> None:
+
+    student: Student = Student.objects.select_related("school").get(pk=1)
+    api_client.post(STUDENT_DEACTIVATE_URL, data={"ids": [1]}, format="json")
+
+    assert student.updated_at < updated_at(Student, 1)
+    assert student.school.updated_at < updated_at(School, student.school_id)
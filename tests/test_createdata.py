@@ -0,0 +1,89 @@
+from io import StringIO
+from typing import List, Tuple
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count, F
+
+from core.management.commands.createdata import create_schools
+from core.models import School, Student
+from utils.constants import MAXIMUM_AGE, MINIMUM_AGE
+
+FIRST: int = 100000
+NAMES: str = r" 10000[1-4]$"
+
+
+def created_rows() -> List[Tuple]:
+    schools: List[Tuple] = list(
+        School.objects.filter(name__regex=NAMES)
+        .order_by("name")
+        .values_list("name", "code", "location", "student_max_number")
+    )
+    students: List[Tuple] = list(
+        Student.objects.filter(school__name__regex=NAMES)
+        .order_by("school__name", "id")
+        .values_list("school__name", "title", "first_name", "last_name", "age")
+    )
+    return schools + students
+
+
+@pytest.mark.django_db
+def test_create_schools_is_reproducible_however_split() -> None:
+
+    create_schools(0, 4, 3, seed=7, batch_size=5, offset=FIRST)
+    rows: List[Tuple] = created_rows()
+    School.objects.filter(name__regex=NAMES).delete()
+
+    create_schools(0, 1, 3, seed=7, batch_size=1000, offset=FIRST)
+    create_schools(1, 4, 3, seed=7, batch_size=2, offset=FIRST)
+
+    assert 4 + 4 * 3 == len(rows)
+    assert rows == created_rows()
+
+
+@pytest.mark.django_db
+def test_createdata_command() -> None:
+
+    school_count: int = School.objects.count()
+    student_count: int = Student.objects.count()
+    stdout: StringIO = StringIO()
+
+    call_command(
+        "createdata",
+        schools=7,
+        students_per_school=4,
+        seed=1,
+        batch_size=10,
+        stdout=stdout,
+    )
+
+    assert "Creating 35 rows with seed 1" in stdout.getvalue()
+    assert "35/35 rows" in stdout.getvalue()
+    assert school_count + 7 == School.objects.count()
+    assert student_count + 28 == Student.objects.count()
+    created: List[School] = list(
+        School.objects.order_by("-id")[:7].annotate(students=Count("student"))
+    )
+    assert all(school.students == school.enrolled_count == 4 for school in created)
+    assert not School.objects.filter(student_max_number__lt=F("enrolled_count"))
+    assert School.objects.count() == School.objects.values("name").distinct().count()
+
+
+def latest_rows(schools: int) -> List[List]:
+    # The rows of the newest schools, without the numbered names.
+    return [
+        [school.code, school.location, school.student_max_number]
+        + list(school.student.order_by("id").values_list("first_name", "age"))
+        for school in School.objects.order_by("-id")[:schools]
+    ]
+
+
+@pytest.mark.django_db
+def test_createdata_seed_ignores_existing_schools() -> None:
+
+    call_command("createdata", schools=3, seed=5, stdout=StringIO())
+    first: List[List] = latest_rows(3)
+    call_command("createdata", schools=3, seed=5, stdout=StringIO())
+
+    assert first == latest_rows(3)
+    assert all(MINIMUM_AGE <= age <= MAXIMUM_AGE for row in first for _, age in row[3:])
@@ -0,0 +1,267 @@
+from typing import Dict
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.response import Response
+from rest_framework.serializers import ModelSerializer
+from rest_framework.test import APIClient
+
+from core.models import School, Student
+from core.serializers import SchoolSerializer, StudentSerializer
+from core.views import StudentNestedViewSet
+from services.core_services import reserve_seat
+from tests.conftest import (
+    SCHOOL_DETAIL_URL,
+    SCHOOL_STUDENT_DETAIL_URL,
+    SCHOOL_STUDENT_LIST_URL,
+    STUDENT_DETAIL_URL,
+    STUDENT_LIST_URL,
+)
+
+STUDENT_PAYLOAD: Dict = {
+    "title": "MR",
+    "first_name": "John",
+    "last_name": "John",
+    "age": 12,
+    "gender": "MALE",
+}
+
+
+def enrolled_count(school_id: int) -> int:
+    return int(School.objects.get(pk=school_id).enrolled_count)
+
+
+@pytest.mark.django_db
+def test_seeded_counts_match_active_students() -> None:
+
+    for school in School.objects.all():
+        assert school.student.filter(is_active=True).count() == school.enrolled_count
+
+
+@pytest.mark.django_db
+def test_create_student_increments_count(
+    api_client: APIClient, get_id_for_empty_school: int
+) -> None:
+
+    resp: Response = api_client.post(
+        STUDENT_LIST_URL, data={**STUDENT_PAYLOAD, "school": get_id_for_empty_school}
+    )
+
+    assert 201 == resp.status_code
+    assert 1 == enrolled_count(get_id_for_empty_school)
+
+
+@pytest.mark.django_db
+def test_create_school_student_increments_count(
+    api_client: APIClient, get_id_for_empty_school: int
+) -> None:
+
+    url: str = reverse(SCHOOL_STUDENT_LIST_URL, args=[get_id_for_empty_school])
+    resp: Response = api_client.post(url, data=STUDENT_PAYLOAD)
+
+    assert 201 == resp.status_code
+    assert 1 == enrolled_count(get_id_for_empty_school)
+
+
+@pytest.mark.django_db
+def test_move_student_updates_both_counts(
+    api_client: APIClient, get_id_for_empty_school: int
+) -> None:
+
+    student: Student = Student.objects.get(pk=1)
+    previous_count: int = enrolled_count(student.school_id)
+
+    url: str = reverse(STUDENT_DETAIL_URL, args=[student.id])
+    resp: Response = api_client.patch(url, data={"school": get_id_for_empty_school})
+
+    assert 200 == resp.status_code
+    assert previous_count - 1 == enrolled_count(student.school_id)
+    assert 1 == enrolled_count(get_id_for_empty_school)
+
+
+@pytest.mark.django_db
+def test_concurrent_moves_release_the_seat_once(get_id_for_empty_school: int) -> None:
+
+    first: Student = Student.objects.get(pk=1)
+    second: Student = Student.objects.get(pk=1)
+    source_id: int = first.school_id
+    previous_count: int = enrolled_count(source_id)
+    target_id: int = School.objects.exclude(pk=source_id).values("pk")[0]["pk"]
+    target_count: int = enrolled_count(target_id)
+
+    # The second move starts from a student loaded before the first one committed.
+    for student, school_id in ((first, target_id), (second, get_id_for_empty_school)):
+        serializer: StudentSerializer = StudentSerializer(
+            student, data={"school": school_id}, partial=True
+        )
+        assert serializer.is_valid()
+        serializer.save()
+
+    assert previous_count - 1 == enrolled_count(source_id)
+    assert target_count == enrolled_count(target_id)
+    assert 1 == enrolled_count(get_id_for_empty_school)
+    assert get_id_for_empty_school == Student.objects.get(pk=1).school_id
+
+
+@pytest.mark.django_db
+def test_create_student_in_inactive_school(
+    api_client: APIClient, get_id_for_empty_school: int
+) -> None:
+
+    School.objects.filter(pk=get_id_for_empty_school).update(is_active=False)
+
+    resp: Response = api_client.post(
+        STUDENT_LIST_URL, data={**STUDENT_PAYLOAD, "school": get_id_for_empty_school}
+    )
+
+    assert 400 == resp.status_code
+    assert "school" in resp.json()
+    assert 0 == enrolled_count(get_id_for_empty_school)
+
+
+@pytest.mark.django_db
+def test_reserve_seat_skips_inactive_school(get_id_for_empty_school: int) -> None:
+
+    school: School = School.objects.get(pk=get_id_for_empty_school)
+    School.objects.filter(pk=school.pk).update(is_active=False)
+
+    assert not reserve_seat(school)
+    assert 0 == enrolled_count(get_id_for_empty_school)
+
+
+@pytest.mark.django_db
+def test_delete_student_decrements_count(api_client: APIClient) -> None:
+
+    student: Student = Student.objects.get(pk=1)
+    previous_count: int = enrolled_count(student.school_id)
+
+    resp: Response = api_client.delete(reverse(STUDENT_DETAIL_URL, args=[student.id]))
+
+    assert 204 == resp.status_code
+    assert previous_count - 1 == enrolled_count(student.school_id)
+
+
+@pytest.mark.django_db
+def test_delete_school_resets_count(api_client: APIClient) -> None:
+
+    resp: Response = api_client.delete(reverse(SCHOOL_DETAIL_URL, args=[1]))
+
+    assert 204 == resp.status_code
+    assert 0 == enrolled_count(1)
+
+
+@pytest.mark.django_db
+def test_school_exposes_count(api_client: APIClient) -> None:
+
+    resp: Response = api_client.get(reverse(SCHOOL_DETAIL_URL, args=[1]))
+
+    assert enrolled_count(1) == resp.json()["enrolled_count"]
+
+
+@pytest.mark.django_db
+def test_school_count_is_read_only(api_client: APIClient) -> None:
+
+    url: str = reverse(SCHOOL_DETAIL_URL, args=[1])
+    resp: Response = api_client.patch(url, data={"enrolled_count": 0})
+
+    assert 200 == resp.status_code
+    assert 0 != enrolled_count(1)
+
+
+@pytest.mark.django_db
+def test_school_save_keeps_later_enrolments() -> None:
+
+    school: School = School.objects.get(pk=1)
+    previous_count: int = school.enrolled_count
+    assert reserve_seat(School.objects.get(pk=1))
+
+    school.name = "Renamed School"
+    school.save()
+
+    assert previous_count + 1 == enrolled_count(1)
+
+
+@pytest.mark.django_db
+def test_school_update_keeps_enrolment_made_meanwhile(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+
+    previous_count: int = enrolled_count(1)
+
+    # A seat is taken between the view loading the school and saving it. The plain
+    # client doesn't hold the view to its query budget, the enrolment adds two.
+    def update(
+        self: SchoolSerializer, instance: School, validated_data: Dict
+    ) -> School:
+        assert reserve_seat(School.objects.get(pk=instance.pk))
+        school: School = ModelSerializer.update(self, instance, validated_data)
+        return school
+
+    monkeypatch.setattr(SchoolSerializer, "update", update)
+    url: str = reverse(SCHOOL_DETAIL_URL, args=[1])
+    resp: Response = APIClient().patch(url, data={"location": "Chiang Mai"})
+
+    assert 200 == resp.status_code
+    assert previous_count + 1 == enrolled_count(1)
+    assert "Chiang Mai" == School.objects.get(pk=1).location
+
+
+@pytest.mark.django_db
+def test_stale_school_student_update_keeps_deactivation(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+
+    student: Student = Student.objects.get(pk=1)
+    previous_count: int = enrolled_count(student.school_id)
+    APIClient().delete(reverse(STUDENT_DETAIL_URL, args=[1]))
+    # The PATCH starts from the student loaded before the removal committed.
+    monkeypatch.setattr(StudentNestedViewSet, "get_object", lambda view: student)
+
+    url: str = reverse(SCHOOL_STUDENT_DETAIL_URL, args=[student.school_id, 1])
+    resp: Response = APIClient().patch(url, data={"first_name": "Stale"})
+
+    assert 404 == resp.status_code
+    assert not Student.objects.get(pk=1).is_active
+    assert previous_count - 1 == enrolled_count(student.school_id)
+
+
+@pytest.mark.django_db
+def test_stale_school_save_keeps_deactivation() -> None:
+
+    school: School = School.objects.get(pk=1)
+    APIClient().delete(reverse(SCHOOL_DETAIL_URL, args=[1]))
+
+    school.name = "Renamed School"
+    school.save()
+
+    assert not School.objects.get(pk=1).is_active
+
+
+@pytest.mark.django_db
+def test_recount_command_fixes_drift() -> None:
+
+    School.objects.update(enrolled_count=0)
+    Student.objects.filter(pk=1).update(is_active=False)
+
+    call_command("recountstudents")
+
+    for school in School.objects.all():
+        assert school.student.filter(is_active=True).count() == school.enrolled_count
+
+
+@pytest.mark.django_db
+def test_over_capacity_school_stays_full(
+    api_client: APIClient, get_id_for_empty_school: int
+) -> None:
+
+    School.objects.filter(pk=get_id_for_empty_school).update(
+        student_max_number=1, enrolled_count=2
+    )
+
+    resp: Response = api_client.post(
+        STUDENT_LIST_URL, data={**STUDENT_PAYLOAD, "school": get_id_for_empty_school}
+    )
+
+    assert 400 == resp.status_code
+    assert 2 == enrolled_count(get_id_for_empty_school)
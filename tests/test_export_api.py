@@ -0,0 +1,129 @@
+import csv
+import io
+import json
+from typing import Callable, Dict, List
+from unittest import mock
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from django.db import connections
+from django.http import StreamingHttpResponse
+from rest_framework.test import APIClient
+
+from core.models import School, Student
+from tests.conftest import SCHOOL_EXPORT_URL, SCHOOL_LIST_URL, STUDENT_EXPORT_URL
+
+
+def read_ndjson(resp: StreamingHttpResponse) -> List[Dict]:
+    return [json.loads(line) for line in b"".join(resp.streaming_content).splitlines()]
+
+
+def read_csv(resp: StreamingHttpResponse) -> List[Dict]:
+    content: str = b"".join(resp.streaming_content).decode()
+    return list(csv.DictReader(io.StringIO(content)))
+
+
+@pytest.mark.django_db
+def test_export_students_ndjson(api_client: APIClient) -> None:
+
+    resp: StreamingHttpResponse = api_client.get(STUDENT_EXPORT_URL)
+    records: List[Dict] = read_ndjson(resp)
+
+    assert 200 == resp.status_code
+    assert resp.streaming
+    assert resp["Content-Type"].startswith("application/x-ndjson")
+    assert Student.objects.filter(is_active=True).count() == len(records)
+    assert {"id", "first_name", "school_details"} <= set(records[0])
+
+
+@pytest.mark.django_db
+def test_export_matches_list_representation(api_client: APIClient) -> None:
+
+    listed: List[Dict] = api_client.get(f"{SCHOOL_LIST_URL}?limit=100").json()[
+        "results"
+    ]
+
+    assert listed == read_ndjson(api_client.get(SCHOOL_EXPORT_URL))
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "headers",
+    [{"format": "csv"}, {"HTTP_ACCEPT": "text/csv"}],
+    ids=["format-param", "accept-header"],
+)
+def test_export_students_csv(api_client: APIClient, headers: Dict) -> None:
+
+    data: Dict = {"format": headers.pop("format")} if "format" in headers else {}
+    resp: StreamingHttpResponse = api_client.get(STUDENT_EXPORT_URL, data, **headers)
+    rows: List[Dict] = read_csv(resp)
+
+    assert 200 == resp.status_code
+    assert resp["Content-Type"].startswith("text/csv")
+    assert 'filename="students.csv"' in resp["Content-Disposition"]
+    assert Student.objects.filter(is_active=True).count() == len(rows)
+    assert "school_details.name" in rows[0]
+    assert "school_details" not in rows[0]
+
+
+@pytest.mark.django_db
+def test_export_csv_student_without_school(api_client: APIClient) -> None:
+
+    school: School = School.objects.get(pk=1)
+    school.is_active = False
+    school.save(update_fields=["is_active", "updated_at"])
+
+    rows: List[Dict] = read_csv(api_client.get(STUDENT_EXPORT_URL, {"format": "csv"}))
+
+    assert "" in {row["school_details.name"] for row in rows}
+
+
+@pytest.mark.django_db
+def test_export_honours_filters(
+    api_client: APIClient, get_school_name_data: str
+) -> None:
+
+    records: List[Dict] = read_ndjson(
+        api_client.get(STUDENT_EXPORT_URL, {"school": get_school_name_data})
+    )
+
+    assert records
+    assert {get_school_name_data} == {
+        record["school_details"]["name"] for record in records
+    }
+
+
+@pytest.mark.django_db
+def test_export_honours_sparse_fieldsets(api_client: APIClient) -> None:
+
+    rows: List[Dict] = read_csv(
+        api_client.get(STUDENT_EXPORT_URL, {"format": "csv", "fields": "id,age"})
+    )
+
+    assert ["id", "age"] == list(rows[0])
+
+
+@pytest.mark.django_db
+def test_export_rejects_unknown_format(api_client: APIClient) -> None:
+
+    assert 404 == api_client.get(STUDENT_EXPORT_URL, {"format": "xml"}).status_code
+
+
+@pytest.mark.django_db
+def test_export_reads_in_chunks_from_a_server_side_cursor(
+    api_client: APIClient,
+    django_assert_num_queries: Callable,
+    monkeypatch: MonkeyPatch,
+) -> None:
+
+    monkeypatch.setattr("utils.views.EXPORT_CHUNK_SIZE", 7)
+    with mock.patch.object(
+        connections["default"],
+        "chunked_cursor",
+        wraps=connections["default"].chunked_cursor,
+    ) as chunked_cursor:
+        with django_assert_num_queries(1):
+            records: List[Dict] = read_ndjson(api_client.get(STUDENT_EXPORT_URL))
+
+    assert 1 == chunked_cursor.call_count
+    assert Student.objects.filter(is_active=True).count() == len(records)
@@ -0,0 +1,117 @@
+from typing import Any, Dict, List, Optional
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from django.urls import reverse
+from rest_framework.response import Response
+from rest_framework.serializers import ModelSerializer, SerializerMethodField
+from rest_framework.test import APIClient
+
+from core.models import School, Student
+from core.serializers import SchoolSerializer, StudentSerializer
+from core.views import SchoolViewSet, StudentNestedViewSet, StudentViewSet
+from tests.conftest import (
+    SCHOOL_DETAIL_URL,
+    SCHOOL_LIST_URL,
+    SCHOOL_STUDENT_DETAIL_URL,
+    SCHOOL_STUDENT_LIST_URL,
+    STUDENT_DETAIL_URL,
+    STUDENT_LIST_URL,
+)
+from utils.cache import get_response_cache
+from utils.querysets import plan_related_loading
+from utils.serializers import RowRepresentation
+
+PARITY_URLS: List[str] = [
+    SCHOOL_LIST_URL,
+    f"{SCHOOL_LIST_URL}?limit=100",
+    f"{SCHOOL_LIST_URL}?pagination=keyset",
+    f"{SCHOOL_LIST_URL}?fields=id,seats_available&has_capacity=true",
+    reverse(SCHOOL_DETAIL_URL, args=[1]),
+    f"{STUDENT_LIST_URL}?limit=100",
+    f"{STUDENT_LIST_URL}?pagination=keyset&limit=20",
+    f"{STUDENT_LIST_URL}?fields=id,first_name,school_details",
+    f"{STUDENT_LIST_URL}?omit=school_details",
+    reverse(STUDENT_DETAIL_URL, args=[1]),
+    reverse(SCHOOL_STUDENT_LIST_URL, args=[2]),
+    reverse(SCHOOL_STUDENT_DETAIL_URL, args=[2, 11]),
+]
+
+
+def get_both_ways(
+    api_client: APIClient, monkeypatch: MonkeyPatch, url: str
+) -> List[Response]:
+    responses: List[Response] = [api_client.get(url)]
+    get_response_cache().clear()
+    for viewset in (SchoolViewSet, StudentViewSet, StudentNestedViewSet):
+        monkeypatch.setattr(viewset, "fast_read_actions", ())
+    responses.append(api_client.get(url))
+    return responses
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", PARITY_URLS, ids=PARITY_URLS)
+def test_fast_read_matches_serializer(
+    api_client: APIClient, monkeypatch: MonkeyPatch, url: str
+) -> None:
+
+    fast, regular = get_both_ways(api_client, monkeypatch, url)
+
+    assert 200 == fast.status_code
+    assert regular.content == fast.content
+    assert regular["ETag"] == fast["ETag"]
+
+
+@pytest.mark.django_db
+def test_fast_read_renders_student_without_school(
+    api_client: APIClient, monkeypatch: MonkeyPatch
+) -> None:
+
+    school: School = School.objects.get(pk=1)
+    school.is_active = False
+    school.save(update_fields=["is_active", "updated_at"])
+    url: str = f"{STUDENT_LIST_URL}?first_name={Student.objects.get(pk=1).first_name}"
+
+    fast, regular = get_both_ways(api_client, monkeypatch, url)
+
+    assert None in [row["school_details"] for row in fast.json()["results"]]
+    assert regular.content == fast.content
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "serializer_class",
+    [SchoolSerializer, StudentSerializer],
+    ids=["school", "student"],
+)
+def test_row_representation_matches_every_row(
+    serializer_class: type,
+) -> None:
+
+    serializer: ModelSerializer = serializer_class()
+    representation: Optional[RowRepresentation] = RowRepresentation.compile(serializer)
+    assert representation is not None
+    model: Any = serializer.Meta.model
+    instances: Dict = {
+        instance.pk: serializer_class(instance).data
+        for instance in plan_related_loading(model.objects.all(), serializer)
+    }
+
+    for row in model.objects.values(*representation.columns):
+        assert instances[row["id"]] == representation.render(row)
+
+
+class StudentNameSerializer(ModelSerializer):
+    name: SerializerMethodField = SerializerMethodField()
+
+    class Meta:
+        model: type = Student
+        fields: tuple = ("id", "name")
+
+    def get_name(self, student: Student) -> str:
+        return str(student)
+
+
+def test_row_representation_needs_column_backed_fields() -> None:
+
+    assert RowRepresentation.compile(StudentNameSerializer()) is None
@@ -0,0 +1,192 @@
+import csv
+import io
+import json
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from core.models import School, Student
+
+HEADER: str = "school,title,first_name,last_name,age,gender\n"
+
+
+def run_import(path: Path, *args: str) -> Dict[str, str]:
+    stdout: io.StringIO = io.StringIO()
+    stderr: io.StringIO = io.StringIO()
+    call_command("importstudents", str(path), *args, stdout=stdout, stderr=stderr)
+    return {"stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+def rejected_rows(output: str) -> List[Dict]:
+    return list(csv.DictReader(io.StringIO(output)))
+
+
+@pytest.mark.django_db
+def test_import_csv(tmp_path: Path, get_id_for_empty_school: int) -> None:
+
+    path: Path = tmp_path / "students.csv"
+    path.write_text(
+        HEADER
+        + f"{get_id_for_empty_school},MR,John,Smith,12,MALE\n"
+        + f"{get_id_for_empty_school},MS,Anna,Jones,14,FEMALE\n"
+    )
+
+    output: Dict[str, str] = run_import(path)
+
+    assert "Imported 2 students, rejected 0 rows" in output["stdout"]
+    assert 2 == School.objects.get(pk=get_id_for_empty_school).enrolled_count
+    assert ["Anna", "John"] == sorted(
+        Student.objects.filter(school_id=get_id_for_empty_school).values_list(
+            "first_name", flat=True
+        )
+    )
+
+
+@pytest.mark.django_db
+def test_import_csv_columns_in_any_order(
+    tmp_path: Path, get_id_for_empty_school: int
+) -> None:
+
+    path: Path = tmp_path / "students.csv"
+    path.write_text(
+        "age,gender,first_name,last_name,title,school\n"
+        f"12,MALE,John,Smith,MR,{get_id_for_empty_school}\n"
+    )
+
+    run_import(path)
+
+    assert (12, "John") == Student.objects.values_list("age", "first_name").get(
+        school_id=get_id_for_empty_school
+    )
+
+
+@pytest.mark.django_db
+def test_import_rejects_invalid_rows(
+    tmp_path: Path, get_id_for_empty_school: int
+) -> None:
+
+    School.objects.filter(pk=get_id_for_empty_school).update(student_max_number=1)
+    inactive: School = School.objects.get(pk=1)
+    inactive.is_active = False
+    inactive.save(update_fields=["is_active", "updated_at"])
+    row: Dict = {
+        "school": get_id_for_empty_school,
+        "title": "MR",
+        "first_name": "John",
+        "last_name": "Smith",
+        "age": 12,
+        "gender": "MALE",
+    }
+    lines: List[str] = [
+        json.dumps(row),
+        json.dumps({**row, "age": 30}),
+        "{not json",
+        json.dumps({**row, "title": "DR"}),
+        json.dumps({**row, "school": 100000}),
+        json.dumps({**row, "school": 1}),
+        json.dumps({**row, "first_name": ""}),
+        json.dumps({**row, "age": "twelve"}),
+        json.dumps({**row, "first_name": "Second"}),
+    ]
+    path: Path = tmp_path / "students.ndjson"
+    path.write_text("\n".join(lines) + "\n")
+
+    output: Dict[str, str] = run_import(path)
+    errors: Dict[str, str] = {
+        row["line"]: row["error"] for row in rejected_rows(output["stderr"])
+    }
+
+    assert "Imported 1 students, rejected 8 rows" in output["stdout"]
+    assert {
+        "2": "Students need to be age between 10 to 20 to register!",
+        "3": "Invalid JSON object.",
+        "4": "Title is not a valid choice.",
+        "5": "School does not exist.",
+        "6": "School does not exist.",
+        "7": "first_name must have 1 to 20 characters.",
+        "8": "Age must be a number.",
+        "9": "Unable to add student to school as it is full!",
+    } == errors
+    assert 1 == School.objects.get(pk=get_id_for_empty_school).enrolled_count
+
+
+@pytest.mark.django_db
+def test_import_fills_free_seats_in_file_order(
+    tmp_path: Path, get_id_for_full_school: int, get_id_for_empty_school: int
+) -> None:
+
+    School.objects.filter(pk=get_id_for_empty_school).update(student_max_number=2)
+    path: Path = tmp_path / "students.csv"
+    path.write_text(
+        HEADER
+        + "".join(
+            f"{school},MR,John{index},Smith,12,MALE\n"
+            for index, school in enumerate(
+                [get_id_for_full_school] + [get_id_for_empty_school] * 3
+            )
+        )
+    )
+    rejects: Path = tmp_path / "rejects.csv"
+
+    output: Dict[str, str] = run_import(path, "--rejects", str(rejects))
+
+    assert "" == output["stderr"]
+    # Line 1 is the header.
+    assert ["2", "5"] == [row["line"] for row in rejected_rows(rejects.read_text())]
+    assert ["John1", "John2"] == sorted(
+        Student.objects.filter(school_id=get_id_for_empty_school).values_list(
+            "first_name", flat=True
+        )
+    )
+    assert 1 == School.objects.get(pk=get_id_for_full_school).enrolled_count
+
+
+@pytest.mark.django_db
+def test_import_csv_rejects_report_file_lines(
+    tmp_path: Path, get_id_for_empty_school: int
+) -> None:
+
+    path: Path = tmp_path / "students.csv"
+    path.write_text(
+        HEADER
+        + f'{get_id_for_empty_school},MR,"John\nPaul",Smith,12,MALE\n'
+        + "\n"
+        + f"{get_id_for_empty_school},DR,Anna,Jones,14,FEMALE\n"
+        + f"{get_id_for_empty_school},MS,Anna,Jones,30,FEMALE\n"
+    )
+
+    output: Dict[str, str] = run_import(path)
+
+    # The header and the quoted line break take a line each, the blank line too.
+    assert "Imported 1 students, rejected 2 rows" in output["stdout"]
+    assert {
+        "5": "Title is not a valid choice.",
+        "6": "Students need to be age between 10 to 20 to register!",
+    } == {row["line"]: row["error"] for row in rejected_rows(output["stderr"])}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "name,content",
+    [
+        ("students.csv", "school,title,first_name\n1,MR,John\n"),
+        ("students.csv", f"{HEADER}1,MR,John\n"),
+        ("students.txt", HEADER),
+        ("missing.csv", None),
+    ],
+    ids=["missing-columns", "short-line", "unknown-format", "missing-file"],
+)
+def test_import_unsuccessful(tmp_path: Path, name: str, content: str) -> None:
+
+    path: Path = tmp_path / name
+    if content is not None:
+        path.write_text(content)
+    student_count: int = Student.objects.count()
+
+    with pytest.raises(CommandError):
+        run_import(path)
+
+    assert student_count == Student.objects.count()
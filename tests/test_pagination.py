@@ -0,0 +1,214 @@
+from typing import Callable, List
+
+import pytest
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from core.models import School, Student
+from tests.conftest import SCHOOL_LIST_URL, SCHOOL_STUDENT_LIST_URL, STUDENT_LIST_URL
+
+
+def walk_pages(api_client: APIClient, url: str) -> List[int]:
+    ids: List[int] = []
+    while url:
+        resp: Response = api_client.get(url)
+        assert 200 == resp.status_code
+        ids += [row["id"] for row in resp.json()["results"]]
+        url = resp.json()["next"]
+    return ids
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url,page_size",
+    [
+        (SCHOOL_LIST_URL, 10),
+        (STUDENT_LIST_URL, 5),
+        (reverse(SCHOOL_STUDENT_LIST_URL, args=[1]), 5),
+    ],
+    ids=["keyset-schools", "keyset-students", "keyset-school-students"],
+)
+def test_keyset_first_page(api_client: APIClient, url: str, page_size: int) -> None:
+
+    resp: Response = api_client.get(f"{url}?pagination=keyset")
+
+    assert 200 == resp.status_code
+    assert page_size == len(resp.json()["results"])
+    assert "count" not in resp.json()
+    assert resp.json()["previous"] is None
+
+
+@pytest.mark.django_db
+def test_keyset_walk_matches_offset_order(api_client: APIClient) -> None:
+
+    keyset_ids: List[int] = walk_pages(
+        api_client, f"{STUDENT_LIST_URL}?pagination=keyset&limit=7"
+    )
+    expected_ids: List[int] = list(
+        Student.objects.filter(is_active=True)
+        .order_by("-created_at", "-id")
+        .values_list("id", flat=True)
+    )
+
+    assert expected_ids == keyset_ids
+
+
+@pytest.mark.django_db
+def test_keyset_pages_are_stable_during_inserts(api_client: APIClient) -> None:
+
+    first_page: Response = api_client.get(f"{STUDENT_LIST_URL}?pagination=keyset")
+    Student.objects.create(
+        title="MR", first_name="New", last_name="Row", age=12, gender="MALE"
+    )
+    rest_ids: List[int] = walk_pages(api_client, first_page.json()["next"])
+    first_ids: List[int] = [row["id"] for row in first_page.json()["results"]]
+
+    assert not set(first_ids) & set(rest_ids)
+    assert Student.objects.filter(is_active=True).count() - 1 == len(
+        first_ids + rest_ids
+    )
+
+
+@pytest.mark.django_db
+def test_keyset_previous_link(api_client: APIClient) -> None:
+
+    first_page: Response = api_client.get(f"{STUDENT_LIST_URL}?pagination=keyset")
+    second_page: Response = api_client.get(first_page.json()["next"])
+    previous_page: Response = api_client.get(second_page.json()["previous"])
+
+    assert first_page.json()["results"] == previous_page.json()["results"]
+
+
+@pytest.mark.django_db
+def test_keyset_ordering_column_is_never_null() -> None:
+
+    # Every row has a position to seek from.
+    with pytest.raises(IntegrityError):
+        Student.objects.filter(pk=1).update(created_at=None)
+
+
+@pytest.mark.django_db
+def test_keyset_invalid_cursor(api_client: APIClient) -> None:
+
+    resp: Response = api_client.get(f"{STUDENT_LIST_URL}?pagination=keyset&cursor=x")
+
+    assert 404 == resp.status_code
+
+
+@pytest.mark.django_db
+def test_keyset_deep_page_query_count(
+    api_client: APIClient, django_assert_num_queries: Callable
+) -> None:
+
+    url: str = f"{STUDENT_LIST_URL}?pagination=keyset&limit=5"
+    for _ in range(10):
+        url = api_client.get(url).json()["next"]
+
+    with django_assert_num_queries(1):
+        resp: Response = api_client.get(url)
+
+    assert 200 == resp.status_code
+
+
+@pytest.mark.django_db
+def test_unknown_pagination_mode_uses_default(api_client: APIClient) -> None:
+
+    resp: Response = api_client.get(f"{STUDENT_LIST_URL}?pagination=unknown")
+
+    assert 200 == resp.status_code
+    assert "count" in resp.json()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("mode", ["exact", "estimate", "cached"])
+def test_count_modes_report_total(api_client: APIClient, mode: str) -> None:
+
+    resp: Response = api_client.get(f"{STUDENT_LIST_URL}?count={mode}&offset=5")
+
+    assert 200 == resp.status_code
+    assert Student.objects.filter(is_active=True).count() == resp.json()["count"]
+    assert resp.json()["next"] is not None
+
+
+@pytest.mark.django_db
+def test_estimated_count_above_threshold(
+    api_client: APIClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+
+    monkeypatch.setattr("utils.pagination.COUNT_ESTIMATE_THRESHOLD", 0)
+    with CaptureQueriesContext(connection) as queries:
+        resp: Response = api_client.get(f"{STUDENT_LIST_URL}?count=estimate")
+
+    assert 0 < resp.json()["count"]
+    assert not [query for query in queries if "COUNT(*)" in query["sql"]]
+
+
+@pytest.mark.django_db
+def test_estimated_count_of_last_page_is_exact(
+    api_client: APIClient, django_assert_num_queries: Callable
+) -> None:
+
+    total: int = Student.objects.filter(is_active=True).count()
+    with django_assert_num_queries(1):
+        resp: Response = api_client.get(
+            f"{STUDENT_LIST_URL}?count=estimate&offset={total - 2}"
+        )
+
+    assert total == resp.json()["count"]
+    assert resp.json()["next"] is None
+
+
+@pytest.mark.django_db
+def test_cached_count_is_shared_by_pages(
+    api_client: APIClient, django_assert_num_queries: Callable
+) -> None:
+
+    api_client.get(f"{STUDENT_LIST_URL}?count=cached")
+    with django_assert_num_queries(1):
+        resp: Response = api_client.get(f"{STUDENT_LIST_URL}?count=cached&offset=5")
+
+    assert Student.objects.filter(is_active=True).count() == resp.json()["count"]
+
+
+@pytest.mark.django_db
+def test_cached_count_follows_writes(api_client: APIClient) -> None:
+
+    first: Response = api_client.get(f"{STUDENT_LIST_URL}?count=cached")
+    Student.objects.create(
+        title="MR", first_name="New", last_name="Row", age=12, gender="MALE"
+    )
+    second: Response = api_client.get(f"{STUDENT_LIST_URL}?count=cached&limit=6")
+
+    assert first.json()["count"] + 1 == second.json()["count"]
+
+
+@pytest.mark.django_db
+def test_no_count_pages_by_next_link(
+    api_client: APIClient, django_assert_num_queries: Callable
+) -> None:
+
+    with django_assert_num_queries(1):
+        resp: Response = api_client.get(f"{SCHOOL_LIST_URL}?count=none")
+    ids: List[int] = walk_pages(api_client, f"{SCHOOL_LIST_URL}?count=none&limit=3")
+
+    assert "count" not in resp.json()
+    assert (
+        list(
+            School.objects.filter(is_active=True)
+            .order_by("-created_at", "-id")
+            .values_list("id", flat=True)
+        )
+        == ids
+    )
+
+
+@pytest.mark.django_db
+def test_unknown_count_mode(api_client: APIClient) -> None:
+
+    resp: Response = api_client.get(f"{STUDENT_LIST_URL}?count=some")
+
+    assert 400 == resp.status_code
+    assert {"count": ["Expected one of exact, estimate, cached, none."]} == resp.json()
@@ -0,0 +1,64 @@
+from typing import Set, Type
+
+import pytest
+from django.urls import reverse
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from core.views import SchoolViewSet, StudentNestedViewSet, StudentViewSet
+from tests.conftest import SCHOOL_STUDENT_LIST_URL, STUDENT_LIST_URL
+from utils.views import BaseModel
+
+
+@pytest.mark.parametrize(
+    "viewset",
+    [SchoolViewSet, StudentViewSet, StudentNestedViewSet],
+    ids=["schools", "students", "school-students"],
+)
+def test_query_budgets_name_actions(viewset: Type[BaseModel]) -> None:
+
+    actions: Set[str] = {
+        "list",
+        "retrieve",
+        "create",
+        "update",
+        "partial_update",
+        "destroy",
+    }
+    for extra_action in viewset.get_extra_actions():
+        actions.update(extra_action.mapping.values())
+
+    assert viewset.query_budgets
+    assert set(viewset.query_budgets) <= actions
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url",
+    [STUDENT_LIST_URL, reverse(SCHOOL_STUDENT_LIST_URL, args=[1])],
+    ids=["students", "school-students"],
+)
+def test_list_budget_holds_for_any_page_size(api_client: APIClient, url: str) -> None:
+
+    for limit in (1, 10, 100, 1000):
+        resp: Response = api_client.get(f"{url}?limit={limit}")
+
+        assert 200 == resp.status_code
+
+
+@pytest.mark.django_db
+def test_exceeding_query_budget_reports_queries(
+    api_client: APIClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+
+    monkeypatch.setattr(StudentViewSet, "query_budgets", {"list": 1})
+
+    with pytest.raises(pytest.fail.Exception) as failure:
+        api_client.get(STUDENT_LIST_URL)
+
+    message: str = str(failure.value)
+    assert message.startswith("StudentViewSet.list ran 2 queries, its budget is 1:")
+    assert "1. SELECT COUNT(*)" in message
+    assert '2. SELECT "student"."id"' in message
+    assert "tests/test_query_budgets.py" in message
+    assert "utils/cache.py" in message
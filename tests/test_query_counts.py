@@ -0,0 +1,131 @@
+from typing import Callable, Dict
+
+import pytest
+from django.urls import reverse
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from tests.conftest import (
+    SCHOOL_DETAIL_URL,
+    SCHOOL_LIST_URL,
+    SCHOOL_STUDENT_DETAIL_URL,
+    SCHOOL_STUDENT_LIST_URL,
+    STUDENT_DETAIL_URL,
+    STUDENT_LIST_URL,
+)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url,limit,queries",
+    [
+        (SCHOOL_LIST_URL, 1, 2),
+        (SCHOOL_LIST_URL, 10, 2),
+        (STUDENT_LIST_URL, 1, 2),
+        (STUDENT_LIST_URL, 100, 2),
+        (reverse(SCHOOL_STUDENT_LIST_URL, args=[1]), 1, 2),
+        (reverse(SCHOOL_STUDENT_LIST_URL, args=[1]), 100, 2),
+    ],
+    ids=[
+        "school-list-1",
+        "school-list-10",
+        "student-list-1",
+        "student-list-100",
+        "school-student-list-1",
+        "school-student-list-100",
+    ],
+)
+def test_list_query_count_is_constant(
+    api_client: APIClient,
+    django_assert_num_queries: Callable,
+    url: str,
+    limit: int,
+    queries: int,
+) -> None:
+
+    with django_assert_num_queries(queries):
+        resp: Response = api_client.get(f"{url}?limit={limit}")
+
+    assert 200 == resp.status_code
+    assert all(
+        "school_details" not in row or row["school_details"]
+        for row in resp.json()["results"]
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url,queries",
+    [
+        (reverse(SCHOOL_DETAIL_URL, args=[1]), 1),
+        (reverse(STUDENT_DETAIL_URL, args=[1]), 1),
+        (reverse(SCHOOL_STUDENT_DETAIL_URL, args=[1, 1]), 1),
+    ],
+    ids=["school-retrieve", "student-retrieve", "school-student-retrieve"],
+)
+def test_retrieve_query_count(
+    api_client: APIClient, django_assert_num_queries: Callable, url: str, queries: int
+) -> None:
+
+    with django_assert_num_queries(queries):
+        resp: Response = api_client.get(url)
+
+    assert 200 == resp.status_code
+
+
+# Write counts include the SAVEPOINT/RELEASE pair of the atomic block.
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "method,url,payload,queries",
+    [
+        (
+            "post",
+            STUDENT_LIST_URL,
+            {
+                "school": None,
+                "title": "MR",
+                "first_name": "John",
+                "last_name": "John",
+                "age": 10,
+                "gender": "MALE",
+            },
+            7,
+        ),
+        (
+            "patch",
+            reverse(STUDENT_DETAIL_URL, args=[1]),
+            {"school": None},
+            10,
+        ),
+        (
+            "patch",
+            reverse(SCHOOL_STUDENT_DETAIL_URL, args=[1, 1]),
+            {"first_name": "John"},
+            6,
+        ),
+        ("delete", reverse(STUDENT_DETAIL_URL, args=[1]), {}, 8),
+    ],
+    ids=[
+        "student-create",
+        "student-partial-update",
+        "school-student-partial-update",
+        "student-destroy",
+    ],
+)
+def test_write_query_count(
+    api_client: APIClient,
+    django_assert_num_queries: Callable,
+    method: str,
+    url: str,
+    payload: Dict,
+    queries: int,
+    get_id_for_empty_school: int,
+) -> None:
+
+    if "school" in payload:
+        payload["school"] = get_id_for_empty_school
+
+    with django_assert_num_queries(queries):
+        resp: Response = getattr(api_client, method)(url, data=payload)
+
+    assert resp.status_code in (200, 201, 204)
@@ -0,0 +1,189 @@
+from typing import Callable, Dict, Iterator, List
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from pytest import fixture
+from pytest_django.fixtures import SettingsWrapper
+from pytest_django.plugin import _DatabaseBlocker
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from core.models import School, Student
+from tests.conftest import (
+    SCHOOL_AUTOCOMPLETE_URL,
+    SCHOOL_LIST_URL,
+    SCHOOL_STUDENT_LIST_URL,
+    STUDENT_LIST_URL,
+    seeded_dataset,
+)
+
+STUDENTS: int = 20_000
+STUDENTS_PER_SCHOOL: int = 10
+
+
+@fixture(scope="module")
+def large_dataset(
+    django_db_setup: None, django_db_blocker: _DatabaseBlocker
+) -> Iterator[Dict]:
+    with seeded_dataset(django_db_blocker, STUDENTS, STUDENTS_PER_SCHOOL):
+        school: School = School.objects.latest("id")
+        student: Student = Student.objects.filter(school=school).latest("id")
+        yield {
+            "school_id": school.id,
+            "name": school.name,
+            "location": school.location,
+            "first_name": student.first_name,
+            "last_name": student.last_name,
+        }
+
+
+def explain(sql: str) -> str:
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN {sql}")
+        return "\n".join(row[0] for row in cursor.fetchall())
+
+
+# Only the listed table is large, joining the other one may scan it. Counting every
+# active row reads the whole table whatever the indexes, so the count query is only
+# checked for filtered lists.
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "get_url,table,check_count",
+    [
+        (lambda data: SCHOOL_LIST_URL, "school", False),
+        (lambda data: f"{SCHOOL_LIST_URL}?name={data['name']}", "school", True),
+        (lambda data: f"{SCHOOL_LIST_URL}?location={data['location']}", "school", True),
+        (lambda data: f"{SCHOOL_LIST_URL}?pagination=keyset", "school", True),
+        (lambda data: f"{SCHOOL_LIST_URL}?has_capacity=true", "school", False),
+        (lambda data: f"{SCHOOL_LIST_URL}?min_seats=10", "school", True),
+        (lambda data: STUDENT_LIST_URL, "student", False),
+        (
+            lambda data: f"{STUDENT_LIST_URL}?first_name={data['first_name']}",
+            "student",
+            True,
+        ),
+        (
+            lambda data: f"{STUDENT_LIST_URL}?last_name={data['last_name']}",
+            "student",
+            True,
+        ),
+        (lambda data: f"{STUDENT_LIST_URL}?school={data['name']}", "student", True),
+        (lambda data: f"{STUDENT_LIST_URL}?pagination=keyset", "student", True),
+        (
+            lambda data: f"{STUDENT_LIST_URL}?search={data['first_name'][:3]}",
+            "student",
+            True,
+        ),
+        (
+            lambda data: (
+                f"{STUDENT_LIST_URL}?search={data['first_name']} "
+                f"{data['last_name'][:2]}"
+            ),
+            "student",
+            True,
+        ),
+        (
+            lambda data: reverse(SCHOOL_STUDENT_LIST_URL, args=[data["school_id"]]),
+            "student",
+            True,
+        ),
+        (
+            lambda data: (
+                reverse(SCHOOL_STUDENT_LIST_URL, args=[data["school_id"]])
+                + f"?first_name={data['first_name']}"
+            ),
+            "student",
+            True,
+        ),
+    ],
+    ids=[
+        "schools",
+        "schools-by-name",
+        "schools-by-location",
+        "schools-keyset",
+        "schools-with-capacity",
+        "schools-by-min-seats",
+        "students",
+        "students-by-first-name",
+        "students-by-last-name",
+        "students-by-school",
+        "students-keyset",
+        "students-search-prefix",
+        "students-search-words",
+        "school-students",
+        "school-students-by-first-name",
+    ],
+)
+def test_list_queries_avoid_sequential_scans(
+    api_client: APIClient,
+    large_dataset: Dict,
+    get_url: Callable,
+    table: str,
+    check_count: bool,
+) -> None:
+
+    with CaptureQueriesContext(connection) as queries:
+        resp: Response = api_client.get(get_url(large_dataset))
+    plans: List[str] = [
+        explain(query["sql"])
+        for query in queries
+        if check_count or not query["sql"].startswith("SELECT COUNT(*)")
+    ]
+
+    scans: List[str] = [plan for plan in plans if f"Seq Scan on {table} " in plan]
+
+    assert 200 == resp.status_code
+    assert plans
+    assert not scans, "\n\n".join(scans)
+
+
+def get_scans(plan: Dict, table: str) -> Iterator[Dict]:
+    if plan.get("Relation Name") == table:
+        yield plan
+    for child in plan.get("Plans", []):
+        yield from get_scans(child, table)
+
+
+@pytest.mark.django_db
+def test_school_students_read_only_their_school_rows(
+    api_client: APIClient, large_dataset: Dict
+) -> None:
+
+    url: str = reverse(SCHOOL_STUDENT_LIST_URL, args=[large_dataset["school_id"]])
+    with CaptureQueriesContext(connection) as queries:
+        resp: Response = api_client.get(url, {"limit": STUDENTS_PER_SCHOOL})
+    scans: List[Dict] = []
+    with connection.cursor() as cursor:
+        for query in queries:
+            cursor.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {query['sql']}")
+            scans += get_scans(cursor.fetchone()[0][0]["Plan"], "student")
+
+    assert STUDENTS_PER_SCHOOL == resp.json()["count"]
+    assert 2 == len(scans)
+    for scan in scans:
+        assert "school_id" in scan["Index Cond"]
+        assert STUDENTS_PER_SCHOOL >= scan["Actual Rows"]
+        assert 0 == scan.get("Rows Removed by Filter", 0)
+
+
+@pytest.mark.django_db
+def test_autocomplete_query_avoids_sequential_scans(
+    api_client: APIClient, large_dataset: Dict, settings: SettingsWrapper
+) -> None:
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            pytest.skip("needs the pg_trgm extension")
+
+    settings.AUTOCOMPLETE_INDEX = False
+    term: str = large_dataset["name"].split()[-1]
+    with CaptureQueriesContext(connection) as queries:
+        resp: Response = api_client.get(SCHOOL_AUTOCOMPLETE_URL, {"q": term})
+    plans: List[str] = [explain(query["sql"]) for query in queries]
+
+    assert large_dataset["name"] in [row["name"] for row in resp.json()["results"]]
+    assert 1 == len(plans)
+    assert "Seq Scan on school " not in plans[0], plans[0]
@@ -0,0 +1,168 @@
+from pathlib import Path
+from typing import Callable, Dict
+
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from core.models import School
+from tests.conftest import (
+    SCHOOL_DEACTIVATE_URL,
+    SCHOOL_DETAIL_URL,
+    SCHOOL_LIST_URL,
+    STUDENT_DETAIL_URL,
+    STUDENT_LIST_URL,
+)
+from utils.cache import response_cache_stats
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url",
+    [
+        SCHOOL_LIST_URL,
+        STUDENT_LIST_URL,
+        reverse(SCHOOL_DETAIL_URL, args=[1]),
+        reverse(STUDENT_DETAIL_URL, args=[1]),
+    ],
+    ids=["school-list", "student-list", "school-detail", "student-detail"],
+)
+def test_second_request_is_served_from_cache(
+    api_client: APIClient, django_assert_num_queries: Callable, url: str
+) -> None:
+
+    first: Response = api_client.get(url)
+    with django_assert_num_queries(0):
+        second: Response = api_client.get(url)
+
+    assert "MISS" == first["X-Cache"]
+    assert "HIT" == second["X-Cache"]
+    assert first.json() == second.json()
+
+
+@pytest.mark.django_db
+def test_query_param_order_shares_cache_entry(api_client: APIClient) -> None:
+
+    api_client.get(f"{STUDENT_LIST_URL}?limit=5&offset=5")
+    resp: Response = api_client.get(f"{STUDENT_LIST_URL}?offset=5&limit=5")
+
+    assert "HIT" == resp["X-Cache"]
+
+
+@pytest.mark.django_db
+def test_different_query_params_are_cached_apart(api_client: APIClient) -> None:
+
+    api_client.get(f"{STUDENT_LIST_URL}?limit=5")
+    resp: Response = api_client.get(f"{STUDENT_LIST_URL}?limit=6")
+
+    assert "MISS" == resp["X-Cache"]
+    assert 6 == len(resp.json()["results"])
+
+
+@pytest.mark.django_db
+def test_not_found_is_not_cached(api_client: APIClient) -> None:
+
+    url: str = reverse(SCHOOL_DETAIL_URL, args=[100000])
+    before: Dict[str, int] = response_cache_stats()
+    api_client.get(url)
+    resp: Response = api_client.get(url)
+
+    assert 404 == resp.status_code
+    assert 2 == response_cache_stats()["misses"] - before["misses"]
+
+
+@pytest.mark.django_db
+def test_update_school_invalidates_cached_responses(api_client: APIClient) -> None:
+
+    url: str = reverse(SCHOOL_DETAIL_URL, args=[1])
+    api_client.get(url)
+    api_client.get(STUDENT_LIST_URL)
+    api_client.patch(url, data={"name": "School Renamed"})
+
+    resp: Response = api_client.get(url)
+
+    assert "MISS" == resp["X-Cache"]
+    assert "School Renamed" == resp.json()["name"]
+    assert "MISS" == api_client.get(STUDENT_LIST_URL)["X-Cache"]
+
+
+@pytest.mark.django_db
+def test_create_student_invalidates_school_count(
+    api_client: APIClient, get_id_for_empty_school: int
+) -> None:
+
+    url: str = reverse(SCHOOL_DETAIL_URL, args=[get_id_for_empty_school])
+    api_client.get(url)
+    api_client.post(
+        STUDENT_LIST_URL,
+        data={
+            "title": "MR",
+            "first_name": "John",
+            "last_name": "John",
+            "age": 12,
+            "gender": "MALE",
+            "school": get_id_for_empty_school,
+        },
+    )
+
+    resp: Response = api_client.get(url)
+
+    assert "MISS" == resp["X-Cache"]
+    assert 1 == resp.json()["enrolled_count"]
+
+
+@pytest.mark.django_db
+def test_bulk_deactivate_invalidates_cached_responses(api_client: APIClient) -> None:
+
+    api_client.get(SCHOOL_LIST_URL)
+    api_client.post(SCHOOL_DEACTIVATE_URL, data={"ids": [1]}, format="json")
+
+    resp: Response = api_client.get(SCHOOL_LIST_URL)
+
+    assert "MISS" == resp["X-Cache"]
+    assert 9 == resp.json()["count"]
+
+
+@pytest.mark.django_db
+def test_queryset_update_is_not_seen_until_invalidated(api_client: APIClient) -> None:
+
+    url: str = reverse(SCHOOL_DETAIL_URL, args=[1])
+    api_client.get(url)
+    School.objects.filter(pk=1).update(name="School Renamed")
+
+    assert "School Renamed" != api_client.get(url).json()["name"]
+
+    School.objects.get(pk=1).save()
+
+    assert "School Renamed" == api_client.get(url).json()["name"]
+
+
+@pytest.mark.django_db
+def test_cache_stats_count_hits_and_misses(api_client: APIClient) -> None:
+
+    before: Dict[str, int] = response_cache_stats()
+    for _ in range(3):
+        api_client.get(SCHOOL_LIST_URL)
+    after: Dict[str, int] = response_cache_stats()
+
+    assert 1 == after["misses"] - before["misses"]
+    assert 2 == after["hits"] - before["hits"]
+
+
+@pytest.mark.django_db
+def test_shared_backend_serves_cached_responses(
+    api_client: APIClient, tmp_path: Path
+) -> None:
+
+    shared: Dict = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": str(tmp_path),
+    }
+    with override_settings(CACHES={"default": shared}):
+        api_client.get(SCHOOL_LIST_URL)
+        resp: Response = api_client.get(SCHOOL_LIST_URL)
+
+    assert "HIT" == resp["X-Cache"]
+    assert any(tmp_path.iterdir())
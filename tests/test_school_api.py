@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Callable, Dict, List, Set
 
 import pytest
 from django.urls import reverse
@@ -6,6 +6,7 @@ from pytest_lazyfixture import lazy_fixture
 from rest_framework.response import Response
 from rest_framework.test import APIClient
 
+from core.models import School
 from tests.conftest import SCHOOL_DETAIL_URL, SCHOOL_LIST_URL
 
 
@@ -42,6 +43,73 @@ def test_school_list_with_filter(
     assert search_term == resp.json()["results"][0][param_name]
 
 
+def seats_by_school(resp: Response) -> Dict[int, int]:
+    return {row["id"]: row["seats_available"] for row in resp.json()["results"]}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "query,has_seats",
+    [
+        ("has_capacity=true", lambda seats: seats > 0),
+        ("has_capacity=false", lambda seats: seats <= 0),
+        ("min_seats=5", lambda seats: seats >= 5),
+        ("min_seats=0", lambda seats: True),
+    ],
+    ids=["has-capacity", "no-capacity", "min-seats", "min-seats-zero"],
+)
+def test_school_list_capacity_filters(
+    api_client: APIClient,
+    get_id_for_full_school: int,
+    query: str,
+    has_seats: Callable[[int], bool],
+) -> None:
+
+    expected: Set[int] = {
+        school.id
+        for school in School.objects.filter(is_active=True)
+        if has_seats(school.student_max_number - school.enrolled_count)
+    }
+    resp: Response = api_client.get(f"{SCHOOL_LIST_URL}?{query}&limit=1000")
+    seats: Dict[int, int] = seats_by_school(resp)
+
+    assert 200 == resp.status_code
+    assert expected == set(seats)
+    assert all(has_seats(value) for value in seats.values())
+
+
+@pytest.mark.django_db
+def test_seats_available_is_never_negative(
+    api_client: APIClient, get_id_for_full_school: int
+) -> None:
+
+    School.objects.filter(pk=get_id_for_full_school).update(student_max_number=0)
+    resp: Response = api_client.get(
+        reverse(SCHOOL_DETAIL_URL, args=[get_id_for_full_school])
+    )
+    listed: List[Dict] = api_client.get(
+        f"{SCHOOL_LIST_URL}?has_capacity=false&limit=1000"
+    ).json()["results"]
+
+    assert 0 == resp.json()["seats_available"]
+    assert get_id_for_full_school in [row["id"] for row in listed]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "query",
+    ["min_seats=-1", "min_seats=many"],
+    ids=["negative", "text"],
+)
+def test_school_list_capacity_filters_unsuccessful(
+    api_client: APIClient, query: str
+) -> None:
+
+    resp: Response = api_client.get(f"{SCHOOL_LIST_URL}?{query}")
+
+    assert 400 == resp.status_code
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize(
     "school_id",
@@ -0,0 +1,219 @@
+from io import StringIO
+from typing import Callable, Dict, List
+
+import pytest
+from _pytest.fixtures import SubRequest
+from django.core.management import call_command
+from django.urls import reverse
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from core.models import School, school_autocomplete
+from tests.conftest import (
+    SCHOOL_AUTOCOMPLETE_URL,
+    SCHOOL_DEACTIVATE_URL,
+    SCHOOL_DETAIL_URL,
+    SCHOOL_LIST_URL,
+)
+from utils.cache import get_response_cache
+
+
+@pytest.fixture()
+def get_autocomplete_schools() -> List[School]:
+    return [
+        School.objects.create(name=name, code="A0001", location=location)
+        for name, location in [
+            ("Qxa Academy", "Lisbon"),
+            ("Qxb College", "Qxville"),
+            ("Upper Qxc", "Porto"),
+        ]
+    ]
+
+
+@pytest.fixture(params=[True, False], ids=["index", "database"])
+def autocomplete_index(request: SubRequest, settings: SettingsWrapper) -> bool:
+    settings.AUTOCOMPLETE_INDEX = request.param
+    return bool(request.param)
+
+
+@pytest.fixture()
+def in_memory_index(settings: SettingsWrapper) -> None:
+    settings.AUTOCOMPLETE_INDEX = True
+
+
+def autocomplete(api_client: APIClient, term: str, **params: object) -> List[str]:
+    query: Dict[str, object] = {"q": term, **params}
+    resp: Response = api_client.get(SCHOOL_AUTOCOMPLETE_URL, query)
+    assert 200 == resp.status_code
+    return [row["name"] for row in resp.json()["results"]]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "term,names",
+    [
+        ("qx", ["Qxa Academy", "Qxb College", "Upper Qxc"]),
+        ("QXA", ["Qxa Academy"]),
+        ("qxa aca", ["Qxa Academy"]),
+        ("qxv", ["Qxb College"]),
+        ("xa", []),
+        (" ", []),
+    ],
+    ids=["prefix", "case-insensitive", "words", "location", "no-infix", "blank"],
+)
+def test_autocomplete_schools(
+    api_client: APIClient,
+    autocomplete_index: bool,
+    get_autocomplete_schools: List[School],
+    term: str,
+    names: List[str],
+) -> None:
+
+    assert names == autocomplete(api_client, term)
+
+
+@pytest.mark.django_db
+def test_autocomplete_returns_top_matches(
+    api_client: APIClient,
+    autocomplete_index: bool,
+    get_autocomplete_schools: List[School],
+) -> None:
+
+    resp: Response = api_client.get(SCHOOL_AUTOCOMPLETE_URL, {"q": "qx", "limit": 2})
+
+    assert [
+        {"id": school.id, "name": school.name, "location": school.location}
+        for school in get_autocomplete_schools[:2]
+    ] == resp.json()["results"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("limit", ["0", "-1", "ten"], ids=["zero", "negative", "text"])
+def test_autocomplete_rejects_invalid_limit(api_client: APIClient, limit: str) -> None:
+
+    resp: Response = api_client.get(SCHOOL_AUTOCOMPLETE_URL, {"q": "a", "limit": limit})
+
+    assert 400 == resp.status_code
+    assert {"limit": ["Expected a positive integer."]} == resp.json()
+
+
+@pytest.mark.django_db
+def test_autocomplete_is_served_from_memory(
+    api_client: APIClient,
+    in_memory_index: None,
+    get_autocomplete_schools: List[School],
+    django_assert_num_queries: Callable,
+) -> None:
+
+    autocomplete(api_client, "qx")
+    with django_assert_num_queries(0):
+        names: List[str] = autocomplete(api_client, "upper")
+
+    assert ["Upper Qxc"] == names
+
+
+@pytest.mark.django_db
+def test_autocomplete_follows_saved_schools(
+    api_client: APIClient,
+    in_memory_index: None,
+    get_autocomplete_schools: List[School],
+    django_assert_num_queries: Callable,
+    django_capture_on_commit_callbacks: Callable,
+) -> None:
+
+    school: School = get_autocomplete_schools[0]
+    autocomplete(api_client, "qx")
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.post(
+            SCHOOL_LIST_URL,
+            data={"name": "Qxd School", "code": "A0002", "location": "Faro"},
+        )
+        api_client.patch(
+            reverse(SCHOOL_DETAIL_URL, args=[school.id]), data={"name": "Zqx Academy"}
+        )
+
+    with django_assert_num_queries(0):
+        names: List[str] = autocomplete(api_client, "qx")
+
+    assert ["Qxb College", "Upper Qxc", "Qxd School"] == names
+
+
+@pytest.mark.django_db
+def test_autocomplete_drops_deactivated_schools(
+    api_client: APIClient,
+    autocomplete_index: bool,
+    get_autocomplete_schools: List[School],
+    django_capture_on_commit_callbacks: Callable,
+) -> None:
+
+    autocomplete(api_client, "qx")
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.delete(
+            reverse(SCHOOL_DETAIL_URL, args=[get_autocomplete_schools[2].id])
+        )
+        api_client.post(
+            SCHOOL_DEACTIVATE_URL,
+            data={"ids": [get_autocomplete_schools[1].id]},
+            format="json",
+        )
+
+    assert ["Qxa Academy"] == autocomplete(api_client, "qx")
+
+
+@pytest.mark.django_db
+def test_autocomplete_reloads_after_other_process_writes(
+    api_client: APIClient, in_memory_index: None, get_autocomplete_schools: List[School]
+) -> None:
+
+    autocomplete(api_client, "qx")
+    # Written without signals, as another process would look from here.
+    School.objects.filter(name="Qxa Academy").update(name="Qxe Academy")
+    school_autocomplete.invalidate()
+
+    assert "Qxe Academy" in autocomplete(api_client, "qxe")
+
+
+@pytest.mark.django_db
+def test_autocomplete_without_index_reads_other_process_writes(
+    api_client: APIClient,
+    get_autocomplete_schools: List[School],
+    settings: SettingsWrapper,
+) -> None:
+
+    settings.AUTOCOMPLETE_INDEX = False
+    autocomplete(api_client, "qx")
+    # Nothing tells a per-process cache about writes of other processes.
+    School.objects.filter(name="Qxa Academy").update(name="Qxe Academy")
+
+    assert ["Qxe Academy"] == autocomplete(api_client, "qxe")
+
+
+@pytest.mark.django_db
+def test_autocomplete_finds_created_data(
+    api_client: APIClient, in_memory_index: None
+) -> None:
+
+    autocomplete(api_client, "qx")
+    call_command("createdata", schools=1, students_per_school=0, stdout=StringIO())
+    school: School = School.objects.latest("id")
+
+    assert school.name in autocomplete(api_client, school.name)
+
+
+@pytest.mark.django_db
+def test_autocomplete_without_index_leaves_cache_alone(
+    api_client: APIClient,
+    settings: SettingsWrapper,
+    django_capture_on_commit_callbacks: Callable,
+) -> None:
+
+    settings.AUTOCOMPLETE_INDEX = False
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.post(
+            SCHOOL_LIST_URL,
+            data={"name": "Qxd School", "code": "A0002", "location": "Faro"},
+        )
+        school_autocomplete.invalidate()
+
+    assert get_response_cache().get(school_autocomplete.generation_key) is None
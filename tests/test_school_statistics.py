@@ -0,0 +1,322 @@
+import io
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from django.core.management import call_command
+from django.db.models import Count, F, Q, Sum
+from django.urls import reverse
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from core.models import GendorChoice, School, SchoolStatistics, Student, TitleChoice
+from core.views import StudentViewSet
+from tests.conftest import (
+    SCHOOL_DEACTIVATE_URL,
+    SCHOOL_DETAIL_STATS_URL,
+    SCHOOL_DETAIL_URL,
+    SCHOOL_STATS_URL,
+    SCHOOL_STUDENT_LIST_URL,
+    STUDENT_BULK_URL,
+    STUDENT_DEACTIVATE_URL,
+    STUDENT_DETAIL_URL,
+    STUDENT_LIST_URL,
+)
+
+STUDENT_PAYLOAD: Dict = {
+    "title": "MRS",
+    "first_name": "Anna",
+    "last_name": "Jones",
+    "age": 14,
+    "gender": "FEMALE",
+}
+
+
+def counted_statistics() -> Dict[int, Dict[str, int]]:
+    # The figures aggregated from the students, what the table must always hold.
+    counters: Dict = {
+        "students": Count("id"),
+        "age_total": Sum("age"),
+        **{
+            f"gender_{choice.lower()}": Count("id", filter=Q(gender=choice))
+            for choice in GendorChoice.values
+        },
+        **{
+            f"title_{choice.lower()}": Count("id", filter=Q(title=choice))
+            for choice in TitleChoice.values
+        },
+    }
+    return {
+        row.pop("school_id"): row
+        for row in Student.objects.filter(is_active=True, school__isnull=False)
+        .order_by()
+        .values("school_id")
+        .annotate(**counters)
+    }
+
+
+def stored_statistics() -> Dict[int, Dict[str, int]]:
+    # Rows of schools whose students all left stay behind with zero counters.
+    return {
+        row.pop("school_id"): row
+        for row in SchoolStatistics.objects.filter(school__enrolled_count__gt=0).values(
+            "school_id",
+            *SchoolStatistics.COUNTERS,
+            students=F("school__enrolled_count"),
+        )
+    }
+
+
+@pytest.mark.django_db
+def test_seeded_statistics_match_students() -> None:
+
+    assert counted_statistics() == stored_statistics()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "write",
+    [
+        lambda client, school: client.post(
+            STUDENT_LIST_URL, data={**STUDENT_PAYLOAD, "school": school}
+        ),
+        lambda client, school: client.post(
+            reverse(SCHOOL_STUDENT_LIST_URL, args=[school]), data=STUDENT_PAYLOAD
+        ),
+        lambda client, school: client.patch(
+            reverse(STUDENT_DETAIL_URL, args=[1]), data={"school": school}
+        ),
+        lambda client, school: client.patch(
+            reverse(STUDENT_DETAIL_URL, args=[1]),
+            data={"age": 19, "gender": "FEMALE", "title": "MISS"},
+        ),
+        lambda client, school: client.delete(reverse(STUDENT_DETAIL_URL, args=[1])),
+        lambda client, school: client.post(
+            STUDENT_BULK_URL,
+            data=[{**STUDENT_PAYLOAD, "school": school}] * 3,
+            format="json",
+        ),
+        lambda client, school: client.patch(
+            STUDENT_BULK_URL,
+            data=[
+                {"id": 1, "school": school, "age": 11},
+                {"id": 2, "title": "MS"},
+            ],
+            format="json",
+        ),
+        lambda client, school: client.post(
+            STUDENT_DEACTIVATE_URL, data={"ids": [1, 2, 3]}, format="json"
+        ),
+        lambda client, school: client.post(
+            SCHOOL_DEACTIVATE_URL, data={"ids": [1, 2]}, format="json"
+        ),
+        lambda client, school: client.delete(reverse(SCHOOL_DETAIL_URL, args=[1])),
+    ],
+    ids=[
+        "create",
+        "nested-create",
+        "move",
+        "update",
+        "destroy",
+        "bulk-create",
+        "bulk-update",
+        "deactivate-students",
+        "deactivate-schools",
+        "destroy-school",
+    ],
+)
+def test_writes_keep_statistics_current(
+    api_client: APIClient, get_id_for_empty_school: int, write: Callable
+) -> None:
+
+    resp: Response = write(api_client, get_id_for_empty_school)
+
+    assert resp.status_code in (200, 201, 204)
+    assert counted_statistics() == stored_statistics()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "remove",
+    [
+        lambda client, student: client.delete(
+            reverse(STUDENT_DETAIL_URL, args=[student.pk])
+        ),
+        lambda client, student: client.post(
+            STUDENT_DEACTIVATE_URL, data={"ids": [student.pk]}, format="json"
+        ),
+    ],
+    ids=["destroy", "deactivate"],
+)
+def test_stale_destroy_releases_nothing(
+    remove: Callable, monkeypatch: MonkeyPatch
+) -> None:
+
+    student: Student = Student.objects.select_related("school").get(pk=1)
+    remove(APIClient(), student)
+    # The DELETE starts from the student loaded before the removal committed.
+    monkeypatch.setattr(StudentViewSet, "get_object", lambda view: student)
+
+    resp: Response = APIClient().delete(reverse(STUDENT_DETAIL_URL, args=[1]))
+
+    assert 404 == resp.status_code
+    assert (
+        student.school.enrolled_count - 1
+        == School.objects.get(pk=student.school_id).enrolled_count
+    )
+    assert counted_statistics() == stored_statistics()
+
+
+@pytest.mark.django_db
+def test_stale_destroy_releases_the_current_school(
+    get_id_for_empty_school: int, monkeypatch: MonkeyPatch
+) -> None:
+
+    student: Student = Student.objects.get(pk=1)
+    APIClient().patch(
+        reverse(STUDENT_DETAIL_URL, args=[1]), data={"school": get_id_for_empty_school}
+    )
+    monkeypatch.setattr(StudentViewSet, "get_object", lambda view: student)
+
+    resp: Response = APIClient().delete(reverse(STUDENT_DETAIL_URL, args=[1]))
+
+    assert 204 == resp.status_code
+    assert 0 == School.objects.get(pk=get_id_for_empty_school).enrolled_count
+    assert counted_statistics() == stored_statistics()
+
+
+@pytest.mark.django_db
+def test_import_keeps_statistics_current(
+    tmp_path: Path, get_id_for_empty_school: int
+) -> None:
+
+    path: Path = tmp_path / "students.csv"
+    path.write_text(
+        "school,title,first_name,last_name,age,gender\n"
+        f"{get_id_for_empty_school},MR,John,Smith,12,MALE\n"
+        f"{get_id_for_empty_school},MS,Anna,Jones,14,FEMALE\n"
+        "1,MR,Too,Young,5,MALE\n"
+    )
+    call_command("importstudents", str(path), stdout=io.StringIO())
+
+    assert counted_statistics() == stored_statistics()
+
+
+@pytest.mark.django_db
+def test_recountstudents_rebuilds_statistics() -> None:
+
+    School.objects.filter(pk=1).update(enrolled_count=0)
+    SchoolStatistics.objects.filter(school_id=1).update(age_total=0)
+    SchoolStatistics.objects.filter(school_id=2).delete()
+    Student.objects.filter(pk=1).update(age=20)
+
+    call_command("recountstudents", stdout=io.StringIO())
+
+    assert counted_statistics() == stored_statistics()
+
+
+@pytest.mark.django_db
+def test_school_statistics(api_client: APIClient, get_id_for_empty_school: int) -> None:
+
+    url: str = reverse(SCHOOL_STUDENT_LIST_URL, args=[get_id_for_empty_school])
+    api_client.post(url, data=STUDENT_PAYLOAD)
+    api_client.post(url, data={**STUDENT_PAYLOAD, "title": "MR", "gender": "MALE"})
+    api_client.post(url, data={**STUDENT_PAYLOAD, "age": 15})
+
+    resp: Response = api_client.get(
+        reverse(SCHOOL_DETAIL_STATS_URL, args=[get_id_for_empty_school])
+    )
+    data: Dict = resp.json()
+
+    assert 200 == resp.status_code
+    assert {
+        "id": get_id_for_empty_school,
+        "name": "School Britain",
+        "student_max_number": 10,
+        "students": 3,
+        "seats_remaining": 7,
+        "average_age": 14.33,
+        "genders": {"MALE": 1, "FEMALE": 2},
+        "titles": {"MR": 1, "MRS": 2, "MISS": 0, "MS": 0},
+    } == {key: value for key, value in data.items() if key != "updated_at"}
+
+
+@pytest.mark.django_db
+def test_statistics_students_are_enrolled_count(
+    api_client: APIClient, get_id_for_empty_school: int
+) -> None:
+
+    # e.g. a seat taken by a raw UPDATE that no statistics delta went with.
+    School.objects.filter(pk=get_id_for_empty_school).update(enrolled_count=4)
+
+    resp: Response = api_client.get(
+        reverse(SCHOOL_DETAIL_STATS_URL, args=[get_id_for_empty_school])
+    )
+
+    assert 4 == resp.json()["students"]
+    assert 6 == resp.json()["seats_remaining"]
+
+
+@pytest.mark.django_db
+def test_school_without_students_statistics(
+    api_client: APIClient, get_id_for_empty_school: int
+) -> None:
+
+    resp: Response = api_client.get(
+        reverse(SCHOOL_DETAIL_STATS_URL, args=[get_id_for_empty_school])
+    )
+
+    assert 200 == resp.status_code
+    assert 0 == resp.json()["students"]
+    assert 10 == resp.json()["seats_remaining"]
+    assert resp.json()["average_age"] is None
+    assert resp.json()["updated_at"] is None
+
+
+@pytest.mark.django_db
+def test_inactive_school_statistics_not_found(api_client: APIClient) -> None:
+
+    School.objects.filter(pk=1).update(is_active=False)
+    resp: Response = api_client.get(reverse(SCHOOL_DETAIL_STATS_URL, args=[1]))
+
+    assert 404 == resp.status_code
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("limit", [1, 10], ids=["one-school", "ten-schools"])
+def test_list_statistics_reads_no_students(
+    api_client: APIClient, django_assert_num_queries: Callable, limit: int
+) -> None:
+
+    with django_assert_num_queries(2):
+        resp: Response = api_client.get(SCHOOL_STATS_URL, {"limit": limit})
+    rows: List[Dict] = resp.json()["results"]
+    counted: Dict[int, Dict[str, int]] = counted_statistics()
+
+    assert limit == len(rows)
+    for row in rows:
+        assert counted[row["id"]]["students"] == row["students"]
+
+
+@pytest.mark.django_db
+def test_statistics_follow_filters(
+    api_client: APIClient, get_school_name_data: str
+) -> None:
+
+    resp: Response = api_client.get(SCHOOL_STATS_URL, {"name": get_school_name_data})
+
+    assert [get_school_name_data] == [row["name"] for row in resp.json()["results"]]
+
+
+@pytest.mark.django_db
+def test_statistics_etag_changes_with_students(api_client: APIClient) -> None:
+
+    url: str = reverse(SCHOOL_DETAIL_STATS_URL, args=[1])
+    etag: str = api_client.get(url)["ETag"]
+    api_client.patch(reverse(STUDENT_DETAIL_URL, args=[1]), data={"age": 20})
+
+    resp: Response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert 200 == resp.status_code
+    assert etag != resp["ETag"]
@@ -1,12 +1,21 @@
-from typing import Dict, OrderedDict
+from typing import Dict, List, Optional, OrderedDict
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from pytest_lazyfixture import lazy_fixture
 from rest_framework.response import Response
 from rest_framework.test import APIClient
 
-from tests.conftest import SCHOOL_STUDENT_DETAIL_URL, SCHOOL_STUDENT_LIST_URL
+from core.models import School, Student
+from tests.conftest import (
+    SCHOOL_FULL_ERROR_MESSAGE,
+    SCHOOL_LIST_URL,
+    SCHOOL_STUDENT_DETAIL_URL,
+    SCHOOL_STUDENT_LIST_URL,
+    TEST_TRANSACTION_SQL,
+)
 
 
 @pytest.mark.django_db
@@ -496,3 +505,114 @@ def test_delete_school_student_by_id_not_exist(
 
     assert 404 == resp.status_code
     assert "Not Found" == resp.status_text
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("school_id", [1, 2], ids=["school-1", "school-2"])
+def test_school_student_list_is_scoped_to_school(
+    api_client: APIClient, school_id: int
+) -> None:
+
+    url: str = reverse(SCHOOL_STUDENT_LIST_URL, args=[school_id])
+    resp: Response = api_client.get(url, {"limit": 1000})
+
+    assert (
+        Student.objects.filter(school_id=school_id, is_active=True).count()
+        == resp.json()["count"]
+    )
+    assert {school_id} == {
+        row["school_details"]["id"] for row in resp.json()["results"]
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "method,payload",
+    [
+        ("get", None),
+        ("put", {"title": "MR", "first_name": "A", "last_name": "B", "age": 12}),
+        ("patch", {"age": 12}),
+        ("delete", None),
+    ],
+    ids=["retrieve", "update", "partial-update", "destroy"],
+)
+def test_school_student_of_another_school_not_found(
+    api_client: APIClient, method: str, payload: Optional[Dict]
+) -> None:
+
+    student: Student = Student.objects.filter(school_id=2, is_active=True).first()
+    url: str = reverse(SCHOOL_STUDENT_DETAIL_URL, args=[1, student.id])
+    resp: Response = getattr(api_client, method)(url, data=payload)
+
+    assert 404 == resp.status_code
+    assert Student.objects.filter(pk=student.pk, is_active=True, age=student.age)
+
+
+@pytest.mark.django_db
+def test_school_student_list_invalid_school_id(api_client: APIClient) -> None:
+
+    resp: Response = api_client.get(f"{SCHOOL_LIST_URL}abc/students/")
+
+    assert 404 == resp.status_code
+
+
+STUDENT_PAYLOAD: Dict = {
+    "title": "MR",
+    "first_name": "John",
+    "last_name": "Smith",
+    "age": 12,
+    "gender": "MALE",
+}
+
+
+@pytest.mark.django_db
+def test_create_school_student_admits_in_one_update(api_client: APIClient) -> None:
+
+    enrolled: int = School.objects.get(pk=1).enrolled_count
+    url: str = reverse(SCHOOL_STUDENT_LIST_URL, args=[1])
+    with CaptureQueriesContext(connection) as queries:
+        resp: Response = api_client.post(url, data=STUDENT_PAYLOAD)
+    statements: List[str] = [
+        " ".join(query["sql"].split()[:3])
+        for query in queries
+        if not query["sql"].startswith(TEST_TRANSACTION_SQL)
+    ]
+
+    assert 201 == resp.status_code
+    # The admission UPDATE runs in the statement logging the school change.
+    assert [
+        "WITH changed AS",
+        'INSERT INTO "student"',
+        "INSERT INTO school_statistics",
+        "WITH changed AS",
+    ] == statements
+    assert enrolled + 1 == resp.json()["school_details"]["enrolled_count"]
+    assert enrolled + 1 == School.objects.get(pk=1).enrolled_count
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("school_id", [999_999, 1], ids=["missing", "inactive"])
+def test_create_school_student_school_not_found(
+    api_client: APIClient, school_id: int
+) -> None:
+
+    School.objects.filter(pk=1).update(is_active=False)
+    students: int = Student.objects.count()
+    url: str = reverse(SCHOOL_STUDENT_LIST_URL, args=[school_id])
+    resp: Response = api_client.post(url, data=STUDENT_PAYLOAD)
+
+    assert 404 == resp.status_code
+    assert students == Student.objects.count()
+
+
+@pytest.mark.django_db
+def test_create_school_student_school_full(
+    api_client: APIClient, get_id_for_full_school: int
+) -> None:
+
+    url: str = reverse(SCHOOL_STUDENT_LIST_URL, args=[get_id_for_full_school])
+    resp: Response = api_client.post(url, data=STUDENT_PAYLOAD)
+
+    assert 400 == resp.status_code
+    assert [SCHOOL_FULL_ERROR_MESSAGE] == resp.json()
+    assert 1 == School.objects.get(pk=get_id_for_full_school).enrolled_count
@@ -0,0 +1,151 @@
+from typing import Callable, Dict, List
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from tests.conftest import (
+    SCHOOL_DETAIL_URL,
+    SCHOOL_LIST_URL,
+    SCHOOL_STUDENT_LIST_URL,
+    STUDENT_DETAIL_URL,
+    STUDENT_LIST_URL,
+)
+
+
+def page_query(api_client: APIClient, url: str) -> str:
+    # The last query of a list request is the one fetching the page rows.
+    with CaptureQueriesContext(connection) as context:
+        resp: Response = api_client.get(url)
+
+    assert 200 == resp.status_code
+    return str(context.captured_queries[-1]["sql"])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url,fields",
+    [
+        (
+            f"{STUDENT_LIST_URL}?fields=id,first_name,last_name",
+            ["first_name", "id", "last_name"],
+        ),
+        (f"{SCHOOL_LIST_URL}?fields=name", ["name"]),
+        (
+            f"{reverse(SCHOOL_STUDENT_LIST_URL, args=[1])}?fields=id,age",
+            ["age", "id"],
+        ),
+        (
+            f"{reverse(STUDENT_DETAIL_URL, args=[1])}?fields=first_name,school_details",
+            ["first_name", "school_details"],
+        ),
+    ],
+    ids=["students", "schools", "school-students", "student-detail"],
+)
+def test_fields_picks_rendered_fields(
+    api_client: APIClient, url: str, fields: List[str]
+) -> None:
+
+    resp: Response = api_client.get(url)
+    body: Dict = resp.json()
+    rows: List[Dict] = body["results"] if "results" in body else [body]
+
+    assert 200 == resp.status_code
+    assert all(fields == sorted(row) for row in rows)
+
+
+@pytest.mark.django_db
+def test_omit_drops_rendered_fields(api_client: APIClient) -> None:
+
+    resp: Response = api_client.get(f"{STUDENT_LIST_URL}?omit=school_details,age")
+    row: Dict = resp.json()["results"][0]
+
+    assert "school_details" not in row
+    assert "age" not in row
+    assert "first_name" in row
+
+
+@pytest.mark.django_db
+def test_fields_defers_unused_columns(api_client: APIClient) -> None:
+
+    sql: str = page_query(api_client, f"{STUDENT_LIST_URL}?fields=id,first_name")
+
+    assert "JOIN" not in sql
+    assert '"student"."first_name"' in sql
+    assert '"student"."age"' not in sql
+
+
+@pytest.mark.django_db
+def test_omit_school_details_skips_join(api_client: APIClient) -> None:
+
+    sql: str = page_query(api_client, f"{STUDENT_LIST_URL}?omit=school_details")
+
+    assert "JOIN" not in sql
+    assert '"student"."age"' in sql
+
+
+@pytest.mark.django_db
+def test_nested_fields_are_rendered_in_full(api_client: APIClient) -> None:
+
+    url: str = f"{STUDENT_LIST_URL}?fields=id,school_details"
+    sql: str = page_query(api_client, url)
+    school: Dict = api_client.get(url).json()["results"][0]["school_details"]
+
+    assert "JOIN" in sql
+    assert {"id", "name", "location", "enrolled_count"} <= set(school)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url,queries",
+    [
+        (f"{STUDENT_LIST_URL}?fields=id", 2),
+        (f"{STUDENT_LIST_URL}?fields=id&pagination=keyset", 1),
+        (f"{SCHOOL_LIST_URL}?omit=location", 2),
+    ],
+    ids=["offset", "keyset", "omit"],
+)
+def test_sparse_list_query_count(
+    api_client: APIClient,
+    django_assert_num_queries: Callable,
+    url: str,
+    queries: int,
+) -> None:
+
+    with django_assert_num_queries(queries):
+        resp: Response = api_client.get(url)
+
+    assert 200 == resp.status_code
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url,param",
+    [
+        (f"{STUDENT_LIST_URL}?fields=id,nickname", "fields"),
+        (f"{STUDENT_LIST_URL}?omit=school", "omit"),
+        (f"{reverse(SCHOOL_DETAIL_URL, args=[1])}?fields=students", "fields"),
+    ],
+    ids=["unknown-field", "write-only-field", "detail-unknown-field"],
+)
+def test_unknown_fields_are_rejected(
+    api_client: APIClient, url: str, param: str
+) -> None:
+
+    resp: Response = api_client.get(url)
+
+    assert 400 == resp.status_code
+    assert param in resp.json()
+
+
+@pytest.mark.django_db
+def test_fields_is_ignored_on_writes(api_client: APIClient) -> None:
+
+    url: str = f"{reverse(SCHOOL_DETAIL_URL, args=[1])}?fields=id"
+    resp: Response = api_client.patch(url, data={"location": "Elsewhere"})
+
+    assert 200 == resp.status_code
+    assert "Elsewhere" == resp.json()["location"]
@@ -0,0 +1,192 @@
+from typing import List, Set
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from core.models import School, Student
+from tests.conftest import (
+    SCHOOL_STUDENT_LIST_URL,
+    STUDENT_DEACTIVATE_URL,
+    STUDENT_LIST_URL,
+)
+
+
+@pytest.fixture()
+def get_search_school() -> School:
+    school: School = School.objects.create(
+        name="Search School", code="S0001", location="Bangkok", student_max_number=10
+    )
+    for first_name, last_name in [
+        ("Annabel", "Zquist"),
+        ("Ann", "Zquist"),
+        ("Zoe", "Annzed"),
+        ("Bob", "Zquist"),
+        ("Ann%", "Zquist"),
+    ]:
+        Student.objects.create(
+            title="MS",
+            first_name=first_name,
+            last_name=last_name,
+            age=12,
+            gender="FEMALE",
+            school=school,
+        )
+    return school
+
+
+def search(api_client: APIClient, url: str, term: str) -> List[str]:
+    resp: Response = api_client.get(url, {"search": term, "limit": 100})
+    assert 200 == resp.status_code
+    return [f"{row['first_name']} {row['last_name']}" for row in resp.json()["results"]]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "term,names",
+    [
+        ("ann", ["Ann Zquist", "Ann% Zquist", "Annabel Zquist", "Zoe Annzed"]),
+        ("ANN zq", ["Ann Zquist", "Ann% Zquist", "Annabel Zquist"]),
+        ("zquist bob", ["Bob Zquist"]),
+        ("ann%", ["Ann% Zquist"]),
+        ("nabel", []),
+    ],
+    ids=["prefix", "all-words", "word-order", "wildcards-escaped", "no-infix"],
+)
+def test_search_students(
+    api_client: APIClient, get_search_school: School, term: str, names: List[str]
+) -> None:
+
+    found: List[str] = search(api_client, STUDENT_LIST_URL, term)
+
+    assert set(names) == set(found)
+
+
+@pytest.mark.django_db
+def test_search_ranks_exact_matches_first(
+    api_client: APIClient, get_search_school: School
+) -> None:
+
+    found: List[str] = search(api_client, STUDENT_LIST_URL, "ann")
+
+    assert "Ann Zquist" == found[0]
+    # Prefix matches follow in the list order, newest first.
+    assert ["Ann% Zquist", "Zoe Annzed", "Annabel Zquist"] == found[1:]
+
+
+@pytest.mark.django_db
+def test_search_pages_through_every_match(
+    api_client: APIClient, get_search_school: School
+) -> None:
+
+    Student.objects.bulk_create(
+        Student(
+            title="MR",
+            first_name="Zed",
+            last_name=f"Zquist{index}",
+            age=12,
+            gender="MALE",
+            school=get_search_school,
+        )
+        for index in range(350)
+    )
+    # More matches than a page, every one of them counted and listed once.
+    found: List[int] = []
+    url: str = f"{STUDENT_LIST_URL}?search=zed&limit=100"
+    while url:
+        resp: Response = api_client.get(url)
+        assert 350 == resp.json()["count"]
+        found.extend(row["id"] for row in resp.json()["results"])
+        url = resp.json()["next"]
+
+    expected: Set[int] = set(
+        Student.objects.filter(first_name="Zed").values_list("id", flat=True)
+    )
+    assert 350 == len(found)
+    assert expected == set(found)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("pagination", ["offset", "keyset"])
+def test_search_ranks_within_each_page(
+    api_client: APIClient, get_search_school: School, pagination: str
+) -> None:
+
+    found: List[str] = []
+    url: str = f"{STUDENT_LIST_URL}?search=ann&limit=3&pagination={pagination}"
+    while url:
+        resp: Response = api_client.get(url)
+        found.extend(
+            f"{row['first_name']} {row['last_name']}" for row in resp.json()["results"]
+        )
+        url = resp.json()["next"]
+
+    # Pages follow the list order, newest first, the exact match leads the first.
+    assert ["Ann Zquist", "Ann% Zquist", "Zoe Annzed", "Annabel Zquist"] == found
+
+
+@pytest.mark.django_db
+def test_search_with_other_filters(
+    api_client: APIClient, get_search_school: School
+) -> None:
+
+    resp: Response = api_client.get(
+        STUDENT_LIST_URL,
+        {"search": "ann", "school": get_search_school.name, "last_name": "Zquist"},
+    )
+
+    assert ["Ann", "Ann%", "Annabel"] == [
+        row["first_name"] for row in resp.json()["results"]
+    ]
+
+
+@pytest.mark.django_db
+def test_deactivate_search_matches(
+    api_client: APIClient, get_search_school: School
+) -> None:
+
+    resp: Response = api_client.post(f"{STUDENT_DEACTIVATE_URL}?search=ann zq")
+
+    assert {"deactivated": 3} == resp.json()
+    assert ["Bob", "Zoe"] == sorted(
+        get_search_school.student.filter(is_active=True).values_list(
+            "first_name", flat=True
+        )
+    )
+
+
+@pytest.mark.django_db
+def test_search_school_students(
+    api_client: APIClient, get_search_school: School
+) -> None:
+
+    url: str = reverse(SCHOOL_STUDENT_LIST_URL, args=[get_search_school.id])
+
+    assert ["Bob Zquist"] == search(api_client, url, "bo")
+
+
+@pytest.mark.django_db
+def test_blank_search_lists_every_student(api_client: APIClient) -> None:
+
+    resp: Response = api_client.get(STUDENT_LIST_URL, {"search": " "})
+
+    assert Student.objects.filter(is_active=True).count() == resp.json()["count"]
+
+
+@pytest.mark.django_db
+@override_settings(SEARCH_TRIGRAM=True)
+def test_trigram_search_matches_misspelled_names(
+    api_client: APIClient, get_search_school: School
+) -> None:
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            pytest.skip("needs the pg_trgm extension")
+
+    found: List[str] = search(api_client, STUDENT_LIST_URL, "bob zquits")
+
+    assert "Bob Zquist" == found[0]
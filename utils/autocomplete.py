@@ -0,0 +1,170 @@
+import operator
+import threading
+from bisect import bisect_left, insort
+from functools import reduce
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Case, F, Q, QuerySet, Value, When
+from django.db.models.functions import Concat, Lower, StrIndex, Substr
+
+from utils.cache import bump_generation, get_generation, get_response_cache
+
+
+def get_keys(value: str) -> List[str]:
+    # The lowered value from each of its words on, so "int" finds "Bangkok
+    # International" too.
+    words: List[str] = value.lower().split()
+    return [" ".join(words[index:]) for index in range(len(words))]
+
+
+class PrefixIndex:
+    """
+    Sorted (key, pk) pairs, the rows whose key starts with a prefix are found with
+    bisect
+    """
+
+    def __init__(self, entries: Optional[List[Tuple[str, int]]] = None) -> None:
+        self.entries: List[Tuple[str, int]] = sorted(entries or [])
+
+    @classmethod
+    def from_values(cls, values: Dict[int, str]) -> "PrefixIndex":
+        return cls(
+            [(key, pk) for pk, value in values.items() for key in get_keys(value)]
+        )
+
+    def add(self, pk: int, value: str) -> None:
+        for key in get_keys(value):
+            insort(self.entries, (key, pk))
+
+    def discard(self, pk: int, value: str) -> None:
+        for key in get_keys(value):
+            index: int = bisect_left(self.entries, (key, pk))
+            if index < len(self.entries) and self.entries[index] == (key, pk):
+                del self.entries[index]
+
+    def search(self, prefix: str) -> Iterator[int]:
+        # Matching keys are contiguous, from the first one not below the prefix.
+        index: int = bisect_left(self.entries, (prefix,))
+        while index < len(self.entries) and self.entries[index][0].startswith(prefix):
+            yield self.entries[index][1]
+            index += 1
+
+
+class AutocompleteIndex:
+    """
+    In-process prefix indexes over text fields of a model's rows. Committed writes are
+    applied with update(), rows changed by other processes are noticed through a
+    generation in the shared cache and reloaded. Without AUTOCOMPLETE_INDEX the same
+    lookups query the database and writes leave the cache alone.
+    """
+
+    def __init__(
+        self, name: str, fields: Tuple[str, ...], get_queryset: Callable[[], QuerySet]
+    ) -> None:
+        self.fields: Tuple[str, ...] = fields
+        self.get_queryset: Callable[[], QuerySet] = get_queryset
+        self.generation_key: str = f"autocomplete:{name}:generation"
+        self.generation: Optional[str] = None
+        self.rows: Dict[int, Dict] = {}
+        self.indexes: Dict[str, PrefixIndex] = {}
+        self.lock: threading.Lock = threading.Lock()
+
+    def build(self) -> None:
+        # The generation is read first, a write committed during the load bumps it
+        # and the next search loads again.
+        generation: str = get_generation(get_response_cache(), self.generation_key)
+        rows: Dict[int, Dict] = {
+            row["id"]: row for row in self.get_queryset().values("id", *self.fields)
+        }
+        indexes: Dict[str, PrefixIndex] = {
+            field: PrefixIndex.from_values(
+                {pk: row[field] for pk, row in rows.items() if row[field]}
+            )
+            for field in self.fields
+        }
+        with self.lock:
+            self.rows, self.indexes, self.generation = rows, indexes, generation
+
+    def is_current(self) -> bool:
+        return self.generation == get_generation(
+            get_response_cache(), self.generation_key
+        )
+
+    def update(self, pk: int, row: Optional[Dict]) -> None:
+        # Replaces the row of pk, None removes it. Other processes reload, so does this
+        # one if it missed another write.
+        if not settings.AUTOCOMPLETE_INDEX:
+            return
+        current: bool = self.is_current()
+        generation: str = bump_generation(self.generation_key)
+        with self.lock:
+            if not current:
+                self.generation = None
+                return
+            previous: Optional[Dict] = self.rows.pop(pk, None)
+            for field, index in self.indexes.items():
+                if previous is not None and previous[field]:
+                    index.discard(pk, previous[field])
+                if row is not None and row[field]:
+                    index.add(pk, row[field])
+            if row is not None:
+                self.rows[pk] = row
+            self.generation = generation
+
+    def invalidate(self) -> None:
+        # For writes skipping post_save, every process reloads on its next search.
+        if settings.AUTOCOMPLETE_INDEX:
+            bump_generation(self.generation_key)
+
+    def search(self, term: str, limit: int) -> List[Dict]:
+        # Rows matching on an earlier field come first, then in key order.
+        prefix: str = " ".join(term.lower().split())
+        if not prefix:
+            return []
+        if not settings.AUTOCOMPLETE_INDEX:
+            return self.query(prefix, limit)
+        if not self.is_current():
+            self.build()
+
+        found: Dict[int, Dict] = {}
+        with self.lock:
+            for field in self.fields:
+                for pk in self.indexes[field].search(prefix):
+                    found.setdefault(pk, self.rows[pk])
+                    if len(found) == limit:
+                        return list(found.values())
+        return list(found.values())
+
+    def query(self, prefix: str, limit: int) -> List[Dict]:
+        # The index lookup as one query: a row matches where the lowered field starts
+        # with the prefix or has it after a space, both LIKE patterns a trigram index
+        # serves. Matches are ordered by the field, then the text from that word.
+        queryset: QuerySet = self.get_queryset()
+        matches: List[Q] = []
+        ranks: List[When] = []
+        keys: List[When] = []
+        for rank, field in enumerate(self.fields):
+            lowered: str = f"{field}_autocomplete_lower"
+            queryset = queryset.alias(**{lowered: Lower(field)})
+            match: Q = Q(**{f"{lowered}__startswith": prefix}) | Q(
+                **{f"{lowered}__contains": f" {prefix}"}
+            )
+            matches.append(match)
+            ranks.append(When(match, then=Value(rank)))
+            keys.append(
+                When(
+                    match,
+                    then=Substr(
+                        F(lowered),
+                        StrIndex(Concat(Value(" "), F(lowered)), Value(f" {prefix}")),
+                    ),
+                )
+            )
+
+        return list(
+            queryset.filter(reduce(operator.or_, matches))
+            .alias(autocomplete_rank=Case(*ranks), autocomplete_key=Case(*keys))
+            .order_by("autocomplete_rank", "autocomplete_key", "pk")
+            .values("id", *self.fields)[:limit]
+        )
@@ -0,0 +1,246 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.db import transaction
+from django.db.models import Model, QuerySet
+from django.http.response import HttpResponseBase
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework.generics import GenericAPIView
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from utils.querysets import get_related_lookups
+
+GENERATION_KEY: str = "response-cache:generation"
+VALIDATOR_HEADERS: Tuple[str, ...] = ("ETag", "Last-Modified")
+
+_stats: Counter = Counter()
+_stats_lock: threading.Lock = threading.Lock()
+
+
+def get_response_cache() -> BaseCache:
+    return caches[getattr(settings, "RESPONSE_CACHE_ALIAS", "default")]
+
+
+def get_generation(cache: BaseCache, key: str = GENERATION_KEY) -> str:
+    # Every cached response is keyed on the current generation, so bumping it
+    # invalidates all of them at once without having to find their keys.
+    generation: Optional[str] = cache.get(key)
+    if generation is None:
+        generation = str(time.time_ns())
+        cache.add(key, generation, timeout=None)
+        generation = cache.get(key, generation)
+    return str(generation)
+
+
+def bump_generation(key: str = GENERATION_KEY) -> str:
+    generation: str = str(time.time_ns())
+    get_response_cache().set(key, generation, timeout=None)
+    return generation
+
+
+def invalidate_response_cache() -> None:
+    # Bump now so this process stops serving old data, and again on commit so
+    # responses cached by other requests before the commit are dropped too.
+    bump_generation()
+    transaction.on_commit(bump_generation)
+
+
+def request_identity(request: Request) -> str:
+    # Query parameters are sorted so ?a=1&b=2 and ?b=2&a=1 share an identity.
+    query: str = "&".join(
+        f"{name}={value}"
+        for name, values in sorted(request.query_params.lists())
+        for value in sorted(values)
+    )
+    return f"{request.path}?{query}|{request.accepted_media_type}"
+
+
+def response_cache_key(request: Request, generation: str) -> str:
+    identity: str = request_identity(request)
+    return f"response:{generation}:{hashlib.md5(identity.encode()).hexdigest()}"
+
+
+def record(outcome: str) -> None:
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def response_cache_stats() -> Dict[str, int]:
+    with _stats_lock:
+        return {"hits": _stats["hits"], "misses": _stats["misses"]}
+
+
+def not_modified_response(
+    request: Request, etag: Optional[str], last_modified: Optional[int]
+) -> Optional[HttpResponseBase]:
+    # A 304 carrying the validators, or None when the client's copy is stale.
+    response: Optional[HttpResponseBase] = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(
+    response: HttpResponseBase, etag: Optional[str], last_modified: Optional[int]
+) -> None:
+    if etag is not None:
+        response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+
+
+def get_row_stamps(row: Union[Model, Dict], lookups: List[str]) -> Tuple:
+    # Rows are model instances or values() dicts holding the related timestamps.
+    if isinstance(row, dict):
+        return (
+            row["id"],
+            row["updated_at"],
+            *(row[f"{lookup}__updated_at"] for lookup in lookups),
+        )
+
+    related_rows: List[Optional[Model]] = []
+    for lookup in lookups:
+        related: Optional[Model] = row
+        for name in lookup.split("__"):
+            # Missing reverse one-to-one rows raise an AttributeError too.
+            related = getattr(related, name, None) if related else None
+        related_rows.append(related)
+    return (
+        row.pk,
+        row.updated_at,
+        *(related.updated_at if related else None for related in related_rows),
+    )
+
+
+class CachedResponseMixin(GenericAPIView):
+    """
+    Serves list and retrieve from the response cache, see invalidate_response_cache
+    """
+
+    def list(self, request: Request, *args: Tuple, **kwargs: Dict) -> HttpResponseBase:
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(
+        self, request: Request, *args: Tuple, **kwargs: Dict
+    ) -> HttpResponseBase:
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def cached_response(
+        self, view_method: Callable, request: Request, *args: Tuple, **kwargs: Dict
+    ) -> HttpResponseBase:
+        cache: BaseCache = get_response_cache()
+        key: str = response_cache_key(request, get_generation(cache))
+
+        cached: Optional[Dict] = cache.get(key)
+        if cached is not None:
+            record("hits")
+            headers: Dict[str, str] = cached["headers"]
+            etag: Optional[str] = headers.get("ETag")
+            last_modified: Optional[int] = parse_http_date_safe(
+                headers.get("Last-Modified")
+            )
+            response: Optional[HttpResponseBase] = not_modified_response(
+                request, etag, last_modified
+            )
+            if response is None:
+                response = Response(cached["data"])
+                set_validators(response, etag, last_modified)
+            response["X-Cache"] = "HIT"
+            return response
+
+        record("misses")
+        response = view_method(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(
+                key,
+                {
+                    "data": response.data,
+                    "headers": {
+                        header: response[header]
+                        for header in VALIDATOR_HEADERS
+                        if response.has_header(header)
+                    },
+                },
+                timeout=getattr(settings, "RESPONSE_CACHE_TIMEOUT", 60),
+            )
+        response["X-Cache"] = "MISS"
+        return response
+
+
+class ConditionalGetMixin(GenericAPIView):
+    """
+    Answers list and retrieve with 304 Not Modified before serializing, using the
+    updated_at of the fetched rows and of the related rows they render
+    """
+
+    def list(self, request: Request, *args: Tuple, **kwargs: Dict) -> HttpResponseBase:
+        queryset: QuerySet = self.filter_queryset(self.get_queryset())
+        page: Optional[List[Model]] = self.paginate_queryset(queryset)
+        rows: List[Model] = page if page is not None else list(queryset)
+
+        # The total is part of the body, so it is part of the validator too.
+        count: Optional[int] = getattr(self.paginator, "count", None)
+        # The newest updated_at of the page can't tell a row that left it, e.g. one
+        # deactivated or filtered out, so lists are validated by the ETag alone.
+        etag, _ = self.get_validators(request, rows, extra=count)
+        response: Optional[HttpResponseBase] = not_modified_response(
+            request, etag, None
+        )
+        if response is not None:
+            return response
+
+        data: object = self.get_response_data(rows, many=True)
+        response = (
+            self.get_paginated_response(data) if page is not None else Response(data)
+        )
+        set_validators(response, etag, None)
+        return response
+
+    def retrieve(
+        self, request: Request, *args: Tuple, **kwargs: Dict
+    ) -> HttpResponseBase:
+        instance: Model = self.get_object()
+        etag, last_modified = self.get_validators(request, [instance])
+        response: Optional[HttpResponseBase] = not_modified_response(
+            request, etag, last_modified
+        )
+        if response is not None:
+            return response
+
+        response = Response(self.get_response_data(instance))
+        set_validators(response, etag, last_modified)
+        return response
+
+    def get_response_data(self, instance: Any, many: bool = False) -> object:
+        return self.get_serializer(instance, many=many).data
+
+    def get_validators(
+        self, request: Request, rows: Iterable[Union[Model, Dict]], extra: object = None
+    ) -> Tuple[str, Optional[int]]:
+        # Rows joined in for a nested serializer change the representation too, and
+        # their pks make rows entering or leaving the page change the ETag.
+        select_related, _ = get_related_lookups(self.get_serializer())
+        lookups: List[str] = sorted(select_related)
+        stamps: List[Tuple] = [get_row_stamps(row, lookups) for row in rows]
+
+        identity: str = f"{request_identity(request)}|{extra}|{stamps}"
+        etag: str = quote_etag(hashlib.md5(identity.encode()).hexdigest())
+        last_modified: Optional[int] = max(
+            (
+                int(stamp.timestamp())
+                for row_stamps in stamps
+                for stamp in row_stamps[1:]
+                if stamp is not None
+            ),
+            default=None,
+        )
+        return etag, last_modified
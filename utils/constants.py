@@ -8,3 +8,12 @@ READ_ONLY_REQUIRED_FALSE: Dict = {"read_only": True, "required": False}
 ALLOW_BLANK_REQUIRED_FALSE: Dict = {"allow_blank": True, "required": False}
 MINIMUM_AGE: int = 10
 MAXIMUM_AGE: int = 20
+BULK_BATCH_SIZE: int = 500
+EXPORT_CHUNK_SIZE: int = 2000
+SEARCH_MAX_TERMS: int = 3
+SEARCH_RANK: str = "search_rank"
+AUTOCOMPLETE_LIMIT: int = 10
+AUTOCOMPLETE_MAX_LIMIT: int = 50
+COUNT_ESTIMATE_THRESHOLD: int = 10_000
+CHANGES_LIMIT: int = 100
+CHANGES_MAX_LIMIT: int = 1000
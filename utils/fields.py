@@ -0,0 +1,22 @@
+from typing import Any, Callable, Tuple
+
+from django.db.models import Model
+from rest_framework.fields import ReadOnlyField
+
+
+class DerivedField(ReadOnlyField):
+    """
+    Read-only value computed from columns of the row, e.g. the seats left from the
+    capacity and the enrolled count, which values() rows can render too
+    """
+
+    def __init__(
+        self, columns: Tuple[str, ...], compute: Callable[..., object], **kwargs: Any
+    ) -> None:
+        kwargs["source"] = "*"
+        super().__init__(**kwargs)
+        self.columns: Tuple[str, ...] = columns
+        self.compute: Callable[..., object] = compute
+
+    def to_representation(self, instance: Model) -> object:
+        return self.compute(*(getattr(instance, column) for column in self.columns))
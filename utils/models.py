@@ -3,12 +3,14 @@ from django.utils.translation import gettext_lazy as _
 
 
 class BaseModel(models.Model):
-    is_active = models.BooleanField(default=True, db_index=True)
+    # Active rows are read through the models' partial (..., created_at, id) indexes,
+    # neither column is indexed on its own.
+    is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(
-        verbose_name=_("Creation date"), auto_now_add=True, null=True, db_index=True
+        verbose_name=_("Creation date"), auto_now_add=True
     )
     updated_at = models.DateTimeField(
-        verbose_name=_("Updated date"), auto_now_add=True, null=True, db_index=True
+        verbose_name=_("Updated date"), auto_now=True, null=True, db_index=True
     )
 
     class Meta:
@@ -1,7 +1,147 @@
-from rest_framework.pagination import LimitOffsetPagination
+import hashlib
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple, Union, cast
 
+from django.conf import settings
+from django.core.cache import BaseCache
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from django.db.models import BigIntegerField, Model, Q, QuerySet
+from django.db.models.expressions import RawSQL
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import Cursor, CursorPagination, LimitOffsetPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework.views import APIView
 
-class StandardSizePagination(LimitOffsetPagination):
+from utils.cache import get_generation, get_response_cache
+from utils.constants import CHANGES_LIMIT, CHANGES_MAX_LIMIT, COUNT_ESTIMATE_THRESHOLD
+
+
+class CountModePagination(LimitOffsetPagination):
+    """
+    Limit/offset pages whose total is picked with ?count=: exact (the default), the
+    planner's estimate above COUNT_ESTIMATE_THRESHOLD rows, cached per filters until
+    the next write, or none to only tell whether there is a next page
+    """
+
+    count_query_param: str = "count"
+    count_modes: Tuple[str, ...] = ("exact", "estimate", "cached", "none")
+    # Set by paginate_queryset, count is None when ?count=none.
+    limit: int
+    offset: int
+    count: Optional[int]
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Optional[APIView] = None
+    ) -> Optional[List]:
+        self.count_mode: str = self.get_count_mode(request)
+        if self.count_mode == "exact":
+            page: Optional[List] = super().paginate_queryset(queryset, request, view)
+            if page is not None:
+                # Always counted in this mode.
+                self.has_next: bool = self.offset + self.limit < cast(int, self.count)
+            return page
+
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+        self.request = request
+
+        # One row past the page tells whether there is a next one, and the total
+        # when the page is the last.
+        rows: List = list(queryset[self.offset : self.offset + self.limit + 1])
+        page = rows[: self.limit]
+        self.has_next = len(rows) > self.limit
+        if self.count_mode == "none":
+            self.count = None
+        elif page and not self.has_next:
+            self.count = self.offset + len(page)
+        else:
+            total: int = (
+                self.get_estimated_count(queryset)
+                if self.count_mode == "estimate"
+                else self.get_cached_count(queryset)
+            )
+            self.count = max(total, self.offset + len(page) + self.has_next)
+
+        if (self.has_next or self.offset > 0) and self.template is not None:
+            self.display_page_controls = self.count is not None
+        return page
+
+    def get_count_mode(self, request: Request) -> str:
+        mode: str = request.query_params.get(self.count_query_param, "exact")
+        if mode not in self.count_modes:
+            raise ValidationError(
+                {
+                    self.count_query_param: [
+                        f"Expected one of {', '.join(self.count_modes)}."
+                    ]
+                }
+            )
+        return mode
+
+    def get_estimated_count(self, queryset: QuerySet) -> int:
+        # Row estimates come from the table statistics, exact counts are cheap enough
+        # below the threshold and estimates are too rough there.
+        try:
+            sql, params = queryset.order_by().query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan: Any = cursor.fetchone()[0]
+        estimate: int = int(plan[0]["Plan"]["Plan Rows"])
+        if estimate < COUNT_ESTIMATE_THRESHOLD:
+            return int(self.get_count(queryset))
+        return estimate
+
+    def get_cached_count(self, queryset: QuerySet) -> int:
+        # Keyed on the count query itself so pages, page sizes and fields share it,
+        # and on the response cache generation so any write drops it.
+        queryset = queryset.order_by().values("pk")
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+        cache: BaseCache = get_response_cache()
+        digest: str = hashlib.md5(f"{sql}|{params}".encode()).hexdigest()
+        key: str = f"count:{get_generation(cache)}:{digest}"
+
+        count: Optional[int] = cache.get(key)
+        if count is None:
+            count = self.get_count(queryset)
+            cache.set(key, count, timeout=getattr(settings, "COUNT_CACHE_TIMEOUT", 300))
+        return count
+
+    def get_paginated_response(self, data: Any) -> Response:
+        if self.count is not None:
+            return super().get_paginated_response(data)
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+        url: str = replace_query_param(
+            self.request.build_absolute_uri(), self.limit_query_param, self.limit
+        )
+        return str(
+            replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+        )
+
+
+class StandardSizePagination(CountModePagination):
     """
     Can use this pagination class when the API response will be smaller
     """
@@ -9,9 +149,208 @@ class StandardSizePagination(LimitOffsetPagination):
     default_limit: int = 10
 
 
-class LargeSizePagination(LimitOffsetPagination):
+class LargeSizePagination(CountModePagination):
     """
     Can use this pagination class when the API response will be larger
     """
 
     default_limit: int = 5
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Seeks to the page after the (created_at, id) of the last row seen, so every page
+    costs the same regardless of depth and rows inserted meanwhile don't shift pages
+    """
+
+    ordering: Tuple = ("-created_at", "-id")
+    page_size_query_param: str = "limit"
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Optional[APIView] = None
+    ) -> Optional[List]:
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        reverse: bool = bool(self.cursor and self.cursor.reverse)
+        position: Optional[Tuple] = self.parse_position(self.cursor)
+
+        if reverse:
+            queryset = queryset.order_by("created_at", "id")
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if position is not None:
+            queryset = queryset.filter(self.get_seek_filter(position, reverse))
+
+        results: List = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+        has_following: bool = len(results) > len(self.page)
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = position is not None
+
+        self.next_position: Optional[str]
+        self.previous_position: Optional[str]
+        if self.page:
+            self.next_position = self._get_position_from_instance(
+                self.page[-1], self.ordering
+            )
+            self.previous_position = self._get_position_from_instance(
+                self.page[0], self.ordering
+            )
+        else:
+            self.next_position = self.previous_position = None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_seek_filter(self, position: Tuple, reverse: bool) -> Q:
+        created_at, pk = position
+        # The range on created_at alone keeps the seek on the (created_at, id) index,
+        # the id comparison only breaks ties between rows sharing a timestamp.
+        if reverse:
+            return Q(created_at__gte=created_at) & (
+                Q(created_at__gt=created_at) | Q(id__gt=pk)
+            )
+        return Q(created_at__lte=created_at) & (
+            Q(created_at__lt=created_at) | Q(id__lt=pk)
+        )
+
+    def parse_position(self, cursor: Optional[Cursor]) -> Optional[Tuple]:
+        if cursor is None or cursor.position is None:
+            return None
+
+        try:
+            created_at, pk = cursor.position.rsplit("|", 1)
+            position: Tuple = (parse_datetime(created_at), int(pk))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if position[0] is None:
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+        if self.next_position is None:
+            # Paged backwards past the start, begin again from the first page.
+            return str(remove_query_param(self.base_url, self.cursor_query_param))
+        return str(
+            self.encode_cursor(
+                Cursor(offset=0, reverse=False, position=self.next_position)
+            )
+        )
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous or self.previous_position is None:
+            return None
+        return str(
+            self.encode_cursor(
+                Cursor(offset=0, reverse=True, position=self.previous_position)
+            )
+        )
+
+    def _get_position_from_instance(
+        self, instance: Union[Model, dict], ordering: Any
+    ) -> str:
+        if isinstance(instance, dict):
+            return f"{instance['created_at'].isoformat()}|{instance['id']}"
+        return f"{instance.created_at.isoformat()}|{instance.id}"
+
+
+class StandardKeysetPagination(KeysetPagination):
+    """
+    Keyset counterpart of StandardSizePagination
+    """
+
+    page_size: int = 10
+
+
+class LargeKeysetPagination(KeysetPagination):
+    """
+    Keyset counterpart of LargeSizePagination
+    """
+
+    page_size: int = 5
+
+
+class ChangeFeedPagination(LimitOffsetPagination):
+    """
+    Pages the change log after the (txid, id) position of ?since=. Only transactions
+    older than every running one are read: a change committed later always sorts
+    after the positions already handed out, so following the cursor skips nothing
+    """
+
+    since_query_param: str = "since"
+    default_limit: int = CHANGES_LIMIT
+    max_limit: int = CHANGES_MAX_LIMIT
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Optional[APIView] = None
+    ) -> Optional[List]:
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.since: Optional[str] = request.query_params.get(self.since_query_param)
+        position: Optional[Tuple[int, int]] = self.parse_since(self.since)
+
+        queryset = queryset.filter(
+            txid__lt=RawSQL(
+                "txid_snapshot_xmin(txid_current_snapshot())",
+                [],
+                output_field=BigIntegerField(),
+            )
+        ).order_by("txid", "id")
+        if position is not None:
+            txid, pk = position
+            # Same shape as the keyset seek, a range on the (txid, id) index.
+            queryset = queryset.filter(
+                Q(txid__gte=txid) & (Q(txid__gt=txid) | Q(id__gt=pk))
+            )
+
+        rows: List = list(queryset[: self.limit + 1])
+        page: List = rows[: self.limit]
+        self.has_next: bool = len(rows) > self.limit
+        if page:
+            self.since = f"{page[-1].txid}-{page[-1].id}"
+        return page
+
+    def parse_since(self, since: Optional[str]) -> Optional[Tuple[int, int]]:
+        if not since:
+            return None
+        txid, _, pk = since.partition("-")
+        if not (txid.isdigit() and pk.isdigit()):
+            raise ValidationError({self.since_query_param: ["Invalid cursor."]})
+        return int(txid), int(pk)
+
+    def get_paginated_response(self, data: Any) -> Response:
+        # The cursor is returned even on an empty page, to poll for later changes.
+        return Response(
+            OrderedDict(
+                [
+                    ("since", self.since),
+                    ("next", self.get_next_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+        return str(
+            replace_query_param(
+                self.request.build_absolute_uri(), self.since_query_param, self.since
+            )
+        )
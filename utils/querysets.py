@@ -0,0 +1,106 @@
+from typing import Optional, Set, Tuple
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Model, QuerySet
+from django.db.models.fields import Field
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.serializers import BaseSerializer, ListSerializer, Serializer
+
+from utils.fields import DerivedField
+
+
+def _get_model_field(model: Model, name: str) -> Optional[Field]:
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def get_related_lookups(
+    serializer: Serializer, prefix: str = ""
+) -> Tuple[Set[str], Set[str]]:
+    # Collect the relations rendered by the serializer, joining single-valued
+    # relations and prefetching multi-valued ones.
+    select_related: Set[str] = set()
+    prefetch_related: Set[str] = set()
+    model: Model = serializer.Meta.model
+
+    for field in serializer.fields.values():
+        if field.write_only or field.source == "*":
+            continue
+
+        name: str = field.source.split(".")[0]
+        model_field: Optional[Field] = _get_model_field(model, name)
+        if model_field is None or not model_field.is_relation:
+            continue
+
+        lookup: str = f"{prefix}{name}"
+        if model_field.many_to_many or model_field.one_to_many:
+            prefetch_related.add(lookup)
+            continue
+
+        if isinstance(field, PrimaryKeyRelatedField):
+            # The foreign key column is already on the row, no join needed.
+            continue
+
+        select_related.add(lookup)
+        if isinstance(field, BaseSerializer) and not isinstance(field, ListSerializer):
+            nested_select, nested_prefetch = get_related_lookups(
+                field, prefix=f"{lookup}__"
+            )
+            select_related |= nested_select
+            prefetch_related |= nested_prefetch
+
+    return select_related, prefetch_related
+
+
+def get_loaded_columns(serializer: Serializer, prefix: str = "") -> Optional[Set[str]]:
+    # Columns the serializer reads, or None when a field is not backed by a column.
+    # The keys and timestamps are always loaded, pagination and ETags read them.
+    model: Model = serializer.Meta.model
+    columns: Set[str] = {
+        f"{prefix}{model._meta.pk.name}",
+        f"{prefix}created_at",
+        f"{prefix}updated_at",
+    }
+
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if isinstance(field, DerivedField):
+            columns |= {f"{prefix}{column}" for column in field.columns}
+            continue
+
+        model_field: Optional[Field] = _get_model_field(model, field.source)
+        if model_field is None or model_field.many_to_many or model_field.one_to_many:
+            return None
+
+        columns.add(f"{prefix}{field.source}")
+        if isinstance(field, BaseSerializer):
+            nested: Optional[Set[str]] = get_loaded_columns(
+                field, prefix=f"{prefix}{field.source}__"
+            )
+            if nested is None:
+                return None
+            columns |= nested
+
+    return columns
+
+
+def plan_related_loading(queryset: QuerySet, serializer: Serializer) -> QuerySet:
+    if isinstance(serializer, ListSerializer):
+        serializer = serializer.child
+
+    select_related, prefetch_related = get_related_lookups(serializer)
+
+    if select_related:
+        queryset = queryset.select_related(*sorted(select_related))
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*sorted(prefetch_related))
+
+    if getattr(serializer, "is_sparse", False):
+        # Defer the columns of the fields left out with ?fields= or ?omit=.
+        columns: Optional[Set[str]] = get_loaded_columns(serializer)
+        if columns is not None:
+            queryset = queryset.only(*sorted(columns))
+    return queryset
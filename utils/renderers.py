@@ -0,0 +1,98 @@
+import csv
+import json
+from typing import Dict, Iterable, Iterator, List, Optional, cast
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.serializers import BaseSerializer, Serializer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def get_field_paths(serializer: Serializer, prefix: str = "") -> List[str]:
+    # Flat column names for a serializer, e.g. "school_details.name".
+    paths: List[str] = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if isinstance(field, Serializer):
+            paths.extend(get_field_paths(field, prefix=f"{prefix}{name}."))
+        elif not isinstance(field, BaseSerializer):
+            paths.append(f"{prefix}{name}")
+    return paths
+
+
+def flatten_record(record: Optional[Dict], prefix: str = "") -> Dict:
+    flat: Dict = {}
+    for name, value in (record or {}).items():
+        if isinstance(value, dict):
+            flat.update(flatten_record(value, prefix=f"{prefix}{name}."))
+        else:
+            flat[f"{prefix}{name}"] = value
+    return flat
+
+
+class EchoBuffer:
+    """
+    File-like object handing back what is written, for streaming csv.writer output
+    """
+
+    def write(self, value: str) -> str:
+        return value
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    One JSON document per line, records can be streamed one at a time
+    """
+
+    media_type: str = "application/x-ndjson"
+    format: str = "ndjson"
+    charset: str = "utf-8"
+
+    def render(
+        self,
+        data: object,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[Dict] = None,
+    ) -> bytes:
+        records: Iterable = data if isinstance(data, list) else [data]
+        return b"".join(self.stream(records, []))
+
+    def stream(
+        self, records: Iterable[Optional[Dict]], fields: List[str]
+    ) -> Iterator[bytes]:
+        for record in records:
+            yield (json.dumps(record, cls=JSONEncoder) + "\n").encode(self.charset)
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    A header line and one line per record, nested objects are flattened
+    """
+
+    media_type: str = "text/csv"
+    format: str = "csv"
+    charset: str = "utf-8"
+
+    def render(
+        self,
+        data: object,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[Dict] = None,
+    ) -> bytes:
+        # Used for error responses, e.g. {"fields": ["Unknown field(s): age."]}
+        rows: List[Optional[Dict]] = cast(
+            List[Optional[Dict]], data if isinstance(data, list) else [data]
+        )
+        records: List[Dict] = [flatten_record(record) for record in rows]
+        fields: List[str] = list(dict.fromkeys(key for row in records for key in row))
+        return b"".join(self.stream(records, fields))
+
+    def stream(
+        self, records: Iterable[Optional[Dict]], fields: List[str]
+    ) -> Iterator[bytes]:
+        writer: csv.DictWriter = csv.DictWriter(
+            EchoBuffer(), fieldnames=fields, extrasaction="ignore"
+        )
+        yield writer.writeheader().encode(self.charset)
+        for record in records:
+            yield writer.writerow(flatten_record(record)).encode(self.charset)
@@ -0,0 +1,201 @@
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from django.db import transaction
+from django.db.models import Model
+from django.db.models.fields import Field as ModelField
+from rest_framework.fields import DateTimeField, Field
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import PKOnlyObject, PrimaryKeyRelatedField
+from rest_framework.request import Request
+from rest_framework.serializers import (
+    BaseSerializer,
+    ListSerializer,
+    Serializer,
+    ValidationError,
+)
+
+from utils.fields import DerivedField
+from utils.querysets import _get_model_field
+
+Renderer = Callable[[Dict], object]
+
+
+def parse_field_names(value: Optional[str]) -> List[str]:
+    return [name.strip() for name in (value or "").split(",") if name.strip()]
+
+
+class AtomicSaveMixin(BaseSerializer):
+    """
+    Saves in a transaction, so every statement of a save, e.g. a seat reservation or
+    the change log written by post_save receivers, commits or rolls back together
+    """
+
+    def save(self, **kwargs: Dict) -> Model:
+        with transaction.atomic():
+            return super().save(**kwargs)
+
+
+class SparseFieldsetMixin(Serializer):
+    """
+    Renders only the fields picked with ?fields=a,b or drops the ones in ?omit=a,b
+    """
+
+    fields_query_param: str = "fields"
+    omit_query_param: str = "omit"
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # Set when fields were dropped, so the queryset can defer their columns.
+        self.is_sparse: bool = False
+
+        request: Optional[Request] = self.context.get("request")
+        if request is None or request.method not in SAFE_METHODS:
+            # Writes validate against every field, whatever the query string says.
+            return
+
+        picked: List[str] = self.get_sparse_field_names(
+            request, self.fields_query_param
+        )
+        omitted: List[str] = self.get_sparse_field_names(request, self.omit_query_param)
+        if not picked and not omitted:
+            return
+
+        readable: Set[str] = {
+            name for name, field in self.fields.items() if not field.write_only
+        }
+        dropped: Set[str] = set(omitted)
+        if picked:
+            dropped |= readable - set(picked)
+        for name in dropped:
+            self.fields.pop(name)
+        self.is_sparse = bool(dropped)
+
+    def get_sparse_field_names(self, request: Request, query_param: str) -> List[str]:
+        names: List[str] = parse_field_names(request.query_params.get(query_param))
+        unknown: List[str] = sorted(
+            name
+            for name in names
+            if name not in self.fields or self.fields[name].write_only
+        )
+        if unknown:
+            raise ValidationError(
+                {query_param: [f"Unknown field(s): {', '.join(unknown)}."]}
+            )
+        return names
+
+
+def derived_renderer(columns: List[str], compute: Callable[..., object]) -> Renderer:
+    def render(row: Dict) -> object:
+        return compute(*(row[column] for column in columns))
+
+    return render
+
+
+def column_renderer(column: str, to_representation: Callable) -> Renderer:
+    def render(row: Dict) -> object:
+        value: object = row[column]
+        # Serializer.to_representation skips the field for None the same way.
+        return None if value is None else to_representation(value)
+
+    return render
+
+
+def related_pk_renderer(column: str, field: PrimaryKeyRelatedField) -> Renderer:
+    def render(row: Dict) -> object:
+        value: object = row[column]
+        return None if value is None else field.to_representation(PKOnlyObject(value))
+
+    return render
+
+
+class RowRepresentation:
+    """
+    Renders values() rows in the exact shape a serializer renders model instances
+    """
+
+    max_rendered: int = 10000
+
+    def __init__(self, pk_column: str, stamp_column: str) -> None:
+        self.pk_column: str = pk_column
+        self.stamp_column: str = stamp_column
+        self.columns: Dict[str, None] = {}
+        self.renderers: List[Tuple[str, Renderer]] = []
+        self.rendered: Dict[Tuple, Optional[Dict]] = {}
+
+    def render(self, row: Dict) -> Optional[Dict]:
+        if row[self.pk_column] is None:
+            # A nested relation that is not set, e.g. a student without a school.
+            return None
+        return {name: render(row) for name, render in self.renderers}
+
+    def render_related(self, row: Dict) -> Optional[Dict]:
+        # Rows of a page often share a related row, e.g. students of one school,
+        # which is rendered once per representation and then reused.
+        key: Tuple = (row[self.pk_column], row[self.stamp_column])
+        if key not in self.rendered:
+            if len(self.rendered) >= self.max_rendered:
+                # Bounded so a streamed export keeps a flat memory profile.
+                self.rendered.clear()
+            self.rendered[key] = self.render(row)
+        return self.rendered[key]
+
+    @classmethod
+    def compile(
+        cls, serializer: Serializer, prefix: str = ""
+    ) -> Optional["RowRepresentation"]:
+        # None when a field needs the model instance, e.g. a method field, a to-many
+        # relation or a custom get_attribute/to_representation.
+        if type(serializer).to_representation is not Serializer.to_representation:
+            return None
+
+        model: Model = serializer.Meta.model
+        representation: RowRepresentation = cls(
+            f"{prefix}{model._meta.pk.name}", f"{prefix}updated_at"
+        )
+        # The keys and timestamps are always selected, pagination and ETags read them.
+        for name in (model._meta.pk.name, "created_at", "updated_at"):
+            representation.columns[f"{prefix}{name}"] = None
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, DerivedField):
+                columns: List[str] = [f"{prefix}{column}" for column in field.columns]
+                representation.columns.update(dict.fromkeys(columns))
+                representation.renderers.append(
+                    (name, derived_renderer(columns, field.compute))
+                )
+                continue
+
+            model_field: Optional[ModelField] = _get_model_field(model, field.source)
+            if model_field is None or model_field.many_to_many:
+                return None
+            if model_field.one_to_many or isinstance(field, ListSerializer):
+                return None
+
+            column: str = f"{prefix}{field.source}"
+            renderer: Renderer
+            if isinstance(field, BaseSerializer):
+                nested: Optional[RowRepresentation] = cls.compile(
+                    field, prefix=f"{column}__"
+                )
+                if nested is None:
+                    return None
+                representation.columns.update(nested.columns)
+                renderer = nested.render_related
+            elif isinstance(field, PrimaryKeyRelatedField):
+                representation.columns[column] = None
+                renderer = related_pk_renderer(column, field)
+            elif model_field.is_relation or (
+                type(field).get_attribute is not Field.get_attribute
+            ):
+                return None
+            else:
+                if isinstance(field, DateTimeField) and not hasattr(field, "timezone"):
+                    # Resolve the active timezone once instead of once per value.
+                    field.timezone = field.default_timezone()
+                representation.columns[column] = None
+                renderer = column_renderer(column, field.to_representation)
+            representation.renderers.append((name, renderer))
+
+        return representation
@@ -1,19 +1,260 @@
-from typing import Dict, Tuple, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, Union
 
+from django.core.validators import EMPTY_VALUES
+from django.db import transaction
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from django_filters.rest_framework import FilterSet
+from django_filters.utils import translate_validation
 from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.generics import GenericAPIView
+from rest_framework.pagination import BasePagination
 from rest_framework.permissions import AllowAny
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.serializers import Serializer
 from rest_framework.viewsets import ModelViewSet
 
 from core.models import School, Student
+from core.serializers import StudentBulkCreateSerializer, StudentBulkUpdateSerializer
+from services.bulk_services import (
+    bulk_create_students,
+    bulk_deactivate,
+    bulk_update_students,
+)
+from services.core_services import adjust_enrolled_count, lock_school, lock_student
+from utils.cache import CachedResponseMixin, ConditionalGetMixin
+from utils.constants import EXPORT_CHUNK_SIZE, SEARCH_RANK
+from utils.querysets import plan_related_loading
+from utils.renderers import CSVRenderer, NDJSONRenderer, get_field_paths
+from utils.serializers import RowRepresentation
 
 
-class BaseModel(ModelViewSet):
+class BaseModel(CachedResponseMixin, ConditionalGetMixin, ModelViewSet):
     permission_classes: Tuple = (AllowAny,)
+    pagination_query_param: str = "pagination"
+    pagination_classes: Dict[str, Type[BasePagination]] = {}
+    # Actions rendered from values() rows instead of model instances, see
+    # RowRepresentation; serializers it can't compile use the regular path.
+    fast_read_actions: Tuple[str, ...] = ()
+    # Most queries each action may run whatever the page size, the test client fails
+    # requests going over them.
+    query_budgets: Dict[str, int] = {}
+
+    @property
+    def paginator(self) -> Optional[BasePagination]:
+        # Clients can pick another pagination style, e.g. ?pagination=keyset
+        if not hasattr(self, "_paginator"):
+            mode: Optional[str] = self.request.query_params.get(
+                self.pagination_query_param
+            )
+            pagination_class: Optional[Type[BasePagination]] = (
+                self.pagination_classes.get(mode, self.pagination_class)
+                if mode
+                else self.pagination_class
+            )
+            self._paginator = pagination_class() if pagination_class else None
+        return self._paginator
+
+    def get_queryset(self) -> QuerySet:
+        # Join/prefetch what the serializer renders so a page costs a fixed query count.
+        queryset: QuerySet = plan_related_loading(
+            super().get_queryset(), self.get_serializer()
+        )
+        representation: Optional[RowRepresentation] = self.get_row_representation()
+        if representation is not None:
+            queryset = queryset.values(*representation.columns)
+        return queryset
+
+    def paginate_queryset(self, queryset: QuerySet) -> Optional[List]:
+        # Rows ranked by a filter, e.g. ?search=, are ordered by it within their page.
+        # A new list, the paginator may still read its own page, e.g. for a cursor.
+        page: Optional[List] = super().paginate_queryset(queryset)
+        if page is None or SEARCH_RANK not in queryset.query.annotation_select:
+            return page
+
+        def rank(row: Any) -> float:
+            value: float = (
+                row[SEARCH_RANK] if isinstance(row, dict) else getattr(row, SEARCH_RANK)
+            )
+            return value
+
+        return sorted(page, key=rank, reverse=True)
+
+    def get_row_representation(self) -> Optional[RowRepresentation]:
+        if self.action not in self.fast_read_actions:
+            return None
+        if not hasattr(self, "_row_representation"):
+            self._row_representation: Optional[
+                RowRepresentation
+            ] = RowRepresentation.compile(self.get_serializer())
+        return self._row_representation
+
+    def get_response_data(self, instance: Any, many: bool = False) -> object:
+        representation: Optional[RowRepresentation] = self.get_row_representation()
+        if representation is None:
+            return super().get_response_data(instance, many=many)
+        if many:
+            return [representation.render(row) for row in instance]
+        return representation.render(instance)
+
+    @action(detail=False, methods=["post"])
+    def deactivate(self, request: Request, *args: Tuple, **kwargs: Dict) -> Response:
+        # Soft delete by {"ids": [...]} and/or the list filters, e.g. ?location=Bangkok
+        ids: object = (
+            request.data.get("ids") if isinstance(request.data, dict) else None
+        )
+        if ids is not None and (
+            not isinstance(ids, list) or not all(isinstance(pk, int) for pk in ids)
+        ):
+            raise ValidationError({"ids": ["Expected a list of integers."]})
+
+        queryset: QuerySet = self.get_queryset()
+        filtered: bool = False
+        if self.filterset_class is not None:
+            filterset: FilterSet = self.filterset_class(
+                request.query_params, queryset=queryset, request=request
+            )
+            if not filterset.is_valid():
+                raise translate_validation(filterset.errors)
+            # Empty values like ?location= filter nothing, the same as in the list.
+            filtered = any(
+                value not in EMPTY_VALUES
+                for value in filterset.form.cleaned_data.values()
+            )
+            queryset = filterset.qs
+        if not ids and not filtered:
+            raise ValidationError("Provide a list of ids or at least one filter.")
+
+        if ids is not None:
+            queryset = queryset.filter(pk__in=ids)
+        return Response(bulk_deactivate(queryset))
 
     def destroy(self, request: Request, *args: Tuple, **kwargs: Dict) -> Response:
         instance: Union[School, Student] = self.get_object()
-        instance.is_active = False
-        instance.save()
+        with transaction.atomic():
+            # Concurrent removals, moves and deactivations wait here, only a row still
+            # active is deactivated and releases its seat, from its locked school.
+            locked: bool = (
+                lock_student(instance)
+                if isinstance(instance, Student)
+                else lock_school(instance)
+            )
+            if not locked:
+                raise NotFound()
+            instance.is_active = False
+            instance.save(update_fields=["is_active", "updated_at"])
+            if isinstance(instance, Student):
+                adjust_enrolled_count(instance.school_id, -1)
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+def bulk_response(
+    data: List, errors: List[Dict], success_status: int = status.HTTP_200_OK
+) -> Response:
+    if not errors:
+        response_status: int = success_status
+    elif data:
+        response_status = status.HTTP_207_MULTI_STATUS
+    else:
+        response_status = status.HTTP_400_BAD_REQUEST
+    errors = sorted(errors, key=lambda error: int(error["index"]))
+    return Response({"results": data, "errors": errors}, status=response_status)
+
+
+class StudentBulkMixin(GenericAPIView):
+    @action(detail=False, methods=["post"])
+    def bulk(self, request: Request, *args: Tuple, **kwargs: Dict) -> Response:
+        # Nested routes enrol every row into the school from the URL.
+        school_pk: Optional[str] = self.kwargs.get("school_pk")
+        rows, errors = self.validate_bulk_rows(
+            request,
+            StudentBulkCreateSerializer,
+            {"school": school_pk} if school_pk is not None else {},
+        )
+
+        students, rejected = bulk_create_students(rows)
+        return bulk_response(
+            self.get_serializer(students, many=True).data,
+            errors + rejected,
+            success_status=status.HTTP_201_CREATED,
+        )
+
+    @bulk.mapping.patch
+    def bulk_update(self, request: Request, *args: Tuple, **kwargs: Dict) -> Response:
+        rows, errors = self.validate_bulk_rows(request, StudentBulkUpdateSerializer)
+        # Nested routes can't move students to another school.
+        if self.kwargs.get("school_pk") is not None:
+            for _, data in rows:
+                data.pop("school", None)
+
+        students, rejected = bulk_update_students(rows, self.get_queryset())
+        return bulk_response(
+            self.get_serializer(students, many=True).data, errors + rejected
+        )
+
+    def validate_bulk_rows(
+        self,
+        request: Request,
+        serializer_class: Type[StudentBulkCreateSerializer],
+        overrides: Optional[Dict] = None,
+    ) -> Tuple[List[Tuple[int, Dict]], List[Dict]]:
+        if not isinstance(request.data, list):
+            raise ValidationError("Expected a list of students.")
+
+        rows: List[Tuple[int, Dict]] = []
+        errors: List[Dict] = []
+        for index, row in enumerate(request.data):
+            if overrides and isinstance(row, dict):
+                row = {**row, **overrides}
+            serializer: StudentBulkCreateSerializer = serializer_class(data=row)
+            if serializer.is_valid():
+                rows.append((index, dict(serializer.validated_data)))
+            else:
+                errors.append({"index": index, "errors": serializer.errors})
+        return rows, errors
+
+
+class ExportMixin(GenericAPIView):
+    @action(
+        detail=False,
+        methods=["get"],
+        renderer_classes=(NDJSONRenderer, CSVRenderer),
+        pagination_class=None,
+    )
+    def export(
+        self, request: Request, *args: Tuple, **kwargs: Dict
+    ) -> StreamingHttpResponse:
+        # Every row matching the list filters, as NDJSON or ?format=csv, read with a
+        # server-side cursor and streamed so memory stays flat whatever the size.
+        serializer: Serializer = self.get_serializer()
+        queryset: QuerySet = self.filter_queryset(self.get_queryset())
+        representation: Optional[RowRepresentation] = RowRepresentation.compile(
+            serializer
+        )
+
+        records: Iterable[Optional[Dict]]
+        if representation is not None:
+            records = map(
+                representation.render,
+                queryset.values(*representation.columns).iterator(
+                    chunk_size=EXPORT_CHUNK_SIZE
+                ),
+            )
+        else:
+            records = (
+                self.get_serializer(instance).data
+                for instance in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+            )
+
+        renderer: Union[NDJSONRenderer, CSVRenderer] = request.accepted_renderer
+        response: StreamingHttpResponse = StreamingHttpResponse(
+            renderer.stream(records, get_field_paths(serializer)),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        response[
+            "Content-Disposition"
+        ] = f'attachment; filename="{self.basename}.{renderer.format}"'
+        return response